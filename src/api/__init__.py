@@ -0,0 +1,5 @@
+from src.api.exams import router as exams_router
+from src.api.questions import router as questions_router
+from src.api.search import router as search_router
+
+__all__ = ["exams_router", "questions_router", "search_router"]
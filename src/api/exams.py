@@ -0,0 +1,33 @@
+from typing import Annotated
+
+from fastapi import APIRouter, Depends
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.api.filters import ExamFilters, has_questions_of_format
+from src.api.pagination import Cursor, Page, PageSize, build_page, decode_cursor
+from src.api.schemas import ExamOut
+from src.constants import FormatType
+from src.database import get_db
+from src.models import Exam
+
+router = APIRouter(prefix="/exams", tags=["exams"])
+
+
+@router.get("", response_model=Page[ExamOut])
+async def list_exams(
+  filters: Annotated[ExamFilters, Depends()],
+  format_type: FormatType | None = None,
+  limit: int = PageSize,
+  cursor: str | None = Cursor,
+  db: AsyncSession = Depends(get_db),
+):
+  stmt = select(Exam).where(*filters.clauses()).order_by(Exam.id).limit(limit + 1)
+  if format_type is not None:
+    stmt = stmt.where(has_questions_of_format(format_type))
+  if after := decode_cursor(cursor, 1):
+    # Keyset: continua depois do último id, sem OFFSET
+    stmt = stmt.where(Exam.id > after[0])
+  exams = (await db.scalars(stmt)).all()
+  items = [ExamOut.model_validate(exam) for exam in exams]
+  return build_page(items, limit, lambda exam: (exam.id,))
@@ -0,0 +1,34 @@
+from dataclasses import dataclass
+
+from sqlalchemy import ColumnElement, exists, select
+
+from src.constants import Discipline, FormatType, Language, TestType
+from src.models import Exam, Question
+
+
+@dataclass
+class ExamFilters:
+  test_type: TestType | None = None
+  discipline: Discipline | None = None
+  language: Language | None = None
+  year: int | None = None
+
+  def clauses(self) -> list[ColumnElement[bool]]:
+    clauses = []
+    if self.test_type is not None:
+      clauses.append(Exam.exam_type == self.test_type.value)
+    if self.discipline is not None:
+      clauses.append(Exam.discipline == self.discipline.value)
+    if self.language is not None:
+      clauses.append(Exam.language == self.language.value)
+    if self.year is not None:
+      clauses.append(Exam.year == str(self.year))
+    return clauses
+
+
+def has_questions_of_format(format_type: FormatType) -> ColumnElement[bool]:
+  return exists(
+    select(Question.id).where(
+      Question.format_type == format_type.value, Question.exam_id == Exam.id
+    )
+  )
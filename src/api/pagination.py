@@ -0,0 +1,50 @@
+import base64
+import binascii
+import json
+from collections.abc import Callable, Sequence
+from typing import Generic, TypeVar
+
+from fastapi import HTTPException, Query
+from pydantic import BaseModel
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+
+T = TypeVar("T")
+
+PageSize = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE)
+Cursor = Query(None, description="next_cursor da página anterior")
+
+
+class Page(BaseModel, Generic[T]):
+  items: list[T]
+  next_cursor: str | None = None
+
+
+def encode_cursor(key: tuple[int, ...]) -> str:
+  raw = json.dumps(list(key), separators=(",", ":")).encode("utf-8")
+  return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str | None, size: int) -> tuple[int, ...] | None:
+  if cursor is None:
+    return None
+  try:
+    key = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+  except (binascii.Error, ValueError) as e:
+    raise HTTPException(status_code=400, detail="Invalid cursor") from e
+  if (
+    not isinstance(key, list)
+    or len(key) != size
+    or not all(type(value) is int for value in key)
+  ):
+    raise HTTPException(status_code=400, detail="Invalid cursor")
+  return tuple(key)
+
+
+def build_page(
+  items: Sequence[T], limit: int, key: Callable[[T], tuple[int, ...]]
+) -> Page[T]:
+  # A consulta pede limit + 1: a linha extra só indica que há próxima página
+  next_cursor = encode_cursor(key(items[limit - 1])) if len(items) > limit else None
+  return Page[T](items=list(items[:limit]), next_cursor=next_cursor)
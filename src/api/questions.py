@@ -0,0 +1,54 @@
+from typing import Annotated
+
+from fastapi import APIRouter, Depends
+from sqlalchemy import and_, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.api.filters import ExamFilters
+from src.api.pagination import Cursor, Page, PageSize, build_page, decode_cursor
+from src.api.schemas import QuestionOut
+from src.constants import FormatType
+from src.database import get_db
+from src.models import Exam, ExamText, Question
+
+router = APIRouter(prefix="/questions", tags=["questions"])
+
+
+@router.get("", response_model=Page[QuestionOut])
+async def list_questions(
+  filters: Annotated[ExamFilters, Depends()],
+  format_type: FormatType | None = None,
+  limit: int = PageSize,
+  cursor: str | None = Cursor,
+  db: AsyncSession = Depends(get_db),
+):
+  stmt = (
+    select(
+      Question.id,
+      Question.exam_id,
+      Question.number,
+      Question.page,
+      Question.format_type,
+      Exam.exam_type,
+      Exam.year,
+      Exam.column_name,
+      Exam.discipline,
+      Exam.language,
+      ExamText.content.label("text"),
+    )
+    .join(Exam, Exam.id == Question.exam_id)
+    .outerjoin(
+      ExamText, and_(ExamText.question_id == Question.id, ExamText.kind == "question")
+    )
+    .where(*filters.clauses())
+    # Mesma ordem de uq_questions_exam_number / ix_questions_format_exam_number
+    .order_by(Question.exam_id, Question.number)
+    .limit(limit + 1)
+  )
+  if format_type is not None:
+    stmt = stmt.where(Question.format_type == format_type.value)
+  if after := decode_cursor(cursor, 2):
+    stmt = stmt.where(tuple_(Question.exam_id, Question.number) > tuple_(*after))
+  rows = (await db.execute(stmt)).all()
+  items = [QuestionOut.model_validate(row) for row in rows]
+  return build_page(items, limit, lambda question: (question.exam_id, question.number))
@@ -0,0 +1,71 @@
+from pydantic import BaseModel, ConfigDict
+
+
+class ExamOut(BaseModel):
+  model_config = ConfigDict(from_attributes=True)
+
+  id: int
+  exam_type: str
+  year: str
+  column_name: str
+  discipline: str | None
+  language: str | None
+  url: str | None
+  page_count: int | None
+  question_count: int
+
+
+class QuestionOut(BaseModel):
+  model_config = ConfigDict(from_attributes=True)
+
+  id: int
+  exam_id: int
+  number: int
+  page: int
+  format_type: str | None
+  exam_type: str
+  year: str
+  column_name: str
+  discipline: str | None
+  language: str | None
+  text: str | None
+
+
+class SearchHit(BaseModel):
+  model_config = ConfigDict(from_attributes=True)
+
+  id: int
+  exam_id: int
+  number: int
+  format_type: str | None
+  exam_type: str
+  year: str
+  column_name: str
+  discipline: str | None
+  language: str | None
+  score: float
+  # Trechos com os termos encontrados entre <mark></mark>
+  snippet: str
+
+
+class LocalSearchHit(BaseModel):
+  model_config = ConfigDict(from_attributes=True)
+
+  exam_type: str
+  exam: str
+  question: int
+  path: str
+  score: float
+  preview: str
+
+
+class LocalSearchResults(BaseModel):
+  query: str
+  items: list[LocalSearchHit]
+
+
+class SearchResults(BaseModel):
+  query: str
+  # "fulltext" (tsvector) ou "fuzzy" (trigramas, quando o fulltext não achou nada)
+  mode: str
+  items: list[SearchHit]
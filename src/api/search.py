@@ -0,0 +1,138 @@
+from typing import Annotated
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from sqlalchemy import (
+  ColumnElement,
+  Select,
+  cast,
+  func,
+  literal,
+  literal_column,
+  select,
+)
+from sqlalchemy.dialects.postgresql import REGCONFIG
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.api.filters import ExamFilters
+from src.api.schemas import (
+  LocalSearchHit,
+  LocalSearchResults,
+  SearchHit,
+  SearchResults,
+)
+from src.constants import FormatType, TestType
+from src.database import get_db
+from src.models import Exam, ExamText, Question
+from src.models.exam_text import SEARCH_CONFIG
+
+DEFAULT_SEARCH_LIMIT = 20
+MAX_SEARCH_LIMIT = 100
+HEADLINE_OPTIONS = (
+  "StartSel=<mark>, StopSel=</mark>, MaxWords=35, MinWords=15, "
+  'MaxFragments=2, FragmentDelimiter=" … "'
+)
+FUZZY_SNIPPET_CHARS = 240
+
+router = APIRouter(prefix="/search", tags=["search"])
+
+
+def _ranked(
+  match: ColumnElement[bool],
+  score: ColumnElement[float],
+  tsquery: ColumnElement | None,
+  filters: ExamFilters,
+  format_type: FormatType | None,
+  limit: int,
+) -> Select:
+  hits = (
+    select(
+      Question.id,
+      Question.exam_id,
+      Question.number,
+      Question.format_type,
+      Exam.exam_type,
+      Exam.year,
+      Exam.column_name,
+      Exam.discipline,
+      Exam.language,
+      ExamText.content,
+      score.label("score"),
+    )
+    .join(Question, Question.id == ExamText.question_id)
+    .join(Exam, Exam.id == Question.exam_id)
+    # kind = 'question' casa com o WHERE dos índices parciais; como literal
+    # (e não parâmetro) o planejador prova o predicado mesmo em prepared
+    # statements genéricos
+    .where(ExamText.kind == literal_column("'question'"), match, *filters.clauses())
+    .order_by(score.desc(), Question.id)
+    .limit(limit)
+  )
+  if format_type is not None:
+    hits = hits.where(Question.format_type == format_type.value)
+  hits = hits.subquery()
+  if tsquery is None:
+    # Sem tsquery que case, não há termos para marcar: o trecho é o começo
+    snippet = func.left(hits.c.content, FUZZY_SNIPPET_CHARS)
+  else:
+    config = cast(SEARCH_CONFIG, REGCONFIG)
+    # ts_headline é caro: roda só nas linhas que sobraram depois do LIMIT
+    snippet = func.ts_headline(config, hits.c.content, tsquery, HEADLINE_OPTIONS)
+  return select(
+    *(column for column in hits.c if column.name != "content"),
+    snippet.label("snippet"),
+  ).order_by(hits.c.score.desc(), hits.c.id)
+
+
+@router.get("", response_model=SearchResults)
+async def search_questions(
+  filters: Annotated[ExamFilters, Depends()],
+  q: str = Query(..., min_length=2, max_length=200),
+  format_type: FormatType | None = None,
+  limit: int = Query(DEFAULT_SEARCH_LIMIT, ge=1, le=MAX_SEARCH_LIMIT),
+  db: AsyncSession = Depends(get_db),
+):
+  config = cast(SEARCH_CONFIG, REGCONFIG)
+  tsquery = func.websearch_to_tsquery(config, q)
+  stmt = _ranked(
+    ExamText.search_vector.op("@@")(tsquery),
+    func.ts_rank_cd(ExamText.search_vector, tsquery),
+    tsquery,
+    filters,
+    format_type,
+    limit,
+  )
+  rows = (await db.execute(stmt)).all()
+  mode = "fulltext"
+  if not rows:
+    # Erros de digitação e fórmulas ("sen2x", "Bhaskara"): similaridade de
+    # trigramas por palavra, servida por ix_exam_texts_content_trgm
+    stmt = _ranked(
+      literal(q).op("<%")(ExamText.content),
+      func.word_similarity(q, ExamText.content),
+      None,
+      filters,
+      format_type,
+      limit,
+    )
+    rows = (await db.execute(stmt)).all()
+    mode = "fuzzy"
+  items = [SearchHit.model_validate(row) for row in rows]
+  return SearchResults(query=q, mode=mode, items=items)
+
+
+@router.get("/local", response_model=LocalSearchResults)
+def search_local_index(
+  request: Request,
+  q: str = Query(..., min_length=2, max_length=200),
+  test_type: TestType | None = None,
+  limit: int = Query(DEFAULT_SEARCH_LIMIT, ge=1, le=MAX_SEARCH_LIMIT),
+):
+  # BM25 sobre o índice em mmap (task search-index), sem consultar o banco
+  index = request.app.state.search_index
+  if index is None:
+    raise HTTPException(status_code=503, detail="Search index not available")
+  hits = index.search(
+    q, limit, exam_type=test_type.value if test_type is not None else None
+  )
+  items = [LocalSearchHit.model_validate(hit) for hit in hits]
+  return LocalSearchResults(query=q, items=items)
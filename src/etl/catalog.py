@@ -0,0 +1,243 @@
+import argparse
+import sqlite3
+import threading
+from collections.abc import Iterable
+from dataclasses import dataclass
+from pathlib import Path
+
+from src.etl.transform.paths import get_catalog_path
+
+# pending -> downloaded | failed -> transformed | transform_failed
+#   -> loaded | load_failed
+CATALOG_STATUSES = (
+  "pending",
+  "downloaded",
+  "failed",
+  "transformed",
+  "transform_failed",
+  "loaded",
+  "load_failed",
+)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS exams (
+  exam_type TEXT NOT NULL,
+  table_format INTEGER NOT NULL,
+  year TEXT NOT NULL,
+  column_name TEXT NOT NULL,
+  url TEXT NOT NULL,
+  path TEXT NOT NULL UNIQUE,
+  sha256 TEXT,
+  status TEXT NOT NULL DEFAULT 'pending',
+  error TEXT,
+  updated_at TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP,
+  PRIMARY KEY (exam_type, year, column_name)
+);
+CREATE INDEX IF NOT EXISTS exams_status ON exams (status, exam_type);
+CREATE INDEX IF NOT EXISTS exams_sha256 ON exams (sha256);
+"""
+
+_COLUMNS = (
+  "exam_type, table_format, year, column_name, url, path, sha256, status, error"
+)
+
+
+@dataclass
+class CatalogEntry:
+  exam_type: str
+  table_format: int
+  year: str
+  column: str
+  url: str
+  path: Path
+  sha256: str | None = None
+  status: str = "pending"
+  error: str | None = None
+
+
+def _entry_from_row(row: tuple) -> CatalogEntry:
+  exam_type, table_format, year, column, url, path, sha256, status, error = row
+  return CatalogEntry(
+    exam_type, table_format, year, column, url, Path(path), sha256, status, error
+  )
+
+
+class Catalog:
+  def __init__(self, path: Path | None = None):
+    self.path = path or get_catalog_path()
+    self.path.parent.mkdir(parents=True, exist_ok=True)
+    # Uma conexão compartilhada pelas threads de download/load, serializada
+    self._conn = sqlite3.connect(self.path, check_same_thread=False)
+    self._lock = threading.Lock()
+    with self._lock, self._conn:
+      self._conn.execute("PRAGMA journal_mode=WAL")
+      self._conn.executescript(_SCHEMA)
+
+  def close(self) -> None:
+    with self._lock:
+      self._conn.close()
+
+  def __enter__(self) -> "Catalog":
+    return self
+
+  def __exit__(self, *exc) -> None:
+    self.close()
+
+  def _execute(self, sql: str, params: tuple = ()) -> list[tuple]:
+    with self._lock, self._conn:
+      return self._conn.execute(sql, params).fetchall()
+
+  def _executemany(self, sql: str, rows: Iterable[tuple]) -> None:
+    with self._lock, self._conn:
+      self._conn.executemany(sql, rows)
+
+  def record_listing(self, entries: list[CatalogEntry]) -> None:
+    # URL nova na listagem: volta para pending e será baixada de novo
+    self._executemany(
+      """
+      INSERT INTO exams (exam_type, table_format, year, column_name, url, path)
+      VALUES (?, ?, ?, ?, ?, ?)
+      ON CONFLICT (exam_type, year, column_name) DO UPDATE SET
+        table_format = excluded.table_format,
+        path = excluded.path,
+        status = CASE WHEN url = excluded.url THEN status ELSE 'pending' END,
+        url = excluded.url,
+        updated_at = CURRENT_TIMESTAMP
+      """,
+      (
+        (e.exam_type, e.table_format, e.year, e.column, e.url, str(e.path))
+        for e in entries
+      ),
+    )
+
+  def has_listing(self, exam_type: str) -> bool:
+    rows = self._execute(
+      "SELECT 1 FROM exams WHERE exam_type = ? LIMIT 1", (exam_type,)
+    )
+    return bool(rows)
+
+  def entries(
+    self,
+    *,
+    exam_type: str | None = None,
+    statuses: Iterable[str] | None = None,
+  ) -> list[CatalogEntry]:
+    where, params = [], []
+    if exam_type is not None:
+      where.append("exam_type = ?")
+      params.append(exam_type)
+    if statuses is not None:
+      statuses = list(statuses)
+      where.append(f"status IN ({', '.join('?' * len(statuses))})")
+      params.extend(statuses)
+    sql = f"SELECT {_COLUMNS} FROM exams"
+    if where:
+      sql += " WHERE " + " AND ".join(where)
+    sql += " ORDER BY exam_type, table_format, year DESC, column_name"
+    return [_entry_from_row(row) for row in self._execute(sql, tuple(params))]
+
+  def entry_for_path(self, path: Path) -> CatalogEntry | None:
+    rows = self._execute(f"SELECT {_COLUMNS} FROM exams WHERE path = ?", (str(path),))
+    return _entry_from_row(rows[0]) if rows else None
+
+  def record_download(
+    self,
+    path: Path,
+    *,
+    ok: bool,
+    sha256: str | None = None,
+    error: str | None = None,
+  ) -> None:
+    if ok:
+      # Mesmo conteúdo já processado mantém o status; conteúdo novo refaz tudo
+      self._execute(
+        """
+        UPDATE exams SET
+          status = CASE
+            WHEN sha256 IS ? AND status NOT IN ('pending', 'failed') THEN status
+            ELSE 'downloaded'
+          END,
+          sha256 = ?,
+          error = NULL,
+          updated_at = CURRENT_TIMESTAMP
+        WHERE path = ?
+        """,
+        (sha256, sha256, str(path)),
+      )
+    else:
+      # Falha com uma cópia válida no disco não invalida o que já foi feito
+      self._execute(
+        """
+        UPDATE exams SET
+          status = CASE WHEN sha256 IS NULL THEN 'failed' ELSE status END,
+          error = ?,
+          updated_at = CURRENT_TIMESTAMP
+        WHERE path = ?
+        """,
+        (error, str(path)),
+      )
+
+  def set_status(
+    self, paths: Iterable[Path], status: str, error: str | None = None
+  ) -> None:
+    if status not in CATALOG_STATUSES:
+      raise ValueError(f"Unknown catalog status {status!r}")
+    self._executemany(
+      "UPDATE exams SET status = ?, error = ?, updated_at = CURRENT_TIMESTAMP "
+      "WHERE path = ?",
+      ((status, error, str(path)) for path in paths),
+    )
+
+  def record_transforms(self, summary: list[dict]) -> None:
+    self.set_status(
+      [Path(item["file"]) for item in summary if "error" not in item], "transformed"
+    )
+    for item in summary:
+      if "error" in item:
+        self.set_status([Path(item["file"])], "transform_failed", item["error"])
+
+  def entries_with_sha256(self, sha256: str) -> list[CatalogEntry]:
+    rows = self._execute(
+      f"SELECT {_COLUMNS} FROM exams WHERE sha256 = ? ORDER BY path", (sha256,)
+    )
+    return [_entry_from_row(row) for row in rows]
+
+  def transform_work_list(self, *, force: bool = False) -> list[Path]:
+    statuses = ["downloaded"]
+    if force:
+      statuses += ["transformed", "transform_failed", "loaded", "load_failed"]
+    return [entry.path for entry in self.entries(statuses=statuses)]
+
+  def status_counts(self) -> dict[str, dict[str, int]]:
+    counts: dict[str, dict[str, int]] = {}
+    rows = self._execute(
+      "SELECT exam_type, status, COUNT(*) FROM exams GROUP BY exam_type, status"
+    )
+    for exam_type, status, count in rows:
+      counts.setdefault(exam_type, {})[status] = count
+    return counts
+
+
+def main() -> None:
+  parser = argparse.ArgumentParser(description="Show the exam catalog status")
+  parser.add_argument("--catalog", type=Path, default=None)
+  parser.add_argument(
+    "--status",
+    action="append",
+    choices=CATALOG_STATUSES,
+    help="list the entries with this status (may be repeated)",
+  )
+  args = parser.parse_args()
+
+  with Catalog(args.catalog) as catalog:
+    for exam_type, counts in sorted(catalog.status_counts().items()):
+      by_status = ", ".join(f"{n} {status}" for status, n in sorted(counts.items()))
+      print(f"[{exam_type}] {by_status}")
+    if args.status:
+      for entry in catalog.entries(statuses=args.status):
+        error = f" ({entry.error})" if entry.error else ""
+        print(f"  {entry.status}: {entry.path}{error}")
+
+
+if __name__ == "__main__":
+  main()
@@ -0,0 +1,329 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
+from pathlib import Path
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from src.etl.extract.constants import (
+  DOWNLOAD_CHUNK_SIZE,
+  DOWNLOAD_MAX_PER_HOST,
+  DOWNLOAD_TIMEOUT,
+  DOWNLOAD_WORKERS,
+)
+from src.etl.store import PdfStore
+from src.utils.tracing import span
+
+PARTIAL_SUFFIX = ".part"
+META_SUFFIX = ".meta.json"
+
+
+@dataclass
+class DownloadJob:
+  url: str
+  path: Path
+
+
+@dataclass
+class DownloadResult:
+  url: str
+  path: Path
+  ok: bool
+  status: str = "downloaded"
+  bytes: int = 0
+  status_code: int | None = None
+  error: str | None = None
+  seconds: float = 0.0
+  sha256: str | None = None
+
+
+class _HostLimiter:
+  def __init__(self, max_per_host: int):
+    self._max_per_host = max_per_host
+    self._lock = threading.Lock()
+    self._semaphores: dict[str, threading.BoundedSemaphore] = {}
+
+  def for_url(self, url: str) -> threading.BoundedSemaphore:
+    host = urlsplit(url).netloc.lower()
+    with self._lock:
+      if host not in self._semaphores:
+        self._semaphores[host] = threading.BoundedSemaphore(self._max_per_host)
+      return self._semaphores[host]
+
+
+def create_session(pool_size: int = DOWNLOAD_WORKERS) -> requests.Session:
+  session = requests.Session()
+  adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+  session.mount("http://", adapter)
+  session.mount("https://", adapter)
+  return session
+
+
+def _meta_path(path: Path) -> Path:
+  return path.with_name(path.name + META_SUFFIX)
+
+
+def load_download_meta(path: Path) -> dict:
+  meta_path = _meta_path(path)
+  if not meta_path.exists():
+    return {}
+  try:
+    return json.loads(meta_path.read_text(encoding="utf-8"))
+  except json.JSONDecodeError:
+    return {}
+
+
+def _save_download_meta(path: Path, meta: dict) -> None:
+  meta_path = _meta_path(path)
+  tmp = meta_path.with_name(meta_path.name + ".tmp")
+  tmp.write_text(json.dumps(meta, indent=2), encoding="utf-8")
+  os.replace(tmp, meta_path)
+
+
+def _sha256_update_from_file(digest, path: Path, chunk_size: int) -> None:
+  with open(path, "rb") as f:
+    while chunk := f.read(chunk_size):
+      digest.update(chunk)
+
+
+def _is_complete_on_disk(path: Path, meta: dict, chunk_size: int) -> bool:
+  if not meta.get("complete") or not path.exists():
+    return False
+  if path.stat().st_size != meta.get("size"):
+    return False
+  digest = hashlib.sha256()
+  _sha256_update_from_file(digest, path, chunk_size)
+  return digest.hexdigest() == meta.get("sha256")
+
+
+def _if_range_validator(meta: dict) -> str | None:
+  # If-Range só aceita ETag forte; senão cai para Last-Modified
+  etag = meta.get("etag")
+  if etag and not etag.startswith("W/"):
+    return etag
+  return meta.get("last_modified")
+
+
+def _expected_size(resp: requests.Response, offset: int) -> int | None:
+  content_range = resp.headers.get("Content-Range", "")
+  if resp.status_code == 206 and "/" in content_range:
+    total = content_range.rsplit("/", 1)[1]
+    return int(total) if total.isdigit() else None
+  length = resp.headers.get("Content-Length")
+  return offset + int(length) if length and length.isdigit() else None
+
+
+def _range_start(resp: requests.Response) -> int | None:
+  content_range = resp.headers.get("Content-Range", "")
+  if not content_range.startswith("bytes "):
+    return None
+  start = content_range[len("bytes ") :].split("-", 1)[0]
+  return int(start) if start.isdigit() else None
+
+
+def _fetch(
+  session: requests.Session,
+  job: DownloadJob,
+  timeout: float,
+  chunk_size: int,
+) -> tuple[str, int, int]:
+  meta = load_download_meta(job.path)
+  if meta.get("url") != job.url:
+    meta = {}
+  partial = job.path.with_name(job.path.name + PARTIAL_SUFFIX)
+  headers = {"Accept-Encoding": "identity"}
+  offset = 0
+  if _is_complete_on_disk(job.path, meta, chunk_size):
+    if meta.get("etag"):
+      headers["If-None-Match"] = meta["etag"]
+    if meta.get("last_modified"):
+      headers["If-Modified-Since"] = meta["last_modified"]
+  elif partial.exists() and _if_range_validator(meta):
+    offset = partial.stat().st_size
+    if offset:
+      headers["Range"] = f"bytes={offset}-"
+      headers["If-Range"] = _if_range_validator(meta)
+
+  with session.get(job.url, headers=headers, timeout=timeout, stream=True) as resp:
+    if resp.status_code == 304:
+      return "not_modified", resp.status_code, 0
+    if resp.status_code == 416 or (
+      resp.status_code == 206 and _range_start(resp) != offset
+    ):
+      # Parcial inválido: descarta para a próxima execução recomeçar do zero
+      partial.unlink(missing_ok=True)
+      _save_download_meta(job.path, {"url": job.url})
+      resp.raise_for_status()
+      raise OSError(f"unexpected Content-Range: {resp.headers.get('Content-Range')}")
+    resp.raise_for_status()
+    resumed = resp.status_code == 206
+    if not resumed:
+      offset = 0
+    expected = _expected_size(resp, offset)
+    meta = {
+      "url": job.url,
+      "etag": resp.headers.get("ETag"),
+      "last_modified": resp.headers.get("Last-Modified"),
+      "complete": False,
+    }
+    _save_download_meta(job.path, meta)
+    digest = hashlib.sha256()
+    if resumed:
+      _sha256_update_from_file(digest, partial, chunk_size)
+    size = offset
+    with open(partial, "ab" if resumed else "wb") as f:
+      for chunk in resp.iter_content(chunk_size=chunk_size):
+        f.write(chunk)
+        digest.update(chunk)
+        size += len(chunk)
+    status_code = resp.status_code
+
+  if expected is not None and size != expected:
+    raise OSError(f"incomplete download: got {size} of {expected} bytes")
+  # Só aparece no caminho final depois de completo e com checksum gravado
+  os.replace(partial, job.path)
+  meta.update(complete=True, size=size, sha256=digest.hexdigest())
+  _save_download_meta(job.path, meta)
+  return ("resumed" if resumed else "downloaded"), status_code, size - offset
+
+
+def _download_one(
+  session: requests.Session,
+  job: DownloadJob,
+  timeout: float,
+  chunk_size: int,
+) -> DownloadResult:
+  with span("extract.download", url=job.url, path=str(job.path)) as s:
+    result = _download_one_untraced(session, job, timeout, chunk_size)
+    s.set(status=result.status, bytes=result.bytes, status_code=result.status_code)
+    if result.seconds and result.bytes:
+      s.set(throughput_bps=round(result.bytes / result.seconds))
+  return result
+
+
+def _download_one_untraced(
+  session: requests.Session,
+  job: DownloadJob,
+  timeout: float,
+  chunk_size: int,
+) -> DownloadResult:
+  start = time.perf_counter()
+  try:
+    status, status_code, size = _fetch(session, job, timeout, chunk_size)
+  except (requests.RequestException, OSError) as e:
+    response = getattr(e, "response", None)
+    return DownloadResult(
+      url=job.url,
+      path=job.path,
+      ok=False,
+      status="failed",
+      status_code=response.status_code if response is not None else None,
+      error=f"{type(e).__name__}: {e}",
+      seconds=time.perf_counter() - start,
+    )
+  return DownloadResult(
+    url=job.url,
+    path=job.path,
+    ok=True,
+    status=status,
+    bytes=size,
+    status_code=status_code,
+    seconds=time.perf_counter() - start,
+  )
+
+
+def _run_downloads(
+  jobs: list[DownloadJob],
+  *,
+  ordered: bool,
+  workers: int,
+  max_per_host: int,
+  timeout: float,
+  chunk_size: int,
+  session: requests.Session | None,
+  store: PdfStore | None,
+) -> Iterator[DownloadResult]:
+  if not jobs:
+    return
+  own_session = session is None
+  session = session or create_session(workers)
+  limiter = _HostLimiter(max_per_host)
+
+  def run(job: DownloadJob) -> DownloadResult:
+    job.path.parent.mkdir(parents=True, exist_ok=True)
+    with limiter.for_url(job.url):
+      result = _download_one(session, job, timeout, chunk_size)
+    if result.ok and store is not None:
+      try:
+        meta = load_download_meta(job.path)
+        with span("extract.store", path=str(job.path)):
+          result.sha256 = store.add(job.path, meta.get("sha256"))
+      except OSError as e:
+        result.ok, result.status, result.error = False, "failed", f"store: {e}"
+    return result
+
+  try:
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+      if ordered:
+        yield from pool.map(run, jobs)
+      else:
+        futures = [pool.submit(run, job) for job in jobs]
+        for future in as_completed(futures):
+          yield future.result()
+  finally:
+    if own_session:
+      session.close()
+
+
+def iter_downloads(
+  jobs: list[DownloadJob],
+  *,
+  workers: int = DOWNLOAD_WORKERS,
+  max_per_host: int = DOWNLOAD_MAX_PER_HOST,
+  timeout: float = DOWNLOAD_TIMEOUT,
+  chunk_size: int = DOWNLOAD_CHUNK_SIZE,
+  session: requests.Session | None = None,
+  store: PdfStore | None = None,
+) -> Iterator[DownloadResult]:
+  # Resultados na ordem em que terminam, para o próximo estágio já consumir
+  return _run_downloads(
+    jobs,
+    ordered=False,
+    workers=workers,
+    max_per_host=max_per_host,
+    timeout=timeout,
+    chunk_size=chunk_size,
+    session=session,
+    store=store,
+  )
+
+
+def download_files(
+  jobs: list[DownloadJob],
+  *,
+  workers: int = DOWNLOAD_WORKERS,
+  max_per_host: int = DOWNLOAD_MAX_PER_HOST,
+  timeout: float = DOWNLOAD_TIMEOUT,
+  chunk_size: int = DOWNLOAD_CHUNK_SIZE,
+  session: requests.Session | None = None,
+  store: PdfStore | None = None,
+) -> list[DownloadResult]:
+  return list(
+    _run_downloads(
+      jobs,
+      ordered=True,
+      workers=workers,
+      max_per_host=max_per_host,
+      timeout=timeout,
+      chunk_size=chunk_size,
+      session=session,
+      store=store,
+    )
+  )
@@ -1,13 +1,15 @@
 import re
-from typing import Dict, List, Optional, Tuple
+from typing import Optional, Tuple
 from dataclasses import dataclass
 
+from selenium.common.exceptions import WebDriverException
 from selenium.webdriver.common.by import By
 
 from src.etl.extract.constants import (
   PROVAS_ITA_POS_URL,
 )
 from src.utils.selenium_elements import (
+  XPATH_SNAPSHOT_JS,
   BaseElement,
   SeleniumElement,
   ITAProvasFlow,
@@ -38,33 +40,67 @@ def _parse_prova_href(href: str) -> Optional[Tuple[str, str]]:
   return (sem, tipo)
 
 
+POS_ROWS_BULK_JS = (
+  XPATH_SNAPSHOT_JS
+  + """
+const [ul, rowXPath] = arguments;
+return snapshot(rowXPath, ul).map((row) => [
+  (row.innerText || "").trim(),
+  Array.from(row.getElementsByTagName("a"), (a) =>
+    a.hasAttribute("href") ? a.href : null
+  ),
+]);
+"""
+)
+
+
+def _pos_row_data(text: str, hrefs: list[str | None]) -> dict[str, str]:
+  year_match = re.match(r"(\d+)", text)
+  year = year_match.group(1) if year_match else ""
+  out = {
+    "year": year,
+    "1o_semestre_matematica": "",
+    "1o_semestre_ingles": "",
+    "2o_semestre_matematica": "",
+    "2o_semestre_ingles": "",
+  }
+  for href in hrefs:
+    parsed = _parse_prova_href(href)
+    if parsed:
+      sem, tipo = parsed
+      key = f"{sem}_{tipo}"
+      if key in out:
+        out[key] = href
+  return out
+
+
 @dataclass
 class ProvasPosTable(SeleniumTable):
-  def get_data(self, driver) -> List[Dict[str, str]]:
-    data = []
+  def _get_pos_rows_bulk(self, driver) -> list[tuple[str, list[str | None]]]:
+    ul = self.find(driver)
+    return driver.execute_script(POS_ROWS_BULK_JS, ul, self.row.element.identifier)
+
+  def _get_pos_rows(self, driver) -> list[tuple[str, list[str | None]]]:
     ul = self.find(driver)
     rows = self.row.element.find_all(ul)
-    for row in rows:
-      year_match = re.match(r"(\d+)", row.text)
-      year = year_match.group(1) if year_match else ""
-      out = {
-        "year": year,
-        "1o_semestre_matematica": "",
-        "1o_semestre_ingles": "",
-        "2o_semestre_matematica": "",
-        "2o_semestre_ingles": "",
-      }
-      links = row.find_elements(By.TAG_NAME, "a")
-      for a in links:
-        href = a.get_attribute("href")
-        parsed = _parse_prova_href(href)
-        if parsed:
-          sem, tipo = parsed
-          key = f"{sem}_{tipo}"
-          if key in out:
-            out[key] = href
-      data.append(out)
-    return data
+    return [
+      (
+        row.text,
+        [a.get_attribute("href") for a in row.find_elements(By.TAG_NAME, "a")],
+      )
+      for row in rows
+    ]
+
+  def get_data(self, driver) -> list[dict[str, str]]:
+    rows = None
+    if self.bulk and self.row.element.identifier_type == By.XPATH:
+      try:
+        rows = self._get_pos_rows_bulk(driver)
+      except WebDriverException:
+        rows = None
+    if rows is None:
+      rows = self._get_pos_rows(driver)
+    return [_pos_row_data(text, hrefs) for text, hrefs in rows]
 
 
 DRIVER_PROVAS_POS_ITA = ITAProvasFlow(
@@ -0,0 +1,128 @@
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from src.etl.catalog import Catalog
+from src.etl.extract._downloader import DownloadJob, DownloadResult, download_files
+from src.etl.extract._flows import FLOWS, ExtractionFlow
+from src.etl.extract._listings import import_json_listings, record_tables
+from src.etl.extract._scrape import (
+  DriverPool,
+  chrome_driver_factory,
+  scrape_flow_tables,
+)
+from src.etl.extract.constants import BROWSER_POOL_SIZE, DOWNLOAD_WORKERS
+from src.etl.store import PdfStore
+
+
+def record_downloads(catalog: Catalog, results: list[DownloadResult]) -> None:
+  for result in results:
+    catalog.record_download(
+      result.path, ok=result.ok, sha256=result.sha256, error=result.error
+    )
+
+
+def prepare_flow_jobs(
+  flow: ExtractionFlow,
+  *,
+  headless: bool = True,
+  use_browser: bool = False,
+  force_replace: bool = False,
+  output_dir: Path | None = None,
+  driver_pool: DriverPool | None = None,
+  catalog: Catalog | None = None,
+) -> list[DownloadJob]:
+  output_dir = output_dir or flow.output_dir
+  own_catalog = catalog is None
+  catalog = catalog or Catalog()
+  (output_dir / "provas").mkdir(parents=True, exist_ok=True)
+
+  try:
+    # JSONs numerados de execuções antigas entram no catálogo sem novo scraping
+    listed = catalog.has_listing(flow.name)
+    if not listed and not force_replace:
+      listed = import_json_listings(catalog, flow, output_dir) > 0
+    if force_replace or not listed:
+      tables_data = scrape_flow_tables(
+        flow.flow,
+        headless=headless,
+        use_browser=use_browser,
+        driver_pool=driver_pool,
+      )
+      record_tables(catalog, flow, tables_data, output_dir)
+    return [
+      DownloadJob(url=entry.url, path=entry.path)
+      for entry in catalog.entries(exam_type=flow.name)
+    ]
+  finally:
+    if own_catalog:
+      catalog.close()
+
+
+def extract_flow(
+  flow: ExtractionFlow,
+  *,
+  headless: bool = True,
+  use_browser: bool = False,
+  force_replace: bool = False,
+  output_dir: Path | None = None,
+  download_workers: int | None = None,
+  driver_pool: DriverPool | None = None,
+  store: PdfStore | None = None,
+  catalog: Catalog | None = None,
+) -> list[DownloadResult]:
+  store = store or PdfStore()
+  own_catalog = catalog is None
+  catalog = catalog or Catalog()
+  try:
+    jobs = prepare_flow_jobs(
+      flow,
+      headless=headless,
+      use_browser=use_browser,
+      force_replace=force_replace,
+      output_dir=output_dir,
+      driver_pool=driver_pool,
+      catalog=catalog,
+    )
+    results = download_files(
+      jobs, workers=download_workers or DOWNLOAD_WORKERS, store=store
+    )
+    record_downloads(catalog, results)
+  finally:
+    if own_catalog:
+      catalog.close()
+  return results
+
+
+def extract_all(
+  flows: list[ExtractionFlow] | None = None,
+  *,
+  headless: bool = True,
+  use_browser: bool = False,
+  force_replace: bool = False,
+  download_workers: int | None = None,
+  browsers: int = BROWSER_POOL_SIZE,
+) -> dict[str, list[DownloadResult]]:
+  flows = flows or list(FLOWS.values())
+  store = PdfStore()
+  # Cada fluxo roda em sua thread: o download de um sobrepõe o scraping do outro.
+  # O Chrome só é aberto se algum fluxo precisar dele, e é reaproveitado.
+  with (
+    Catalog() as catalog,
+    DriverPool(chrome_driver_factory(headless), size=browsers) as driver_pool,
+    ThreadPoolExecutor(max_workers=len(flows)) as executor,
+  ):
+    futures = {
+      flow.name: executor.submit(
+        extract_flow,
+        flow,
+        headless=headless,
+        use_browser=use_browser,
+        force_replace=force_replace,
+        download_workers=download_workers,
+        driver_pool=driver_pool,
+        store=store,
+        catalog=catalog,
+      )
+      for flow in flows
+    }
+    return {name: future.result() for name, future in futures.items()}
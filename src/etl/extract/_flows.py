@@ -0,0 +1,46 @@
+from dataclasses import dataclass
+from pathlib import Path
+
+from src.etl.extract._driver_provas_pos_ita import DRIVER_PROVAS_POS_ITA
+from src.etl.extract._driver_provas_vestibular_ita import DRIVER_PROVAS_VESTIBULAR_ITA
+from src.utils.selenium_elements import ITAProvasFlow
+
+
+@dataclass(frozen=True)
+class ExtractionFlow:
+  name: str
+  flow: ITAProvasFlow
+  output_dir: Path
+  json_prefix: str
+  pdf_filename_prefix: str
+
+
+FLOWS: dict[str, ExtractionFlow] = {}
+
+
+def register_flow(flow: ExtractionFlow) -> ExtractionFlow:
+  if flow.name in FLOWS:
+    raise ValueError(f"Flow {flow.name!r} is already registered")
+  FLOWS[flow.name] = flow
+  return flow
+
+
+# Novas páginas de provas: criar o _driver_provas_*.py e registrar aqui
+VESTIBULAR_FLOW = register_flow(
+  ExtractionFlow(
+    name="vestibular",
+    flow=DRIVER_PROVAS_VESTIBULAR_ITA,
+    output_dir=Path("data/vestibular"),
+    json_prefix="a_formato_prova_ita_vestibular.json",
+    pdf_filename_prefix="prova_ita_vestibular",
+  )
+)
+POS_FLOW = register_flow(
+  ExtractionFlow(
+    name="pos",
+    flow=DRIVER_PROVAS_POS_ITA,
+    output_dir=Path("data/pos"),
+    json_prefix="a_formato_prova_ita_pos.json",
+    pdf_filename_prefix="prova_ita_pos",
+  )
+)
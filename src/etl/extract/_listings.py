@@ -0,0 +1,65 @@
+import json
+from pathlib import Path
+
+from src.etl.catalog import Catalog, CatalogEntry
+from src.etl.extract._flows import ExtractionFlow
+
+
+def listing_entries(
+  flow: ExtractionFlow,
+  table_format: int,
+  rows: list[dict[str, str]],
+  output_dir: Path | None = None,
+) -> list[CatalogEntry]:
+  provas_dir = (output_dir or flow.output_dir) / "provas"
+  entries = []
+  for row in rows:
+    items = list(row.items())
+    if not items:
+      continue
+    # A primeira coluna da tabela é sempre o ano; as demais, links de provas
+    year = items[0][1]
+    for col, value in items[1:]:
+      if isinstance(value, str) and value.startswith("http"):
+        entries.append(
+          CatalogEntry(
+            exam_type=flow.name,
+            table_format=table_format,
+            year=year,
+            column=col,
+            url=value,
+            path=provas_dir / f"{flow.pdf_filename_prefix}_{year}_{col}.pdf",
+          )
+        )
+  return entries
+
+
+def record_tables(
+  catalog: Catalog,
+  flow: ExtractionFlow,
+  tables_data: list[list[dict[str, str]]],
+  output_dir: Path | None = None,
+) -> int:
+  # Mantém a numeração dos antigos "<n>a_formato_*.json": a última tabela é a 1
+  n = len(tables_data)
+  entries = [
+    entry
+    for i, rows in enumerate(tables_data)
+    for entry in listing_entries(flow, n - i, rows, output_dir)
+  ]
+  catalog.record_listing(entries)
+  return len(entries)
+
+
+def import_json_listings(
+  catalog: Catalog,
+  flow: ExtractionFlow,
+  output_dir: Path | None = None,
+) -> int:
+  output_dir = output_dir or flow.output_dir
+  n = len(flow.flow.tables)
+  paths = [output_dir / f"{n - i}{flow.json_prefix}" for i in range(n)]
+  if not all(path.exists() for path in paths):
+    return 0
+  tables_data = [json.loads(path.read_text(encoding="utf-8")) for path in paths]
+  return record_tables(catalog, flow, tables_data, output_dir)
@@ -0,0 +1,124 @@
+import queue
+import threading
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from functools import partial
+
+import requests
+from lxml import etree
+from selenium import webdriver
+from selenium.common.exceptions import WebDriverException
+from selenium.webdriver.chrome.options import Options
+
+from src.utils.selenium_elements import ITAProvasFlow, reset_frame_context
+from src.utils.static_driver import StaticDriver
+from src.utils.tracing import span
+
+
+class DriverPool:
+  def __init__(self, factory: Callable[[], webdriver.Remote], size: int = 1):
+    self._factory = factory
+    self._slots = threading.BoundedSemaphore(size)
+    self._idle: queue.SimpleQueue = queue.SimpleQueue()
+    self._lock = threading.Lock()
+    self._drivers: list = []
+
+  @contextmanager
+  def acquire(self) -> Iterator[webdriver.Remote]:
+    with self._slots:
+      try:
+        driver = self._idle.get_nowait()
+      except queue.Empty:
+        driver = self._factory()
+        with self._lock:
+          self._drivers.append(driver)
+      try:
+        yield driver
+      except WebDriverException:
+        # Driver em estado desconhecido: descarta em vez de devolver ao pool
+        with self._lock:
+          self._drivers.remove(driver)
+        driver.quit()
+        raise
+      self._idle.put(driver)
+
+  def close(self) -> None:
+    with self._lock:
+      drivers, self._drivers = self._drivers, []
+    for driver in drivers:
+      driver.quit()
+
+  def __enter__(self) -> "DriverPool":
+    return self
+
+  def __exit__(self, *exc) -> None:
+    self.close()
+
+
+def _create_chrome(headless: bool) -> webdriver.Chrome:
+  options = Options()
+  if headless:
+    options.add_argument("--headless")
+  return webdriver.Chrome(options=options)
+
+
+def chrome_driver_factory(headless: bool = True) -> Callable[[], webdriver.Chrome]:
+  return partial(_create_chrome, headless)
+
+
+def _scrape_with(driver, flow: ITAProvasFlow) -> list[list[dict[str, str]]]:
+  driver_name = type(driver).__name__
+  with span("extract.page_load", url=flow.url, driver=driver_name):
+    driver.get(flow.url)
+  reset_frame_context(driver)
+  with span("extract.navigate", url=flow.url, driver=driver_name):
+    flow.navigate(driver)
+  tables = []
+  for i, table in enumerate(flow.tables):
+    with span("extract.table", url=flow.url, table=i, driver=driver_name) as s:
+      tables.append(table.get_data(driver))
+      s.set(rows=len(tables[-1]))
+  return tables
+
+
+def _scrape_static(flow: ITAProvasFlow) -> list[list[dict[str, str]]] | None:
+  driver = StaticDriver()
+  try:
+    tables = _scrape_with(driver, flow)
+  except (WebDriverException, requests.RequestException, etree.ParserError) as e:
+    print(f"Static extraction of {flow.url} failed ({e}); falling back to Chrome.")
+    return None
+  finally:
+    driver.quit()
+  # Tabela vazia costuma indicar conteúdo montado via JavaScript
+  if not all(tables):
+    print(
+      f"Static extraction of {flow.url} found empty tables; falling back to Chrome."
+    )
+    return None
+  return tables
+
+
+def _scrape_chrome(flow: ITAProvasFlow, headless: bool) -> list[list[dict[str, str]]]:
+  driver = _create_chrome(headless)
+  try:
+    return _scrape_with(driver, flow)
+  finally:
+    driver.quit()
+
+
+def scrape_flow_tables(
+  flow: ITAProvasFlow,
+  *,
+  headless: bool = True,
+  use_browser: bool = False,
+  driver_pool: DriverPool | None = None,
+) -> list[list[dict[str, str]]]:
+  if not use_browser:
+    tables = _scrape_static(flow)
+    if tables is not None:
+      return tables
+  if driver_pool is None:
+    return _scrape_chrome(flow, headless)
+  with driver_pool.acquire() as driver:
+    return _scrape_with(driver, flow)
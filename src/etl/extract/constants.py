@@ -1,2 +1,9 @@
 PROVAS_ITA_VESTIBULAR_URL = "https://www.vestibular.ita.br/"
 PROVAS_ITA_POS_URL = "https://www.civil.ita.br/posgrad/"
+
+DOWNLOAD_WORKERS = 8
+DOWNLOAD_MAX_PER_HOST = 4
+DOWNLOAD_TIMEOUT = 30
+DOWNLOAD_CHUNK_SIZE = 1 << 16
+
+BROWSER_POOL_SIZE = 2
@@ -1,7 +1,25 @@
 import argparse
+from collections import Counter
+from pathlib import Path
 
-from src.etl.extract._extract_pos import extract_pos
-from src.etl.extract._extract_vestibular import extract_vestibular
+from src.etl.extract._downloader import DownloadResult
+from src.etl.extract._extract_flow import extract_all, extract_flow
+from src.etl.extract._flows import FLOWS
+from src.etl.extract.constants import BROWSER_POOL_SIZE
+from src.utils.tracing import enable_tracing, report_trace
+
+
+def _report_downloads(results: list[DownloadResult]) -> None:
+  failed = [r for r in results if not r.ok]
+  total_bytes = sum(r.bytes for r in results)
+  counts = Counter(r.status for r in results)
+  by_status = ", ".join(f"{count} {status}" for status, count in sorted(counts.items()))
+  print(
+    f"PDFs: {len(results) - len(failed)}/{len(results)} up to date "
+    f"({by_status}; {total_bytes / 1e6:.1f} MB transferred)."
+  )
+  for r in failed:
+    print(f"  Failed: {r.url} -> {r.path.name} ({r.error})")
 
 
 def main() -> None:
@@ -9,34 +27,69 @@ def main() -> None:
   parser.add_argument(
     "type",
     nargs="?",
-    choices=["vestibular", "pos"],
+    choices=[*FLOWS, "all"],
     default=None,
-    help="type of extraction: vestibular or pos (mandatory)",
+    help=f"type of extraction: {', '.join(FLOWS)} or all (mandatory)",
   )
   parser.add_argument(
     "--no-headless",
     action="store_true",
     help="run Chrome with window visible",
   )
+  parser.add_argument(
+    "--browser",
+    action="store_true",
+    help="scrape the listing pages with Chrome instead of plain HTTP",
+  )
   parser.add_argument(
     "--force",
     action="store_true",
     default=False,
     help="regenerate JSON files from site even if they exist",
   )
+  parser.add_argument(
+    "--workers",
+    type=int,
+    default=None,
+    help="number of concurrent PDF downloads",
+  )
+  parser.add_argument(
+    "--browsers",
+    type=int,
+    default=BROWSER_POOL_SIZE,
+    help="maximum Chrome instances shared by the flows in 'all' mode",
+  )
+  parser.add_argument(
+    "--trace",
+    type=Path,
+    default=None,
+    metavar="DIR",
+    help="record timing spans as JSON lines and a Chrome trace in DIR",
+  )
   args = parser.parse_args()
 
   if args.type is None:
-    parser.error("It is mandatory to choose a type of extraction: vestibular or pos")
+    parser.error(
+      f"It is mandatory to choose a type of extraction: {', '.join(FLOWS)} or all"
+    )
 
+  if args.trace:
+    enable_tracing(args.trace)
   common = dict(
     headless=not args.no_headless,
+    use_browser=args.browser,
     force_replace=args.force,
+    download_workers=args.workers,
   )
-  if args.type == "vestibular":
-    extract_vestibular(**common)
+  if args.type == "all":
+    results_by_flow = extract_all(browsers=args.browsers, **common)
+    for name, results in results_by_flow.items():
+      print(f"[{name}]")
+      _report_downloads(results)
   else:
-    extract_pos(**common)
+    _report_downloads(extract_flow(FLOWS[args.type], **common))
+  if args.trace:
+    report_trace(args.trace)
 
 
 if __name__ == "__main__":
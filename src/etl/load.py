@@ -0,0 +1,656 @@
+import argparse
+import asyncio
+import hashlib
+import json
+import mimetypes
+import re
+import struct
+import threading
+from collections.abc import Coroutine, Iterable
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from itertools import islice
+from pathlib import Path
+
+import asyncpg
+import pymupdf
+
+from src.config import settings
+from src.constants import Discipline, FormatType, Language
+from src.etl.catalog import Catalog, CatalogEntry
+from src.etl.transform.constants import OBJECTIVE_OPTION_LETTERS
+from src.etl.transform.images import EMBEDDED_IMAGES_INDEX_FILENAME
+from src.etl.transform.manifest import QUESTIONS_FILENAME, TEXTS_FILENAME, load_manifest
+from src.etl.transform.pages import objective_option_letters
+from src.etl.transform.paths import get_data_dir, get_exam_output_dir
+from src.utils.tracing import span
+
+LOAD_BATCH_SIZE = 5000
+LOAD_POOL_SIZE = 4
+
+_QUESTION_FIGURE_RE = re.compile(r"^questao_(\d+)(?:_p(\d+))?\.png$")
+_PAGE_FIGURE_RE = re.compile(r"^pagina_(\d+)_(.+)\.png$")
+_QUESTION_PDF_RE = re.compile(r"^questao_(\d+)\.pdf$")
+_PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+# Objetiva: ao menos 4 das alternativas A–E reconhecidas no texto extraído
+MIN_OBJECTIVE_OPTIONS = 4
+
+
+@dataclass(frozen=True)
+class UpsertTarget:
+  table: str
+  keys: tuple[str, ...]
+  values: tuple[str, ...]
+  # Linhas do exame ($1 = exam_id) que saem se não vierem na nova carga
+  scope: str
+
+
+QUESTIONS = UpsertTarget(
+  "questions",
+  ("exam_id", "number"),
+  ("page", "content_hash", "format_type"),
+  "t.exam_id = $1",
+)
+QUESTION_PARTS = UpsertTarget(
+  "question_parts",
+  ("question_id", "part"),
+  ("page", "x0", "y0", "x1", "y1"),
+  "t.question_id IN (SELECT id FROM questions WHERE exam_id = $1)",
+)
+EXAM_TEXTS = UpsertTarget(
+  "exam_texts",
+  ("exam_id", "kind", "question_id", "page"),
+  ("content",),
+  "t.exam_id = $1",
+)
+FIGURES = UpsertTarget(
+  "figures",
+  ("exam_id", "path"),
+  (
+    "question_id",
+    "page",
+    "part",
+    "kind",
+    "label",
+    "file_name",
+    "media_type",
+    "width",
+    "height",
+    "byte_size",
+    "sha256",
+  ),
+  "t.exam_id = $1",
+)
+EXAM_VALUES = (
+  "discipline",
+  "language",
+  "url",
+  "pdf_path",
+  "pdf_sha256",
+  "page_count",
+  "question_count",
+)
+
+
+class LoadError(RuntimeError):
+  pass
+
+
+@dataclass
+class FigureRecord:
+  question: int | None
+  page: int | None
+  part: int | None
+  kind: str
+  label: str | None
+  file_name: str
+  path: str
+  media_type: str
+  width: int | None
+  height: int | None
+  byte_size: int
+  sha256: str
+
+
+@dataclass
+class ExamRecords:
+  pdf_path: str
+  pdf_sha256: str
+  page_count: int | None
+  # (número, página inicial, hash do conteúdo, FormatType)
+  questions: list[tuple[int, int, str, str]] = field(default_factory=list)
+  # (número, parte, página, x0, y0, x1, y1)
+  parts: list[tuple[int, int, int, float, float, float, float]] = field(
+    default_factory=list
+  )
+  # (número ou None, página ou None, kind, conteúdo)
+  texts: list[tuple[int | None, int | None, str, str]] = field(default_factory=list)
+  figures: list[FigureRecord] = field(default_factory=list)
+
+
+def _utc_now() -> datetime:
+  # Colunas timestamp sem fuso (Base): UTC ingênuo
+  return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def _png_size(data: bytes) -> tuple[int | None, int | None]:
+  if len(data) < 24 or not data.startswith(_PNG_SIGNATURE):
+    return None, None
+  return struct.unpack(">II", data[16:24])
+
+
+def _data_relative(path: Path) -> str:
+  try:
+    return str(path.relative_to(get_data_dir()))
+  except ValueError:
+    return str(path)
+
+
+def _figure(
+  path: Path,
+  kind: str,
+  *,
+  question: int | None = None,
+  page: int | None = None,
+  part: int | None = None,
+  label: str | None = None,
+  size: tuple[int | None, int | None] = (None, None),
+) -> FigureRecord:
+  data = path.read_bytes()
+  media_type = mimetypes.guess_type(path.name)[0] or "application/octet-stream"
+  if media_type == "image/png" and size == (None, None):
+    size = _png_size(data)
+  return FigureRecord(
+    question=question,
+    page=page,
+    part=part,
+    kind=kind,
+    label=label,
+    file_name=path.name,
+    path=_data_relative(path),
+    media_type=media_type,
+    width=size[0],
+    height=size[1],
+    byte_size=len(data),
+    sha256=hashlib.sha256(data).hexdigest(),
+  )
+
+
+def _read_figures(
+  out_dir: Path, question_rects: dict[int, list[list]]
+) -> list[FigureRecord]:
+  figures = []
+  for path in sorted((out_dir / "questoes").glob("*.png")):
+    if match := _QUESTION_FIGURE_RE.match(path.name):
+      num, part = int(match[1]), int(match[2] or 1)
+      clips = question_rects.get(num, [])
+      page = clips[part - 1][0] if part <= len(clips) else None
+      figures.append(_figure(path, "question", question=num, page=page, part=part))
+  for path in sorted((out_dir / "fora_questoes").glob("*.png")):
+    if match := _PAGE_FIGURE_RE.match(path.name):
+      figures.append(_figure(path, "non_question", page=int(match[1]), label=match[2]))
+  for path in sorted((out_dir / "questoes_pdf").glob("*.pdf")):
+    if match := _QUESTION_PDF_RE.match(path.name):
+      figures.append(_figure(path, "vector_pdf", question=int(match[1])))
+  index_path = out_dir / "imagens" / EMBEDDED_IMAGES_INDEX_FILENAME
+  if index_path.exists():
+    for image in json.loads(index_path.read_text(encoding="utf-8")):
+      figures.append(
+        _figure(
+          out_dir / "imagens" / image["file"],
+          "embedded",
+          question=image["question"],
+          page=image["page"],
+          size=(image["width"], image["height"]),
+        )
+      )
+  return figures
+
+
+def question_content_hash(
+  text: str, clips: list[list], figure_hashes: Iterable[str]
+) -> str:
+  payload = json.dumps([text, clips, sorted(figure_hashes)], default=str)
+  return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def question_format(text: str) -> str:
+  letters = set()
+  for line in text.splitlines():
+    letters.update(objective_option_letters(line))
+  if len(letters & set(OBJECTIVE_OPTION_LETTERS)) >= MIN_OBJECTIVE_OPTIONS:
+    return FormatType.OBJECTIVE.value
+  return FormatType.ESSAY.value
+
+
+def exam_discipline(column: str) -> str | None:
+  # "matematica", "1o_semestre_ingles"...; "prova_1f" e gabaritos não têm uma só
+  words = column.split("_")
+  for discipline in Discipline:
+    if discipline.value in words:
+      return discipline.value
+  return None
+
+
+def exam_language(column: str) -> str:
+  if Language.INGLES.value in column.split("_"):
+    return Language.INGLES.value
+  return Language.PORTUGUES.value
+
+
+def _read_output_json(path: Path, keys: tuple[str, ...]) -> dict:
+  data = json.loads(path.read_text(encoding="utf-8"))
+  missing = [key for key in keys if not isinstance(data, dict) or key not in data]
+  if missing:
+    # Saída antiga (ex.: texts.json de antes do outside_by_page) ou incompleta
+    raise LoadError(
+      f"{path} is missing {', '.join(missing)}; re-run the transform with --force"
+    )
+  return data
+
+
+def read_exam_records(out_dir: Path) -> ExamRecords:
+  manifest = load_manifest(out_dir)
+  if not manifest.get("pdf_sha256") or not manifest.get("pdf"):
+    raise LoadError(f"{out_dir} has no transform manifest")
+  questions = _read_output_json(
+    out_dir / QUESTIONS_FILENAME, ("positions", "question_rects")
+  )
+  texts = _read_output_json(out_dir / TEXTS_FILENAME, ("inside", "outside_by_page"))
+  try:
+    return _exam_records(out_dir, manifest, questions, texts)
+  except (AttributeError, KeyError, TypeError) as e:
+    raise LoadError(f"{out_dir} has malformed transform output: {e!r}") from e
+
+
+def _exam_records(
+  out_dir: Path, manifest: dict, questions: dict, texts: dict
+) -> ExamRecords:
+  question_rects = {
+    int(num): clips for num, clips in questions["question_rects"].items()
+  }
+  try:
+    with pymupdf.open(manifest["pdf"]) as doc:
+      page_count = doc.page_count
+  except (RuntimeError, ValueError):
+    page_count = None
+
+  records = ExamRecords(
+    pdf_path=manifest["pdf"],
+    pdf_sha256=manifest["pdf_sha256"],
+    page_count=page_count,
+  )
+  records.parts = [
+    (num, part + 1, page_no, *clip)
+    for num, clips in sorted(question_rects.items())
+    for part, (page_no, clip) in enumerate(clips)
+  ]
+  records.texts = [
+    (int(num), None, "question", text) for num, text in texts["inside"].items()
+  ] + [
+    (None, int(page_no), "page", text)
+    for page_no, text in texts["outside_by_page"].items()
+  ]
+  records.figures = _read_figures(out_dir, question_rects)
+  figure_hashes: dict[int, list[str]] = {}
+  for figure in records.figures:
+    if figure.question is not None:
+      figure_hashes.setdefault(figure.question, []).append(figure.sha256)
+  records.questions = [
+    (
+      num,
+      page_no,
+      question_content_hash(
+        texts["inside"].get(str(num), ""),
+        question_rects.get(num, []),
+        figure_hashes.get(num, []),
+      ),
+      question_format(texts["inside"].get(str(num), "")),
+    )
+    for num, page_no, _ in questions["positions"]
+  ]
+  return records
+
+
+@dataclass
+class UpsertCounts:
+  inserted: int = 0
+  updated: int = 0
+  unchanged: int = 0
+  deleted: int = 0
+
+  def add(self, other: "UpsertCounts") -> None:
+    self.inserted += other.inserted
+    self.updated += other.updated
+    self.unchanged += other.unchanged
+    self.deleted += other.deleted
+
+
+def _merge_sql(target: UpsertTarget, stage: str) -> str:
+  columns = ", ".join(target.keys + target.values)
+  updates = ", ".join(f"{c} = excluded.{c}" for c in target.values)
+  current = ", ".join(f"t.{c}" for c in target.values)
+  incoming = ", ".join(f"excluded.{c}" for c in target.values)
+  # Linha idêntica não é reescrita: sem tupla nova, WAL nem churn de índice
+  return f"""
+    INSERT INTO {target.table} AS t ({columns}, created_at, updated_at)
+    SELECT {columns}, $2::timestamp, $2::timestamp FROM {stage} WHERE batch = $1
+    ON CONFLICT ({", ".join(target.keys)}) DO UPDATE
+    SET {updates}, updated_at = excluded.updated_at
+    WHERE ({current}) IS DISTINCT FROM ({incoming})
+    RETURNING xmax = 0 AS inserted
+  """
+
+
+async def upsert_rows(
+  conn: asyncpg.Connection,
+  target: UpsertTarget,
+  exam_id: int,
+  rows: Iterable[tuple],
+  now: datetime,
+  batch_size: int = LOAD_BATCH_SIZE,
+) -> UpsertCounts:
+  columns = target.keys + target.values
+  stage = f"stage_{target.table}"
+  await conn.execute(
+    f"CREATE TEMP TABLE {stage} ON COMMIT DROP AS "
+    f"SELECT {', '.join(columns)}, 0 AS batch FROM {target.table} WITH NO DATA"
+  )
+  merge = _merge_sql(target, stage)
+  counts = UpsertCounts()
+  rows = iter(rows)
+  batch_no = 0
+  # COPY de cada lote para a tabela temporária e um único merge por lote
+  while batch := list(islice(rows, batch_size)):
+    await conn.copy_records_to_table(
+      stage,
+      records=[(*row, batch_no) for row in batch],
+      columns=(*columns, "batch"),
+    )
+    written = await conn.fetch(merge, batch_no, now)
+    inserted = sum(row["inserted"] for row in written)
+    counts.inserted += inserted
+    counts.updated += len(written) - inserted
+    counts.unchanged += len(batch) - len(written)
+    batch_no += 1
+  same_key = " AND ".join(f"s.{c} IS NOT DISTINCT FROM t.{c}" for c in target.keys)
+  status = await conn.execute(
+    f"DELETE FROM {target.table} AS t WHERE {target.scope} "
+    f"AND NOT EXISTS (SELECT 1 FROM {stage} AS s WHERE {same_key})",
+    exam_id,
+  )
+  counts.deleted = int(status.split()[-1])
+  return counts
+
+
+async def _upsert_exam_row(
+  conn: asyncpg.Connection,
+  entry: CatalogEntry,
+  records: ExamRecords,
+  now: datetime,
+) -> tuple[int, UpsertCounts]:
+  current = ", ".join(f"t.{c}" for c in EXAM_VALUES)
+  incoming = ", ".join(f"excluded.{c}" for c in EXAM_VALUES)
+  row = await conn.fetchrow(
+    f"""
+    INSERT INTO exams AS t (
+      exam_type, year, column_name, {", ".join(EXAM_VALUES)}, created_at, updated_at
+    )
+    VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9, $10, $11, $11)
+    ON CONFLICT (exam_type, year, column_name) DO UPDATE
+    SET {", ".join(f"{c} = excluded.{c}" for c in EXAM_VALUES)},
+      updated_at = excluded.updated_at
+    WHERE ({current}) IS DISTINCT FROM ({incoming})
+    RETURNING id, xmax = 0 AS inserted
+    """,
+    entry.exam_type,
+    entry.year,
+    entry.column,
+    exam_discipline(entry.column),
+    exam_language(entry.column),
+    entry.url,
+    str(entry.path),
+    records.pdf_sha256,
+    records.page_count,
+    len(records.questions),
+    now,
+  )
+  if row is None:
+    exam_id = await conn.fetchval(
+      "SELECT id FROM exams WHERE exam_type = $1 AND year = $2 AND column_name = $3",
+      entry.exam_type,
+      entry.year,
+      entry.column,
+    )
+    return exam_id, UpsertCounts(unchanged=1)
+  if row["inserted"]:
+    return row["id"], UpsertCounts(inserted=1)
+  return row["id"], UpsertCounts(updated=1)
+
+
+async def upsert_exam(
+  conn: asyncpg.Connection,
+  entry: CatalogEntry,
+  records: ExamRecords,
+  batch_size: int = LOAD_BATCH_SIZE,
+) -> tuple[int, dict[str, UpsertCounts]]:
+  now = _utc_now()
+  counts: dict[str, UpsertCounts] = {}
+  async with conn.transaction():
+    exam_id, counts["exams"] = await _upsert_exam_row(conn, entry, records, now)
+    counts["questions"] = await upsert_rows(
+      conn,
+      QUESTIONS,
+      exam_id,
+      (
+        (exam_id, num, page, content_hash, format_type)
+        for num, page, content_hash, format_type in records.questions
+      ),
+      now,
+      batch_size,
+    )
+    rows = await conn.fetch(
+      "SELECT number, id FROM questions WHERE exam_id = $1", exam_id
+    )
+    question_ids = {row["number"]: row["id"] for row in rows}
+    counts["question_parts"] = await upsert_rows(
+      conn,
+      QUESTION_PARTS,
+      exam_id,
+      (
+        (question_ids[num], part, page, x0, y0, x1, y1)
+        for num, part, page, x0, y0, x1, y1 in records.parts
+        if num in question_ids
+      ),
+      now,
+      batch_size,
+    )
+    counts["exam_texts"] = await upsert_rows(
+      conn,
+      EXAM_TEXTS,
+      exam_id,
+      (
+        (exam_id, kind, question_ids.get(num), page, content)
+        for num, page, kind, content in records.texts
+      ),
+      now,
+      batch_size,
+    )
+    counts["figures"] = await upsert_rows(
+      conn,
+      FIGURES,
+      exam_id,
+      (
+        (
+          exam_id,
+          f.path,
+          question_ids.get(f.question),
+          f.page,
+          f.part,
+          f.kind,
+          f.label,
+          f.file_name,
+          f.media_type,
+          f.width,
+          f.height,
+          f.byte_size,
+          f.sha256,
+        )
+        for f in records.figures
+      ),
+      now,
+      batch_size,
+    )
+  return exam_id, counts
+
+
+class ExamLoader:
+  def __init__(
+    self,
+    dsn: str | None = None,
+    *,
+    catalog: Catalog | None = None,
+    pool_size: int = LOAD_POOL_SIZE,
+  ):
+    self._catalog = catalog or Catalog()
+    self.counts: dict[str, UpsertCounts] = {}
+    self._counts_lock = threading.Lock()
+    # asyncpg precisa de um event loop; as threads de load do pipeline são
+    # síncronas, então o loop roda numa thread própria e recebe as cargas
+    self._loop = asyncio.new_event_loop()
+    self._thread = threading.Thread(
+      target=self._loop.run_forever, name="exam-loader", daemon=True
+    )
+    self._thread.start()
+    try:
+      self._pool = self._run(self._create_pool(dsn, pool_size))
+    except LoadError:
+      self._stop_loop()
+      raise
+
+  @staticmethod
+  async def _create_pool(dsn: str | None, pool_size: int) -> asyncpg.Pool:
+    return await asyncpg.create_pool(
+      dsn or settings.database_dsn, min_size=1, max_size=pool_size
+    )
+
+  def _run(self, coro: Coroutine):
+    try:
+      return asyncio.run_coroutine_threadsafe(coro, self._loop).result()
+    except (asyncpg.PostgresError, asyncpg.InterfaceError, OSError) as e:
+      raise LoadError(f"{type(e).__name__}: {e}") from e
+
+  def _stop_loop(self) -> None:
+    self._loop.call_soon_threadsafe(self._loop.stop)
+    self._thread.join()
+    self._loop.close()
+
+  def entries_for(self, pdf_path: Path) -> list[CatalogEntry]:
+    entry = self._catalog.entry_for_path(pdf_path)
+    if entry is None:
+      raise LoadError(f"{pdf_path} is not in the catalog")
+    if entry.sha256 is None:
+      return [entry]
+    # O mesmo blob listado em outros anos/colunas vira um exame para cada um
+    return self._catalog.entries_with_sha256(entry.sha256)
+
+  async def _load(
+    self, entries: list[CatalogEntry], records: ExamRecords
+  ) -> list[tuple[int, dict[str, UpsertCounts]]]:
+    async with self._pool.acquire() as conn:
+      return [await upsert_exam(conn, entry, records) for entry in entries]
+
+  def load(self, item: dict) -> list[int]:
+    pdf_path = Path(item["file"])
+    out_dir = Path(item.get("out_dir") or get_exam_output_dir(pdf_path))
+    with span("load.exam", path=str(pdf_path)) as s:
+      entries = self.entries_for(pdf_path)
+      records = read_exam_records(out_dir)
+      s.set(
+        exams=len(entries),
+        questions=len(records.questions),
+        figures=len(records.figures),
+      )
+      results = self._run(self._load(entries, records))
+      written = 0
+      with self._counts_lock:
+        for _, counts in results:
+          for table, table_counts in counts.items():
+            self.counts.setdefault(table, UpsertCounts()).add(table_counts)
+            written += table_counts.inserted + table_counts.updated
+      s.set(rows_written=written)
+    return [exam_id for exam_id, _ in results]
+
+  __call__ = load
+
+  def close(self) -> None:
+    self._run(self._pool.close())
+    self._stop_loop()
+
+  def __enter__(self) -> "ExamLoader":
+    return self
+
+  def __exit__(self, *exc) -> None:
+    self.close()
+
+
+def load_transformed(
+  catalog: Catalog,
+  loader: ExamLoader,
+  *,
+  force: bool = False,
+) -> tuple[int, list[dict]]:
+  statuses = ["transformed"]
+  if force:
+    statuses += ["loaded", "load_failed"]
+  # Um item por blob: o loader replica o conteúdo para as entradas irmãs
+  by_sha256: dict[str, list[CatalogEntry]] = {}
+  for entry in catalog.entries(statuses=statuses):
+    by_sha256.setdefault(entry.sha256 or str(entry.path), []).append(entry)
+  loaded, errors = 0, []
+  for group in by_sha256.values():
+    paths = [entry.path for entry in group]
+    try:
+      loaded += len(loader.load({"file": str(paths[0])}))
+    except (LoadError, OSError, ValueError) as e:
+      catalog.set_status(paths, "load_failed", str(e))
+      errors.append({"file": str(paths[0]), "error": str(e)})
+      continue
+    catalog.set_status(paths, "loaded")
+  return loaded, errors
+
+
+def print_load_counts(counts: dict[str, UpsertCounts]) -> None:
+  print(
+    f"{'table':<16} {'inserted':>9} {'updated':>9} {'unchanged':>10} {'deleted':>8}"
+  )
+  for table, c in counts.items():
+    print(
+      f"{table:<16} {c.inserted:>9} {c.updated:>9} {c.unchanged:>10} {c.deleted:>8}"
+    )
+
+
+def main() -> None:
+  parser = argparse.ArgumentParser(
+    description="Load transformed exams from the catalog into PostgreSQL"
+  )
+  parser.add_argument(
+    "--dsn", default=None, help="PostgreSQL DSN (default: DATABASE_URL)"
+  )
+  parser.add_argument(
+    "--force",
+    action="store_true",
+    help="reload exams that were already loaded",
+  )
+  args = parser.parse_args()
+
+  with Catalog() as catalog, ExamLoader(args.dsn, catalog=catalog) as loader:
+    loaded, errors = load_transformed(catalog, loader, force=args.force)
+  print(f"Loaded {loaded} exams; {len(errors)} failed.")
+  for error in errors:
+    print(f"  {error['file']}: {error['error']}")
+  print_load_counts(loader.counts)
+
+
+if __name__ == "__main__":
+  main()
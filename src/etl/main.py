@@ -1,8 +1,122 @@
-from src.etl.extract import extract
-from src.etl.transform import transform
-from src.etl.load import load
+import argparse
+import json
+from pathlib import Path
+
+from src.etl.catalog import Catalog
+from src.etl.extract._flows import FLOWS
+from src.etl.load import ExamLoader, LoadError, print_load_counts
+from src.etl.pipeline import PipelineConfig, PipelineReport, run_pipeline
+from src.etl.transform.paths import get_transform_summary_path
+from src.utils.tracing import enable_tracing, report_trace
+
+
+def _report(report: PipelineReport) -> None:
+  downloaded = sum(r.ok for r in report.downloads)
+  transformed = [t for t in report.transforms if "error" not in t]
+  print(
+    f"Downloads: {downloaded}/{len(report.downloads)} ok; "
+    f"transforms: {len(transformed)}/{len(report.transforms)} ok; "
+    f"duplicates: {len(report.duplicates)}; "
+    f"already loaded: {len(report.up_to_date)}; "
+    f"loaded: {report.loaded}; total {report.seconds:.2f}s"
+  )
+  for r in report.downloads:
+    if not r.ok:
+      print(f"  Download failed: {r.url} ({r.error})")
+  for t in report.transforms:
+    if "error" in t:
+      print(f"  Transform failed: {t['file']} ({t['error']})")
+  for e in report.load_errors:
+    print(f"  Load failed: {e['file']} ({e['error']})")
+
+
+def main() -> None:
+  defaults = PipelineConfig()
+  parser = argparse.ArgumentParser(description="Run extract, transform and load")
+  parser.add_argument(
+    "flows",
+    nargs="*",
+    help=f"flows to run (default: all of {', '.join(FLOWS)})",
+  )
+  parser.add_argument("--download-workers", type=int, default=defaults.download_workers)
+  parser.add_argument(
+    "--transform-workers", type=int, default=defaults.transform_workers
+  )
+  parser.add_argument("--load-workers", type=int, default=defaults.load_workers)
+  parser.add_argument(
+    "--queue-size",
+    type=int,
+    default=defaults.pdf_queue_size,
+    help="downloaded PDFs kept in memory waiting for a transform worker",
+  )
+  parser.add_argument("--dpi", type=int, default=defaults.dpi)
+  parser.add_argument(
+    "--browser",
+    action="store_true",
+    help="scrape the listing pages with Chrome instead of plain HTTP",
+  )
+  parser.add_argument(
+    "--force",
+    action="store_true",
+    help="re-scrape the listings and redo every transform stage",
+  )
+  parser.add_argument(
+    "--no-load",
+    action="store_true",
+    help="stop after the transform stage, without loading into PostgreSQL",
+  )
+  parser.add_argument(
+    "--trace",
+    type=Path,
+    default=None,
+    metavar="DIR",
+    help="record timing spans as JSON lines and a Chrome trace in DIR",
+  )
+  args = parser.parse_args()
+  unknown = [name for name in args.flows if name not in FLOWS]
+  if unknown:
+    parser.error(
+      f"unknown flows: {', '.join(unknown)} (choose from {', '.join(FLOWS)})"
+    )
+
+  if args.trace:
+    enable_tracing(args.trace)
+  config = PipelineConfig(
+    download_workers=args.download_workers,
+    transform_workers=args.transform_workers,
+    load_workers=args.load_workers,
+    pdf_queue_size=args.queue_size,
+    dpi=args.dpi,
+    force=args.force,
+  )
+  with Catalog() as catalog:
+    try:
+      loader = None if args.no_load else ExamLoader(catalog=catalog)
+    except LoadError as e:
+      parser.exit(1, f"Cannot connect to the database ({e}); use --no-load\n")
+    try:
+      report = run_pipeline(
+        [FLOWS[name] for name in args.flows] or None,
+        config=config,
+        use_browser=args.browser,
+        force_replace=args.force,
+        loader=loader,
+        catalog=catalog,
+      )
+    finally:
+      if loader is not None:
+        loader.close()
+  summary_path = get_transform_summary_path()
+  summary_path.parent.mkdir(parents=True, exist_ok=True)
+  summary_path.write_text(
+    json.dumps(report.transforms, indent=2, ensure_ascii=False), encoding="utf-8"
+  )
+  _report(report)
+  if loader is not None and loader.counts:
+    print_load_counts(loader.counts)
+  if args.trace:
+    report_trace(args.trace)
+
 
 if __name__ == "__main__":
-  extract()
-  transform()
-  load()
+  main()
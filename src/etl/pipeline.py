@@ -0,0 +1,249 @@
+import os
+import queue
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from src.etl.catalog import Catalog
+from src.etl.extract._downloader import DownloadJob, DownloadResult, iter_downloads
+from src.etl.extract._extract_flow import prepare_flow_jobs
+from src.etl.extract._flows import FLOWS, ExtractionFlow
+from src.etl.extract._scrape import DriverPool, chrome_driver_factory
+from src.etl.extract.constants import BROWSER_POOL_SIZE, DOWNLOAD_WORKERS
+from src.etl.store import PdfStore
+from src.etl.transform.batch import link_duplicate_outputs, transform_exam_file
+from src.etl.transform.constants import DPI, MAX_QUESTIONS
+
+PDF_QUEUE_SIZE = 4
+LOAD_QUEUE_SIZE = 16
+
+_DONE = object()
+
+
+@dataclass
+class PipelineConfig:
+  download_workers: int = DOWNLOAD_WORKERS
+  transform_workers: int = field(default_factory=lambda: os.cpu_count() or 1)
+  load_workers: int = 1
+  # PDFs baixados esperando transform (em memória): limita o uso de RAM
+  pdf_queue_size: int = PDF_QUEUE_SIZE
+  load_queue_size: int = LOAD_QUEUE_SIZE
+  browsers: int = BROWSER_POOL_SIZE
+  max_questions: int = MAX_QUESTIONS
+  dpi: int = DPI
+  force: bool = False
+
+
+@dataclass
+class PipelineReport:
+  downloads: list[DownloadResult] = field(default_factory=list)
+  transforms: list[dict] = field(default_factory=list)
+  loaded: int = 0
+  load_errors: list[dict] = field(default_factory=list)
+  # Caminho duplicado -> caminho canônico com o mesmo SHA-256
+  duplicates: dict[Path, Path] = field(default_factory=dict)
+  # Já carregados com o mesmo conteúdo segundo o catálogo
+  up_to_date: list[Path] = field(default_factory=list)
+  seconds: float = 0.0
+
+
+def _download_stage(
+  jobs: list[DownloadJob],
+  config: PipelineConfig,
+  pdf_queue: queue.Queue,
+  report: PipelineReport,
+  store: PdfStore,
+  catalog: Catalog,
+  stop: threading.Event,
+) -> None:
+  canonical: dict[str, Path] = {}
+  try:
+    for result in iter_downloads(jobs, workers=config.download_workers, store=store):
+      # Transform parou com erro: não há mais quem consuma a fila de PDFs
+      if stop.is_set():
+        break
+      report.downloads.append(result)
+      catalog.record_download(
+        result.path, ok=result.ok, sha256=result.sha256, error=result.error
+      )
+      if not result.ok:
+        continue
+      entry = catalog.entry_for_path(result.path)
+      if not config.force and entry is not None and entry.status == "loaded":
+        report.up_to_date.append(result.path)
+        continue
+      # Mesmo conteúdo em outro caminho: transform e load só uma vez por blob
+      if result.sha256 in canonical:
+        report.duplicates[result.path] = canonical[result.sha256]
+        continue
+      if result.sha256 is not None:
+        canonical[result.sha256] = result.path
+      try:
+        data = result.path.read_bytes()
+      except OSError as e:
+        report.transforms.append({"file": str(result.path), "error": str(e)})
+        continue
+      # Bloqueia quando a fila está cheia: o transform dita o ritmo
+      pdf_queue.put((result.path, data, result.sha256))
+  finally:
+    pdf_queue.put(_DONE)
+
+
+def _transform_stage(
+  config: PipelineConfig,
+  pdf_queue: queue.Queue,
+  load_queue: queue.Queue | None,
+  report: PipelineReport,
+  catalog: Catalog,
+  stop: threading.Event,
+) -> None:
+  in_flight = threading.BoundedSemaphore(config.transform_workers)
+  drained = False
+
+  def on_done(pdf_path: Path, sha256: str | None, future: Future) -> None:
+    in_flight.release()
+    error = future.exception()
+    if error is not None:
+      item = {"file": str(pdf_path), "error": f"{type(error).__name__}: {error}"}
+    else:
+      item = future.result()
+    item["sha256"] = sha256
+    report.transforms.append(item)
+    if "error" in item:
+      catalog.set_status([pdf_path], "transform_failed", item["error"])
+    else:
+      catalog.set_status([pdf_path], "transformed")
+      if load_queue is not None:
+        load_queue.put(item)
+
+  try:
+    with ProcessPoolExecutor(max_workers=config.transform_workers) as pool:
+      while (entry := pdf_queue.get()) is not _DONE:
+        pdf_path, data, sha256 = entry
+        in_flight.acquire()
+        future = pool.submit(
+          transform_exam_file,
+          pdf_path,
+          max_questions=config.max_questions,
+          dpi=config.dpi,
+          force=config.force,
+          data=data,
+        )
+        future.add_done_callback(lambda f, p=pdf_path, h=sha256: on_done(p, h, f))
+      drained = True
+  finally:
+    if not drained:
+      # Ex.: BrokenProcessPool no submit. Esvazia a fila até o _DONE para o
+      # download não ficar preso no put
+      stop.set()
+      while pdf_queue.get() is not _DONE:
+        pass
+    if load_queue is not None:
+      for _ in range(config.load_workers):
+        load_queue.put(_DONE)
+
+
+def _load_stage(
+  loader: Callable[[dict], None],
+  load_queue: queue.Queue,
+  report: PipelineReport,
+  lock: threading.Lock,
+  catalog: Catalog,
+) -> None:
+  while (item := load_queue.get()) is not _DONE:
+    pdf_path = Path(item["file"])
+    try:
+      loader(item)
+    # Qualquer erro de uma prova vira load_failed: se esta thread morresse, o
+    # transform travaria no put da fila de load
+    except Exception as e:  # noqa: BLE001
+      error = f"{type(e).__name__}: {e}"
+      catalog.set_status([pdf_path], "load_failed", error)
+      with lock:
+        report.load_errors.append({"file": item["file"], "error": error})
+      continue
+    catalog.set_status([pdf_path], "loaded")
+    with lock:
+      report.loaded += 1
+
+
+def run_pipeline(
+  flows: list[ExtractionFlow] | None = None,
+  *,
+  config: PipelineConfig | None = None,
+  loader: Callable[[dict], None] | None = None,
+  headless: bool = True,
+  use_browser: bool = False,
+  force_replace: bool = False,
+  catalog: Catalog | None = None,
+) -> PipelineReport:
+  flows = flows or list(FLOWS.values())
+  config = config or PipelineConfig()
+  own_catalog = catalog is None
+  catalog = catalog or Catalog()
+  try:
+    start = time.perf_counter()
+    report = PipelineReport()
+
+    with DriverPool(chrome_driver_factory(headless), size=config.browsers) as pool:
+      jobs = [
+        job
+        for flow in flows
+        for job in prepare_flow_jobs(
+          flow,
+          headless=headless,
+          use_browser=use_browser,
+          force_replace=force_replace,
+          driver_pool=pool,
+          catalog=catalog,
+        )
+      ]
+
+    pdf_queue: queue.Queue = queue.Queue(maxsize=config.pdf_queue_size)
+    load_queue: queue.Queue | None = None
+    lock = threading.Lock()
+    stop = threading.Event()
+    threads = [
+      threading.Thread(
+        target=_download_stage,
+        args=(jobs, config, pdf_queue, report, PdfStore(), catalog, stop),
+        name="pipeline-download",
+      )
+    ]
+    # Sem loader não há estágio de load: as provas ficam "transformed" e entram
+    # na próxima execução com banco, em vez de marcadas "loaded" sem ter carregado
+    if loader is not None:
+      load_queue = queue.Queue(maxsize=config.load_queue_size)
+      threads += [
+        threading.Thread(
+          target=_load_stage,
+          args=(loader, load_queue, report, lock, catalog),
+          name=f"pipeline-load-{i}",
+        )
+        for i in range(config.load_workers)
+      ]
+    for thread in threads:
+      thread.start()
+    try:
+      _transform_stage(config, pdf_queue, load_queue, report, catalog, stop)
+    finally:
+      for thread in threads:
+        thread.join()
+
+    transformed = {item["file"] for item in report.transforms if "error" not in item}
+    for duplicate, canonical in report.duplicates.items():
+      if str(canonical) in transformed:
+        report.transforms.extend(link_duplicate_outputs(canonical, [duplicate]))
+      # Duplicata acompanha o status do canônico (o conteúdo é o mesmo)
+      entry = catalog.entry_for_path(canonical)
+      if entry is not None:
+        catalog.set_status([duplicate], entry.status, entry.error)
+    report.transforms.sort(key=lambda item: item["file"])
+    report.seconds = time.perf_counter() - start
+    return report
+  finally:
+    if own_catalog:
+      catalog.close()
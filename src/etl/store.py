@@ -0,0 +1,52 @@
+import hashlib
+import os
+from pathlib import Path
+
+from src.etl.transform.paths import get_pdf_store_dir
+
+
+def _sha256_of(path: Path, chunk_size: int = 1 << 20) -> str:
+  digest = hashlib.sha256()
+  with open(path, "rb") as f:
+    while chunk := f.read(chunk_size):
+      digest.update(chunk)
+  return digest.hexdigest()
+
+
+def _replace_with_symlink(path: Path, target: Path) -> None:
+  # Symlink relativo criado ao lado e trocado atomicamente
+  tmp = path.with_name(path.name + ".link")
+  tmp.unlink(missing_ok=True)
+  tmp.symlink_to(os.path.relpath(target, path.parent))
+  os.replace(tmp, path)
+
+
+class PdfStore:
+  def __init__(self, root: Path | None = None):
+    self.root = (root or get_pdf_store_dir()).resolve()
+
+  def blob_path(self, sha256: str) -> Path:
+    return self.root / sha256[:2] / f"{sha256}.pdf"
+
+  def stored_sha256(self, path: Path) -> str | None:
+    if not path.is_symlink():
+      return None
+    target = path.resolve()
+    if target.parent.parent != self.root or not target.exists():
+      return None
+    return target.stem
+
+  def add(self, path: Path, sha256: str | None = None) -> str:
+    stored = self.stored_sha256(path)
+    if stored is not None:
+      sha256 = stored
+    else:
+      sha256 = sha256 or _sha256_of(path)
+      blob = self.blob_path(sha256)
+      blob.parent.mkdir(parents=True, exist_ok=True)
+      if blob.exists():
+        path.unlink()
+      else:
+        os.replace(path, blob)
+      _replace_with_symlink(path, blob)
+    return sha256
@@ -1,3 +1,9 @@
+from src.etl.transform.batch import (
+  find_exam_pdfs,
+  missing_question_numbers,
+  run_batch_transform,
+  transform_exam_file,
+)
 from src.etl.transform.constants import (
   DPI,
   MAX_QUESTIONS,
@@ -5,6 +11,7 @@ from src.etl.transform.constants import (
   MARGIN_LEFT,
   MARGIN_TOP,
   OBJECTIVE_OPTION_LETTERS,
+  OBJECTIVE_OPTION_REGEX,
   QUESTION_END_REGEX,
   QUESTION_IN_TEXT_REGEX,
   QUESTION_NUMBER_ONLY_LINE_REGEX,
@@ -13,64 +20,151 @@ from src.etl.transform.constants import (
 )
 from src.etl.transform.export_text import save_question_text_files
 from src.etl.transform.images import (
+  export_embedded_images,
+  export_figures,
   export_non_question_figures,
   export_question_figures,
+  export_question_pdfs,
   export_question_regions_pdf,
+  find_embedded_images,
 )
 from src.etl.transform.intervals import (
   merge_intervals,
   non_question_intervals_on_page,
   question_intervals_on_page,
 )
+from src.etl.transform.layout import DocumentLayout, PageLayout, build_page_layout
 from src.etl.transform.main import main, run_transform
-from src.etl.transform.pages import is_draft_page, is_essay_page, page_has_question
+from src.etl.transform.manifest import (
+  bytes_sha256,
+  detection_key,
+  figures_key,
+  file_sha256,
+  load_manifest,
+  run_incremental_transform,
+  save_manifest,
+)
+from src.etl.transform.pages import (
+  is_draft_page,
+  is_draft_text,
+  is_essay_page,
+  is_essay_text,
+  objective_option_letters,
+  objective_option_matches,
+  page_has_question,
+  text_has_question,
+)
 from src.etl.transform.paths import (
   get_base_data_dir,
+  get_catalog_path,
+  get_data_dir,
+  get_embedded_images_dir,
+  get_exam_output_dir,
+  get_exam_pdf_dirs,
   get_non_questions_figs_dir,
+  get_pdf_store_dir,
+  get_question_pdfs_dir,
   get_question_regions_pdf_path,
   get_question_texts_dir,
   get_questions_figs_dir,
+  get_transform_summary_path,
+)
+from src.etl.transform.positions import (
+  find_new_question_positions_in_page,
+  find_question_positions,
+)
+from src.etl.transform.raster import PageRaster, render_page
+from src.etl.transform.rectangles import (
+  build_question_clips,
+  build_question_rectangles,
+  find_objective_options,
+  find_question_options,
 )
-from src.etl.transform.positions import find_question_positions
-from src.etl.transform.rectangles import build_question_rectangles
+from src.etl.transform.spatial import BlockIndex
+from src.etl.transform.stream import QuestionRecord, iter_questions
 from src.etl.transform.text_extraction import (
   block_contains_question,
   extract_question_texts,
   get_text_in_rect,
+  outside_text_for_question,
+  question_pages,
 )
 
 __all__ = [
   "block_contains_question",
+  "BlockIndex",
+  "bytes_sha256",
+  "build_page_layout",
+  "build_question_clips",
   "build_question_rectangles",
+  "detection_key",
+  "DocumentLayout",
   "DPI",
+  "export_embedded_images",
+  "export_figures",
   "export_non_question_figures",
   "export_question_figures",
+  "export_question_pdfs",
   "export_question_regions_pdf",
   "extract_question_texts",
+  "figures_key",
+  "file_sha256",
+  "find_embedded_images",
+  "find_exam_pdfs",
+  "find_new_question_positions_in_page",
+  "find_objective_options",
+  "find_question_options",
   "find_question_positions",
   "get_base_data_dir",
+  "get_catalog_path",
+  "get_data_dir",
+  "get_embedded_images_dir",
+  "get_exam_output_dir",
+  "get_exam_pdf_dirs",
   "get_non_questions_figs_dir",
+  "get_pdf_store_dir",
+  "get_question_pdfs_dir",
   "get_question_regions_pdf_path",
   "get_question_texts_dir",
   "get_questions_figs_dir",
+  "get_transform_summary_path",
   "get_text_in_rect",
   "is_draft_page",
+  "is_draft_text",
   "is_essay_page",
+  "is_essay_text",
+  "iter_questions",
+  "load_manifest",
   "main",
   "merge_intervals",
+  "missing_question_numbers",
   "non_question_intervals_on_page",
+  "objective_option_letters",
+  "objective_option_matches",
+  "outside_text_for_question",
   "page_has_question",
+  "PageLayout",
+  "PageRaster",
   "question_intervals_on_page",
+  "question_pages",
+  "QuestionRecord",
   "QUESTION_END_REGEX",
   "QUESTION_IN_TEXT_REGEX",
   "QUESTION_NUMBER_ONLY_LINE_REGEX",
   "QUESTION_START_REGEX",
   "QUESTION_WORD_ALONE_REGEX",
   "OBJECTIVE_OPTION_LETTERS",
+  "OBJECTIVE_OPTION_REGEX",
   "MARGIN_BOTTOM",
   "MARGIN_LEFT",
   "MARGIN_TOP",
   "MAX_QUESTIONS",
+  "render_page",
+  "run_batch_transform",
+  "run_incremental_transform",
   "run_transform",
+  "save_manifest",
   "save_question_text_files",
+  "text_has_question",
+  "transform_exam_file",
 ]
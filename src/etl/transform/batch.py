@@ -0,0 +1,174 @@
+import json
+import os
+import shutil
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+import pymupdf
+
+from src.etl.transform.constants import DPI, MAX_QUESTIONS
+from src.etl.transform.manifest import run_incremental_transform
+from src.etl.transform.paths import (
+  get_exam_output_dir,
+  get_exam_pdf_dirs,
+  get_transform_summary_path,
+)
+from src.utils.tracing import span
+
+
+def find_exam_pdfs(pdf_dirs: list[Path] | None = None) -> list[Path]:
+  pdf_dirs = pdf_dirs or get_exam_pdf_dirs()
+  pdfs: list[Path] = []
+  for pdf_dir in pdf_dirs:
+    if pdf_dir.is_dir():
+      pdfs.extend(sorted(pdf_dir.glob("*.pdf")))
+  return pdfs
+
+
+def group_duplicate_pdfs(pdf_paths: list[Path]) -> dict[Path, list[Path]]:
+  # PDFs do store são symlinks: caminhos com o mesmo blob viram um grupo só
+  groups: dict[Path, list[Path]] = {}
+  for pdf_path in pdf_paths:
+    groups.setdefault(pdf_path.resolve(), []).append(pdf_path)
+  return {paths[0]: paths[1:] for paths in groups.values()}
+
+
+def link_duplicate_outputs(canonical: Path, duplicates: list[Path]) -> list[dict]:
+  # O canônico pode variar entre execuções: compara os diretórios reais
+  target = get_exam_output_dir(canonical).resolve()
+  items = []
+  for duplicate in duplicates:
+    out_dir = get_exam_output_dir(duplicate)
+    if out_dir.resolve() != target:
+      if out_dir.is_symlink() or out_dir.is_file():
+        out_dir.unlink()
+      elif out_dir.is_dir():
+        shutil.rmtree(out_dir)
+      out_dir.parent.mkdir(parents=True, exist_ok=True)
+      out_dir.symlink_to(
+        os.path.relpath(target, out_dir.parent), target_is_directory=True
+      )
+    items.append(
+      {"file": str(duplicate), "out_dir": str(out_dir), "duplicate_of": str(canonical)}
+    )
+  return items
+
+
+def missing_question_numbers(
+  positions: list[tuple[int, int, pymupdf.Rect]],
+  max_questions: int = MAX_QUESTIONS,
+) -> list[int]:
+  found = {p[0] for p in positions}
+  return [n for n in range(1, max_questions + 1) if n not in found]
+
+
+def _error_item(pdf_path: Path, out_dir: Path, error: Exception, start: float) -> dict:
+  return {
+    "file": str(pdf_path),
+    "out_dir": str(out_dir),
+    "error": f"{type(error).__name__}: {error}",
+    "seconds": round(time.perf_counter() - start, 3),
+  }
+
+
+def transform_exam_file(
+  pdf_path: Path,
+  out_dir: Path | None = None,
+  *,
+  max_questions: int = MAX_QUESTIONS,
+  dpi: int = DPI,
+  force: bool = False,
+  vector_pdfs: bool = False,
+  embedded_images: bool = False,
+  data: bytes | None = None,
+) -> dict:
+  out_dir = out_dir or get_exam_output_dir(pdf_path)
+  start = time.perf_counter()
+  try:
+    with span("transform.document", file=str(pdf_path)) as s:
+      result = run_incremental_transform(
+        pdf_path,
+        out_dir,
+        max_questions=max_questions,
+        dpi=dpi,
+        force=force,
+        vector_pdfs=vector_pdfs,
+        embedded_images=embedded_images,
+        data=data,
+      )
+      s.set(skipped_stages=result["skipped_stages"])
+  # Um PDF ruim (ou que sumiu do disco) vira erro no resumo, sem parar o lote
+  except (KeyError, OSError, RuntimeError, TypeError, ValueError) as e:
+    return _error_item(pdf_path, out_dir, e, start)
+  positions = result["positions"]
+  return {
+    "file": str(pdf_path),
+    "out_dir": str(out_dir),
+    "found": len(positions),
+    "missing": missing_question_numbers(positions, max_questions),
+    "skipped_stages": result["skipped_stages"],
+    "seconds": round(time.perf_counter() - start, 3),
+  }
+
+
+def run_batch_transform(
+  pdf_paths: list[Path],
+  *,
+  workers: int | None = None,
+  max_questions: int = MAX_QUESTIONS,
+  dpi: int = DPI,
+  force: bool = False,
+  vector_pdfs: bool = False,
+  embedded_images: bool = False,
+  summary_path: Path | None = None,
+) -> list[dict]:
+  workers = workers or os.cpu_count() or 1
+  groups = group_duplicate_pdfs(pdf_paths)
+  pdf_paths = list(groups)
+  summary: list[dict] = []
+  if workers == 1:
+    for pdf_path in pdf_paths:
+      summary.append(
+        transform_exam_file(
+          pdf_path,
+          max_questions=max_questions,
+          dpi=dpi,
+          force=force,
+          vector_pdfs=vector_pdfs,
+          embedded_images=embedded_images,
+        )
+      )
+  else:
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+      futures = {
+        pool.submit(
+          transform_exam_file,
+          pdf_path,
+          max_questions=max_questions,
+          dpi=dpi,
+          force=force,
+          vector_pdfs=vector_pdfs,
+          embedded_images=embedded_images,
+        ): pdf_path
+        for pdf_path in pdf_paths
+      }
+      for future in as_completed(futures):
+        pdf_path = futures[future]
+        # Falha fora do try do worker (processo morto, resultado não serializável)
+        try:
+          summary.append(future.result())
+        except (OSError, RuntimeError, TypeError, ValueError) as e:
+          summary.append(_error_item(pdf_path, get_exam_output_dir(pdf_path), e, start))
+  for item in list(summary):
+    if "error" not in item:
+      canonical = Path(item["file"])
+      summary.extend(link_duplicate_outputs(canonical, groups[canonical]))
+  summary.sort(key=lambda item: item["file"])
+  summary_path = summary_path or get_transform_summary_path()
+  summary_path.parent.mkdir(parents=True, exist_ok=True)
+  summary_path.write_text(
+    json.dumps(summary, indent=2, ensure_ascii=False), encoding="utf-8"
+  )
+  return summary
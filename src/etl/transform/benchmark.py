@@ -0,0 +1,343 @@
+import argparse
+import json
+import platform
+import statistics
+import subprocess
+import tempfile
+import time
+from collections.abc import Callable
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+import pymupdf
+
+from src.etl.transform.constants import DPI
+from src.etl.transform.images import (
+  export_embedded_images,
+  export_figures,
+  export_non_question_figures,
+  export_question_figures,
+  export_question_pdfs,
+  export_question_regions_pdf,
+)
+from src.etl.transform.layout import DocumentLayout
+from src.etl.transform.manifest import run_incremental_transform
+from src.etl.transform.positions import find_question_positions
+from src.etl.transform.rectangles import (
+  build_question_rectangles,
+  find_question_options,
+)
+from src.etl.transform.text_extraction import extract_question_texts
+
+PAGE_TOP = 60
+PAGE_BOTTOM = 800
+HEADING_HEIGHT = 16
+LINE_HEIGHT = 14
+OPTION_HEIGHT = 13
+QUESTION_GAP = 20
+MULTI_PAGE_EXTRA_LINES = 60
+IMAGE_HEIGHT = 80
+
+HEADING_STYLES = {
+  "inline": lambda n: [f"Questão {n}."],
+  "no_accent": lambda n: [f"Questao {n}:"],
+  "broken_tilde": lambda n: [f"Quest˜ao {n}"],
+  "split": lambda n: ["Questão", f"{n}."],
+}
+
+OPTION_STYLES = {
+  "parenthesis": lambda: [f"{x} ( ) alternativa {x.lower()}" for x in "ABCDE"],
+  "letter_paren": lambda: [f"{x}) alternativa {x.lower()}" for x in "ABCDE"],
+  # Alternativas curtas lado a lado numa linha só
+  "inline": lambda: ["   ".join(f"({x}) {i}" for i, x in enumerate("ABCDE", 1))],
+  # Itens de questão discursiva: não são alternativas
+  "essay_items": lambda: [f"{x}) Determine o item {x}." for x in "abc"],
+  "none": None,
+}
+OBJECTIVE_OPTION_STYLES = ("parenthesis", "letter_paren", "inline")
+
+
+@dataclass
+class SyntheticExamSpec:
+  name: str
+  pages: int
+  questions_per_page: int
+  heading_style: str = "inline"
+  option_style: str = "parenthesis"
+  multi_page_every: int = 0
+  image_every: int = 0
+
+
+DEFAULT_SPECS = [
+  SyntheticExamSpec("small_inline", pages=4, questions_per_page=3),
+  SyntheticExamSpec(
+    "exam_split_headings",
+    pages=20,
+    questions_per_page=3,
+    heading_style="split",
+  ),
+  SyntheticExamSpec(
+    "exam_broken_tilde_letter_paren",
+    pages=20,
+    questions_per_page=3,
+    heading_style="broken_tilde",
+    option_style="letter_paren",
+  ),
+  SyntheticExamSpec(
+    "exam_multi_page",
+    pages=20,
+    questions_per_page=2,
+    multi_page_every=4,
+    image_every=3,
+  ),
+  SyntheticExamSpec(
+    "exam_inline_options",
+    pages=10,
+    questions_per_page=4,
+    option_style="inline",
+  ),
+  SyntheticExamSpec(
+    "essay_items",
+    pages=10,
+    questions_per_page=3,
+    option_style="essay_items",
+  ),
+  SyntheticExamSpec(
+    "dense_no_options",
+    pages=10,
+    questions_per_page=6,
+    heading_style="no_accent",
+    option_style="none",
+  ),
+]
+
+
+def build_synthetic_exam(spec: SyntheticExamSpec) -> pymupdf.Document:
+  doc = pymupdf.open()
+  # TextWriter com fonte Unicode preserva o "˜" solto, que insert_text perde
+  font = pymupdf.Font("helv")
+  heading = HEADING_STYLES[spec.heading_style]
+  option = OPTION_STYLES[spec.option_style]
+  usable = PAGE_BOTTOM - PAGE_TOP
+  options_height = len(option()) * OPTION_HEIGHT if option else 0
+  per_question = usable / spec.questions_per_page - QUESTION_GAP
+  statement_lines = max(
+    1, int((per_question - HEADING_HEIGHT - options_height) // LINE_HEIGHT)
+  )
+  page = doc.new_page()
+  writer = pymupdf.TextWriter(page.rect)
+  writer.append((50, 40), "Instruções gerais da prova", font=font, fontsize=10)
+  y = PAGE_TOP
+  image = pymupdf.Pixmap(pymupdf.csRGB, pymupdf.IRect(0, 0, 160, 80), False)
+  image.clear_with(180)
+
+  def ensure_room(height: float) -> None:
+    nonlocal page, writer, y
+    if y + height > PAGE_BOTTOM:
+      writer.write_text(page)
+      page = doc.new_page()
+      writer = pymupdf.TextWriter(page.rect)
+      y = PAGE_TOP
+
+  def write(text: str, x: float, height: float, fontsize: float) -> None:
+    nonlocal y
+    ensure_room(height)
+    writer.append((x, y), text, font=font, fontsize=fontsize)
+    y += height
+
+  total_questions = spec.pages * spec.questions_per_page
+  for n in range(1, total_questions + 1):
+    heading_lines = heading(n)
+    ensure_room(HEADING_HEIGHT * len(heading_lines) + LINE_HEIGHT)
+    for heading_line in heading_lines:
+      write(heading_line, 50, HEADING_HEIGHT, 11)
+    lines = statement_lines
+    if spec.multi_page_every and n % spec.multi_page_every == 0:
+      lines += MULTI_PAGE_EXTRA_LINES
+    for i in range(lines):
+      write(f"Enunciado da questao {n}, linha {i} do texto base.", 60, LINE_HEIGHT, 10)
+    if spec.image_every and n % spec.image_every == 0:
+      ensure_room(IMAGE_HEIGHT)
+      page.insert_image(
+        pymupdf.Rect(60, y, 60 + 2 * IMAGE_HEIGHT, y + IMAGE_HEIGHT), pixmap=image
+      )
+      y += IMAGE_HEIGHT
+    if option:
+      for option_line in option():
+        write(option_line, 60, OPTION_HEIGHT, 10)
+    y += QUESTION_GAP
+  writer.write_text(page)
+  while len(doc) < spec.pages:
+    draft = doc.new_page()
+    draft.insert_text((50, 100), "RASCUNHO", fontsize=11)
+  return doc
+
+
+def _time_stage(fn: Callable[[], object], repeat: int) -> dict:
+  runs = []
+  for _ in range(repeat):
+    start = time.perf_counter()
+    fn()
+    runs.append(time.perf_counter() - start)
+  return {
+    "min_s": round(min(runs), 6),
+    "median_s": round(statistics.median(runs), 6),
+    "repeat": repeat,
+  }
+
+
+def _timed(fn: Callable[[], dict]) -> tuple[dict, float]:
+  start = time.perf_counter()
+  result = fn()
+  return result, round(time.perf_counter() - start, 6)
+
+
+def benchmark_incremental(doc: pymupdf.Document, out: Path) -> dict:
+  # Reexecuções do transform incremental: sem mudanças, e só com o --dpi
+  # diferente (detecção e textos do cache, figuras refeitas), pelo caminho do
+  # arquivo e pelo dos bytes em memória do pipeline
+  pdf_path = out / "exam.pdf"
+  doc.save(pdf_path)
+  exam_dir = out / "incremental"
+  runs = {
+    "cold": lambda: run_incremental_transform(pdf_path, exam_dir),
+    "cached": lambda: run_incremental_transform(pdf_path, exam_dir),
+    "dpi_change": lambda: run_incremental_transform(pdf_path, exam_dir, dpi=DPI // 2),
+    "dpi_change_from_bytes": lambda: run_incremental_transform(
+      pdf_path, exam_dir, dpi=DPI, data=pdf_path.read_bytes()
+    ),
+  }
+  stages = {}
+  for name, run in runs.items():
+    result, seconds = _timed(run)
+    stages[name] = {"s": seconds, "skipped_stages": result["skipped_stages"]}
+  for name in ("dpi_change", "dpi_change_from_bytes"):
+    skipped = stages[name]["skipped_stages"]
+    if "detect" not in skipped or "figures" in skipped:
+      raise RuntimeError(f"incremental {name} re-ran the wrong stages: {skipped}")
+  return stages
+
+
+def benchmark_spec(spec: SyntheticExamSpec, repeat: int = 3) -> dict:
+  doc = build_synthetic_exam(spec)
+  layout = DocumentLayout.from_document(doc)
+  positions = find_question_positions(doc, layout=layout)
+  question_rects = build_question_rectangles(doc, positions, layout=layout)
+  stages: dict[str, dict] = {}
+  with tempfile.TemporaryDirectory() as tmp:
+    out = Path(tmp)
+    stages["layout"] = _time_stage(lambda: DocumentLayout.from_document(doc), repeat)
+    stages["find_question_positions"] = _time_stage(
+      lambda: find_question_positions(doc, layout=layout), repeat
+    )
+    stages["build_question_rectangles"] = _time_stage(
+      lambda: build_question_rectangles(doc, positions, layout=layout), repeat
+    )
+    stages["extract_question_texts"] = _time_stage(
+      lambda: extract_question_texts(doc, question_rects, layout=layout), repeat
+    )
+    stages["export_question_figures"] = _time_stage(
+      lambda: export_question_figures(doc, question_rects, out / "q"), repeat
+    )
+    stages["export_question_pdfs"] = _time_stage(
+      lambda: export_question_pdfs(doc, question_rects, out / "qpdf"), repeat
+    )
+    stages["export_embedded_images"] = _time_stage(
+      lambda: export_embedded_images(doc, question_rects, out / "img"), repeat
+    )
+    stages["export_non_question_figures"] = _time_stage(
+      lambda: export_non_question_figures(
+        doc, question_rects, out / "nq", layout=layout
+      ),
+      repeat,
+    )
+    stages["export_figures"] = _time_stage(
+      lambda: export_figures(
+        doc, question_rects, out / "fq", out / "fnq", layout=layout
+      ),
+      repeat,
+    )
+    stages["export_question_regions_pdf"] = _time_stage(
+      lambda: export_question_regions_pdf(doc, question_rects, out / "r.pdf"),
+      repeat,
+    )
+    incremental = benchmark_incremental(doc, out)
+  expected = spec.pages * spec.questions_per_page
+  # Questões com as 5 alternativas achadas; discursivas e sem alternativas: 0
+  options = find_question_options(doc, question_rects, layout=layout)
+  result = {
+    "spec": asdict(spec),
+    "pages": len(doc),
+    "questions_expected": expected,
+    "questions_found": len(positions),
+    "objective_expected": expected
+    if spec.option_style in OBJECTIVE_OPTION_STYLES
+    else 0,
+    "objective_found": sum(len(found) == 5 for found in options.values()),
+    "stages": stages,
+    "incremental": incremental,
+  }
+  doc.close()
+  return result
+
+
+def _git_commit() -> str | None:
+  try:
+    out = subprocess.run(
+      ["git", "rev-parse", "--short", "HEAD"],
+      capture_output=True,
+      text=True,
+      timeout=10,
+    )
+  except (OSError, subprocess.SubprocessError):
+    return None
+  return out.stdout.strip() or None
+
+
+def run_benchmarks(
+  specs: list[SyntheticExamSpec] | None = None,
+  repeat: int = 3,
+) -> dict:
+  specs = specs or DEFAULT_SPECS
+  return {
+    "commit": _git_commit(),
+    "python": platform.python_version(),
+    "pymupdf": pymupdf.VersionBind,
+    "results": [benchmark_spec(spec, repeat) for spec in specs],
+  }
+
+
+def main() -> None:
+  parser = argparse.ArgumentParser(description="Benchmark the transform stages")
+  parser.add_argument(
+    "--repeat",
+    type=int,
+    default=3,
+    help="runs per stage (min and median are reported)",
+  )
+  parser.add_argument(
+    "--scenario",
+    action="append",
+    choices=[spec.name for spec in DEFAULT_SPECS],
+    help="run only this scenario (may be repeated)",
+  )
+  parser.add_argument(
+    "--output",
+    type=Path,
+    default=None,
+    help="write the JSON results to this file instead of stdout",
+  )
+  args = parser.parse_args()
+
+  specs = [s for s in DEFAULT_SPECS if not args.scenario or s.name in args.scenario]
+  results = run_benchmarks(specs, repeat=args.repeat)
+  payload = json.dumps(results, indent=2, ensure_ascii=False)
+  if args.output:
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    args.output.write_text(payload, encoding="utf-8")
+  else:
+    print(payload)
+
+
+if __name__ == "__main__":
+  main()
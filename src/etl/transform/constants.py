@@ -8,6 +8,8 @@ OBJECTIVE_BLOCK_END_MARGIN = 6
 MIN_NON_QUESTION_REGION_HEIGHT = 20
 DRAFT_PAGE_MAX_TEXT_LEN = 150
 DPI = 150
+# Incrementar quando a lógica de detecção mudar, para invalidar os manifests
+MANIFEST_VERSION = 4
 
 _QUESTION_WORD = r"Quest(?:ão|ao|a\u0303o|\u02dcao)"
 
@@ -26,4 +28,6 @@ QUESTION_IN_TEXT_REGEX = re.compile(
 )
 
 OBJECTIVE_OPTION_LETTERS = ("A", "B", "C", "D", "E")
-OBJECTIVE_OPTION_LINE_REGEX = re.compile(r"^\s*([A-E])\s*[.)]\s*", re.IGNORECASE)
+# "A ( )", "(A)" ou "A)", só em maiúscula: os itens discursivos são "a)", "b)".
+# Sem âncora no início: alternativas curtas vêm lado a lado na mesma linha
+OBJECTIVE_OPTION_REGEX = re.compile(r"(?<!\S)\(?([A-E])(?:\)|\s*\((?:\s*\))?)(?!\S)")
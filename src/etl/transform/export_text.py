@@ -1,17 +1,30 @@
+import json
 from pathlib import Path
 
 from src.etl.transform.paths import get_question_texts_dir
 
+QUESTION_PAGES_FILENAME = "questoes_paginas.json"
+
 
 def save_question_text_files(
   inside_by_question: dict[int, str],
-  outside_by_question: dict[int, str],
+  outside_by_page: dict[int, str],
   out_dir: Path | None = None,
+  pages_by_question: dict[int, list[int]] | None = None,
 ) -> Path:
   out_dir = out_dir or get_question_texts_dir()
   out_dir.mkdir(parents=True, exist_ok=True)
   for num in inside_by_question:
-    (out_dir / f"questao_{num:02d}_dentro.txt").write_text(inside_by_question[num], encoding="utf-8")
-    if outside_by_question.get(num):
-      (out_dir / f"questao_{num:02d}_fora.txt").write_text(outside_by_question[num], encoding="utf-8")
+    (out_dir / f"questao_{num:02d}_dentro.txt").write_text(
+      inside_by_question[num], encoding="utf-8"
+    )
+  # pagina_PP_fora.txt (PP a partir de 00) substitui os questao_NN_fora.txt;
+  # questoes_paginas.json diz em quais páginas cada questão está
+  for page_no, text in outside_by_page.items():
+    (out_dir / f"pagina_{page_no:02d}_fora.txt").write_text(text, encoding="utf-8")
+  if pages_by_question is not None:
+    (out_dir / QUESTION_PAGES_FILENAME).write_text(
+      json.dumps({f"{num:02d}": pages for num, pages in pages_by_question.items()}),
+      encoding="utf-8",
+    )
   return out_dir
@@ -1,18 +1,80 @@
+import json
 from pathlib import Path
 
 import pymupdf
 
 from src.etl.transform.constants import DPI, MIN_NON_QUESTION_REGION_HEIGHT
 from src.etl.transform.intervals import non_question_intervals_on_page
-from src.etl.transform.pages import is_draft_page, is_essay_page
+from src.etl.transform.layout import DocumentLayout, PageLayout
 from src.etl.transform.paths import (
+  get_embedded_images_dir,
   get_non_questions_figs_dir,
-  get_questions_figs_dir,
+  get_question_pdfs_dir,
   get_question_regions_pdf_path,
+  get_questions_figs_dir,
 )
+from src.etl.transform.raster import PageRaster, render_page
+from src.utils.tracing import span
 
 REGIONS_STROKE_COLOR = (1.0, 0.0, 0.0)
 REGIONS_STROKE_WIDTH = 1.5
+EMBEDDED_IMAGES_INDEX_FILENAME = "imagens.json"
+
+
+def _question_crops_by_page(
+  question_rects: dict[int, list[tuple[int, pymupdf.Rect]]],
+) -> dict[int, list[tuple[str, pymupdf.Rect]]]:
+  by_page: dict[int, list[tuple[str, pymupdf.Rect]]] = {}
+  for num, clips in question_rects.items():
+    for part, (page_no, clip) in enumerate(clips):
+      if len(clips) == 1:
+        filename = f"questao_{num:02d}.png"
+      else:
+        filename = f"questao_{num:02d}_p{part + 1}.png"
+      by_page.setdefault(page_no, []).append((filename, clip))
+  return by_page
+
+
+def _non_question_crops_on_page(
+  page_layout: PageLayout,
+  question_rects: dict[int, list[tuple[int, pymupdf.Rect]]],
+  min_height: float = MIN_NON_QUESTION_REGION_HEIGHT,
+) -> list[tuple[str, pymupdf.Rect]]:
+  page_no = page_layout.page_no
+  pr = page_layout.rect
+  x0, x1 = pr.x0, pr.x1
+  intervals = non_question_intervals_on_page(question_rects, page_no, pr)
+  crops = []
+  for i, (y0, y1) in enumerate(intervals):
+    if y1 - y0 < min_height:
+      continue
+    if i == 0 and len(intervals) == 1:
+      if page_layout.is_draft:
+        suffix = "rascunho"
+      elif page_layout.is_essay:
+        suffix = "redacao"
+      else:
+        suffix = "instrucoes_ou_texto_base"
+    elif i == 0:
+      suffix = "topo_instrucoes"
+    elif i == len(intervals) - 1:
+      suffix = "rodape"
+    else:
+      suffix = f"entre_questoes_{i}"
+    crops.append((f"pagina_{page_no:02d}_{suffix}.png", pymupdf.Rect(x0, y0, x1, y1)))
+  return crops
+
+
+def _save_crops(
+  raster: PageRaster,
+  crops: list[tuple[str, pymupdf.Rect]],
+  out_dir: Path,
+) -> None:
+  with span("transform.encode", crops=len(crops)):
+    for filename, clip in crops:
+      pix = raster.crop(clip)
+      if pix is not None:
+        pix.save(out_dir / filename)
 
 
 def export_question_figures(
@@ -23,14 +85,10 @@ def export_question_figures(
 ) -> Path:
   out_dir = out_dir or get_questions_figs_dir()
   out_dir.mkdir(parents=True, exist_ok=True)
-  for num, clips in question_rects.items():
-    for part, (page_no, clip) in enumerate(clips):
-      page = doc[page_no]
-      pix = page.get_pixmap(clip=clip, dpi=dpi, alpha=False)
-      if len(clips) == 1:
-        pix.save(out_dir / f"questao_{num:02d}.png")
-      else:
-        pix.save(out_dir / f"questao_{num:02d}_p{part + 1}.png")
+  crops_by_page = _question_crops_by_page(question_rects)
+  for page_no in sorted(crops_by_page):
+    raster = render_page(doc[page_no], dpi)
+    _save_crops(raster, crops_by_page[page_no], out_dir)
   return out_dir
 
 
@@ -40,33 +98,162 @@ def export_non_question_figures(
   out_dir: Path | None = None,
   dpi: int = DPI,
   min_height: float = MIN_NON_QUESTION_REGION_HEIGHT,
+  *,
+  layout: DocumentLayout | None = None,
 ) -> Path:
   out_dir = out_dir or get_non_questions_figs_dir()
   out_dir.mkdir(parents=True, exist_ok=True)
+  layout = layout or DocumentLayout.from_document(doc)
+  for page_layout in layout.pages:
+    crops = _non_question_crops_on_page(page_layout, question_rects, min_height)
+    if crops:
+      raster = render_page(page_layout.page, dpi)
+      _save_crops(raster, crops, out_dir)
+  return out_dir
+
+
+def export_figures(
+  doc: pymupdf.Document,
+  question_rects: dict[int, list[tuple[int, pymupdf.Rect]]],
+  questions_out_dir: Path | None = None,
+  non_questions_out_dir: Path | None = None,
+  dpi: int = DPI,
+  min_height: float = MIN_NON_QUESTION_REGION_HEIGHT,
+  *,
+  layout: DocumentLayout | None = None,
+) -> tuple[Path, Path]:
+  questions_out_dir = questions_out_dir or get_questions_figs_dir()
+  non_questions_out_dir = non_questions_out_dir or get_non_questions_figs_dir()
+  questions_out_dir.mkdir(parents=True, exist_ok=True)
+  non_questions_out_dir.mkdir(parents=True, exist_ok=True)
+  layout = layout or DocumentLayout.from_document(doc)
+  question_crops_by_page = _question_crops_by_page(question_rects)
+  for page_layout in layout.pages:
+    question_crops = question_crops_by_page.get(page_layout.page_no, [])
+    non_question_crops = _non_question_crops_on_page(
+      page_layout, question_rects, min_height
+    )
+    if not question_crops and not non_question_crops:
+      continue
+    raster = render_page(page_layout.page, dpi)
+    _save_crops(raster, question_crops, questions_out_dir)
+    _save_crops(raster, non_question_crops, non_questions_out_dir)
+  return questions_out_dir, non_questions_out_dir
+
+
+def _stitch_question_clips(
+  out_doc: pymupdf.Document,
+  doc: pymupdf.Document,
+  clips: list[tuple[int, pymupdf.Rect]],
+) -> bool:
+  # Clip que passa da página (start_y negativo no topo) mediria a mais
+  clips = [(page_no, clip & doc[page_no].rect) for page_no, clip in clips]
+  clips = [(page_no, clip) for page_no, clip in clips if not clip.is_empty]
+  if not clips:
+    return False
+  width = max(clip.width for _page_no, clip in clips)
+  height = sum(clip.height for _page_no, clip in clips)
+  page = out_doc.new_page(width=width, height=height)
+  # Partes de questões em várias páginas ficam empilhadas numa página só
+  y = 0.0
+  for page_no, clip in clips:
+    target = pymupdf.Rect(0, y, clip.width, y + clip.height)
+    page.show_pdf_page(target, doc, page_no, clip=clip)
+    y += clip.height
+  return True
+
+
+def export_question_pdfs(
+  doc: pymupdf.Document,
+  question_rects: dict[int, list[tuple[int, pymupdf.Rect]]],
+  out_dir: Path | None = None,
+) -> Path:
+  out_dir = out_dir or get_question_pdfs_dir()
+  out_dir.mkdir(parents=True, exist_ok=True)
+  for num, clips in question_rects.items():
+    out_doc = pymupdf.open()
+    if _stitch_question_clips(out_doc, doc, clips):
+      out_doc.save(str(out_dir / f"questao_{num:02d}.pdf"), garbage=3, deflate=True)
+    out_doc.close()
+  return out_dir
+
+
+def _image_owner(
+  rect: pymupdf.Rect,
+  clips_on_page: list[tuple[int, pymupdf.Rect]],
+) -> int | None:
+  owner, owner_area = None, 0.0
+  for num, clip in clips_on_page:
+    if not rect.intersects(clip):
+      continue
+    area = (rect & clip).get_area()
+    if area > owner_area:
+      owner, owner_area = num, area
+  return owner
+
+
+def find_embedded_images(
+  doc: pymupdf.Document,
+  question_rects: dict[int, list[tuple[int, pymupdf.Rect]]],
+) -> list[dict]:
+  clips_by_page: dict[int, list[tuple[int, pymupdf.Rect]]] = {}
+  for num, clips in question_rects.items():
+    for page_no, clip in clips:
+      clips_by_page.setdefault(page_no, []).append((num, clip))
+  images = []
   for page_no in range(len(doc)):
     page = doc[page_no]
-    pr = page.rect
-    x0, x1 = pr.x0, pr.x1
-    intervals = non_question_intervals_on_page(question_rects, page_no, pr)
-    for i, (y0, y1) in enumerate(intervals):
-      if y1 - y0 < min_height:
-        continue
-      clip = pymupdf.Rect(x0, y0, x1, y1)
-      pix = page.get_pixmap(clip=clip, dpi=dpi, alpha=False)
-      if i == 0 and len(intervals) == 1:
-        if is_draft_page(page):
-          suffix = "rascunho"
-        elif is_essay_page(page):
-          suffix = "redacao"
-        else:
-          suffix = "instrucoes_ou_texto_base"
-      elif i == 0:
-        suffix = "topo_instrucoes"
-      elif i == len(intervals) - 1:
-        suffix = "rodape"
-      else:
-        suffix = f"entre_questoes_{i}"
-      pix.save(out_dir / f"pagina_{page_no:02d}_{suffix}.png")
+    # A mesma xref pode aparecer mais de uma vez na lista (nomes diferentes)
+    xrefs = dict.fromkeys(img[0] for img in page.get_images(full=True))
+    for xref in xrefs:
+      owners: dict[int | None, list[pymupdf.Rect]] = {}
+      for rect in page.get_image_rects(xref):
+        if rect.is_empty or rect.is_infinite:
+          continue
+        owner = _image_owner(rect, clips_by_page.get(page_no, []))
+        owners.setdefault(owner, []).append(rect)
+      for owner, rects in owners.items():
+        images.append(
+          {"xref": xref, "page": page_no, "question": owner, "rects": rects}
+        )
+  return images
+
+
+def export_embedded_images(
+  doc: pymupdf.Document,
+  question_rects: dict[int, list[tuple[int, pymupdf.Rect]]],
+  out_dir: Path | None = None,
+) -> Path:
+  out_dir = out_dir or get_embedded_images_dir()
+  out_dir.mkdir(parents=True, exist_ok=True)
+  index = []
+  counters: dict[str, int] = {}
+  for image in find_embedded_images(doc, question_rects):
+    # Bytes originais do stream: sem decodificar nem recodificar
+    extracted = doc.extract_image(image["xref"])
+    if not extracted or not extracted.get("image"):
+      continue
+    if image["question"] is None:
+      prefix = f"pagina_{image['page']:02d}"
+    else:
+      prefix = f"questao_{image['question']:02d}"
+    counters[prefix] = counters.get(prefix, 0) + 1
+    filename = f"{prefix}_img_{counters[prefix]}.{extracted['ext']}"
+    (out_dir / filename).write_bytes(extracted["image"])
+    index.append(
+      {
+        "file": filename,
+        "question": image["question"],
+        "page": image["page"],
+        "xref": image["xref"],
+        "width": extracted["width"],
+        "height": extracted["height"],
+        "rects": [list(rect) for rect in image["rects"]],
+      }
+    )
+  (out_dir / EMBEDDED_IMAGES_INDEX_FILENAME).write_text(
+    json.dumps(index, indent=2, ensure_ascii=False), encoding="utf-8"
+  )
   return out_dir
 
 
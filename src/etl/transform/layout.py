@@ -0,0 +1,99 @@
+from dataclasses import dataclass, field
+
+import pymupdf
+
+from src.etl.transform.pages import is_draft_text, is_essay_text, text_has_question
+from src.etl.transform.spatial import BlockIndex
+
+LAYOUT_TEXT_FLAGS = pymupdf.TEXTFLAGS_TEXT
+
+
+@dataclass
+class PageLayout:
+  page: pymupdf.Page
+  page_no: int
+  rect: pymupdf.Rect
+  textpage: pymupdf.TextPage | None = None
+  text: str = ""
+  lines: list[tuple[str, pymupdf.Rect]] = field(default_factory=list)
+  spans: list[dict] = field(default_factory=list)
+  blocks: list[tuple] = field(default_factory=list)
+  words: list[tuple] = field(default_factory=list)
+  block_index: BlockIndex = field(default_factory=BlockIndex)
+  has_question: bool = False
+  is_draft: bool = False
+  is_essay: bool = False
+
+
+def build_page_layout(page: pymupdf.Page, page_no: int) -> PageLayout:
+  textpage = page.get_textpage(flags=LAYOUT_TEXT_FLAGS)
+  text = page.get_text(textpage=textpage)
+  d = page.get_text("dict", textpage=textpage)
+  lines: list[tuple[str, pymupdf.Rect]] = []
+  spans: list[dict] = []
+  for block in d.get("blocks", []):
+    for line in block.get("lines", []):
+      line_spans = line.get("spans", [])
+      spans.extend(line_spans)
+      bbox = line.get("bbox")
+      if bbox is not None:
+        line_text = "".join(s.get("text", "") for s in line_spans)
+        lines.append((line_text, pymupdf.Rect(bbox)))
+  blocks = page.get_text("blocks", textpage=textpage)
+  return PageLayout(
+    page=page,
+    page_no=page_no,
+    rect=page.rect,
+    textpage=textpage,
+    text=text,
+    lines=lines,
+    spans=spans,
+    blocks=blocks,
+    words=page.get_text("words", textpage=textpage),
+    block_index=BlockIndex.from_blocks(blocks),
+    has_question=text_has_question(text),
+    is_draft=is_draft_text(text),
+    is_essay=is_essay_text(text),
+  )
+
+
+@dataclass
+class DocumentLayout:
+  doc: pymupdf.Document
+  pages: list[PageLayout] = field(default_factory=list)
+
+  @classmethod
+  def from_document(cls, doc: pymupdf.Document) -> "DocumentLayout":
+    pages = [build_page_layout(doc[page_no], page_no) for page_no in range(len(doc))]
+    return cls(doc=doc, pages=pages)
+
+  @classmethod
+  def from_classification(
+    cls, doc: pymupdf.Document, classification: dict[str, list[int]]
+  ) -> "DocumentLayout":
+    # Só a classificação das páginas, sem extrair texto: basta para as figuras
+    draft_pages = set(classification["draft_pages"])
+    essay_pages = set(classification["essay_pages"])
+    pages = [
+      PageLayout(
+        page=doc[page_no],
+        page_no=page_no,
+        rect=doc[page_no].rect,
+        is_draft=page_no in draft_pages,
+        is_essay=page_no in essay_pages,
+      )
+      for page_no in range(len(doc))
+    ]
+    return cls(doc=doc, pages=pages)
+
+  def classification(self) -> dict[str, list[int]]:
+    return {
+      "draft_pages": [p.page_no for p in self.pages if p.is_draft],
+      "essay_pages": [p.page_no for p in self.pages if p.is_essay],
+    }
+
+  def __len__(self) -> int:
+    return len(self.pages)
+
+  def __getitem__(self, page_no: int) -> PageLayout:
+    return self.pages[page_no]
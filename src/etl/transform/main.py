@@ -1,59 +1,130 @@
+import argparse
 from pathlib import Path
 
 import pymupdf
 
-from src.etl.transform.constants import MAX_QUESTIONS
+from src.etl.transform.constants import DPI, MAX_QUESTIONS
 from src.etl.transform.export_text import save_question_text_files
 from src.etl.transform.images import (
+  export_embedded_images,
+  export_figures,
   export_non_question_figures,
   export_question_figures,
+  export_question_pdfs,
   export_question_regions_pdf,
 )
+from src.etl.transform.layout import DocumentLayout
 from src.etl.transform.positions import find_question_positions
-from src.etl.transform.rectangles import build_question_rectangles
-from src.etl.transform.text_extraction import extract_question_texts
+from src.etl.transform.rectangles import (
+  build_question_rectangles,
+  find_question_options,
+)
+from src.etl.transform.text_extraction import extract_question_texts, question_pages
+from src.utils.tracing import enable_tracing, report_trace, span
 
 
 def run_transform(
   doc: pymupdf.Document,
   *,
   max_questions: int = MAX_QUESTIONS,
+  dpi: int = DPI,
   export_question_images: bool = True,
   export_non_question_images: bool = True,
   export_texts: bool = True,
   export_regions_pdf: bool = True,
+  export_vector_pdfs: bool = False,
+  export_images: bool = False,
   questions_figs_dir: Path | None = None,
   non_questions_figs_dir: Path | None = None,
   texts_dir: Path | None = None,
   regions_pdf_path: Path | None = None,
+  question_pdfs_dir: Path | None = None,
+  embedded_images_dir: Path | None = None,
+  layout: DocumentLayout | None = None,
+  find_options: bool = True,
+  positions: list[tuple[int, int, pymupdf.Rect]] | None = None,
+  question_rects: dict[int, list[tuple[int, pymupdf.Rect]]] | None = None,
 ) -> dict:
-  positions = find_question_positions(doc, max_questions=max_questions)
-  question_rects = build_question_rectangles(doc, positions)
+  if layout is None:
+    with span("transform.layout", pages=len(doc)):
+      layout = DocumentLayout.from_document(doc)
+  if positions is None:
+    with span("transform.positions") as s:
+      positions = find_question_positions(
+        doc, max_questions=max_questions, layout=layout
+      )
+      s.set(found=len(positions))
+  if question_rects is None:
+    with span("transform.rectangles"):
+      question_rects = build_question_rectangles(doc, positions, layout=layout)
   result = {"positions": positions, "question_rects": question_rects}
-  if export_question_images:
-    result["questions_figs_dir"] = export_question_figures(
-      doc, question_rects, out_dir=questions_figs_dir
-    )
-  if export_non_question_images:
-    result["non_questions_figs_dir"] = export_non_question_figures(
-      doc, question_rects, out_dir=non_questions_figs_dir
-    )
+  if find_options:
+    with span("transform.options"):
+      result["question_options"] = find_question_options(
+        doc, question_rects, layout=layout
+      )
+  if export_question_images and export_non_question_images:
+    with span("transform.figures", dpi=dpi):
+      result["questions_figs_dir"], result["non_questions_figs_dir"] = export_figures(
+        doc,
+        question_rects,
+        questions_out_dir=questions_figs_dir,
+        non_questions_out_dir=non_questions_figs_dir,
+        dpi=dpi,
+        layout=layout,
+      )
+  elif export_question_images:
+    with span("transform.figures", dpi=dpi):
+      result["questions_figs_dir"] = export_question_figures(
+        doc, question_rects, out_dir=questions_figs_dir, dpi=dpi
+      )
+  elif export_non_question_images:
+    with span("transform.figures", dpi=dpi):
+      result["non_questions_figs_dir"] = export_non_question_figures(
+        doc, question_rects, out_dir=non_questions_figs_dir, dpi=dpi, layout=layout
+      )
+  if export_vector_pdfs:
+    with span("transform.vector_pdfs"):
+      result["question_pdfs_dir"] = export_question_pdfs(
+        doc, question_rects, out_dir=question_pdfs_dir
+      )
+  if export_images:
+    with span("transform.embedded_images"):
+      result["embedded_images_dir"] = export_embedded_images(
+        doc, question_rects, out_dir=embedded_images_dir
+      )
   if export_texts:
-    inside, outside = extract_question_texts(doc, question_rects)
-    result["inside_texts"] = inside
-    result["outside_texts"] = outside
-    result["texts_dir"] = save_question_text_files(inside, outside, out_dir=texts_dir)
+    with span("transform.texts"):
+      inside, outside_by_page = extract_question_texts(
+        doc, question_rects, layout=layout
+      )
+      pages = question_pages(question_rects)
+      result["inside_texts"] = inside
+      result["outside_texts_by_page"] = outside_by_page
+      result["question_pages"] = pages
+      result["texts_dir"] = save_question_text_files(
+        inside, outside_by_page, out_dir=texts_dir, pages_by_question=pages
+      )
   if export_regions_pdf:
-    result["regions_pdf_path"] = export_question_regions_pdf(
-      doc, question_rects, output_path=regions_pdf_path
-    )
+    with span("transform.regions_pdf"):
+      result["regions_pdf_path"] = export_question_regions_pdf(
+        doc, question_rects, output_path=regions_pdf_path
+      )
   return result
 
 
-def main() -> None:
-  file_example = "data/vestibular/provas/prova_ita_vestibular_2025_prova_1f.pdf"
-  doc = pymupdf.open(file_example)
-  positions = find_question_positions(doc)
+FILE_EXAMPLE = "data/vestibular/provas/prova_ita_vestibular_2025_prova_1f.pdf"
+
+
+def _transform_single_file(
+  file_path: str,
+  dpi: int = DPI,
+  vector_pdfs: bool = False,
+  embedded_images: bool = False,
+) -> None:
+  doc = pymupdf.open(file_path)
+  layout = DocumentLayout.from_document(doc)
+  positions = find_question_positions(doc, layout=layout)
   found = {p[0] for p in positions}
   missing = [n for n in range(1, MAX_QUESTIONS + 1) if n not in found]
   print(f"Found {len(positions)} question start positions.")
@@ -63,7 +134,7 @@ def main() -> None:
     print(
       f"  Question {p[0]} on page {p[1]}: bbox = ({p[2].x0:.1f}, {p[2].y0:.1f}, {p[2].x1:.1f}, {p[2].y1:.1f})"
     )
-  question_rects = build_question_rectangles(doc, positions)
+  question_rects = build_question_rectangles(doc, positions, layout=layout)
   print(f"Built rectangles for {len(question_rects)} questions.")
   for i in range(len(positions) - 1):
     num, next_num = positions[i][0], positions[i + 1][0]
@@ -73,15 +144,133 @@ def main() -> None:
       )
   result = run_transform(
     doc,
+    dpi=dpi,
     export_question_images=True,
     export_non_question_images=True,
     export_texts=True,
+    export_vector_pdfs=vector_pdfs,
+    export_images=embedded_images,
+    layout=layout,
+    positions=positions,
+    question_rects=question_rects,
   )
   print(f"Question figures saved to {result['questions_figs_dir']}")
   print(f"Non-question figures saved to {result['non_questions_figs_dir']}")
+  if vector_pdfs:
+    print(f"Question PDFs (vector) saved to {result['question_pdfs_dir']}")
+  if embedded_images:
+    print(f"Embedded images saved to {result['embedded_images_dir']}")
   print(f"Texts saved to {result['texts_dir']}")
   print(f"PDF with regions marked in red: {result['regions_pdf_path']}")
 
 
+def _transform_all_files(
+  workers: int | None,
+  dpi: int,
+  force: bool,
+  vector_pdfs: bool = False,
+  embedded_images: bool = False,
+) -> None:
+  from src.etl.catalog import Catalog
+  from src.etl.transform.batch import find_exam_pdfs, run_batch_transform
+
+  with Catalog() as catalog:
+    # Com catálogo, só o que foi baixado e ainda não transformado (ou tudo com --force)
+    if catalog.status_counts():
+      pdf_paths = catalog.transform_work_list(force=force)
+      if not pdf_paths:
+        print("Catalog: every downloaded PDF is already transformed.")
+        return
+    else:
+      pdf_paths = find_exam_pdfs()
+      if not pdf_paths:
+        print("No PDFs found under data/vestibular/provas or data/pos/provas.")
+        return
+    print(f"Transforming {len(pdf_paths)} PDFs...")
+    summary = run_batch_transform(
+      pdf_paths,
+      workers=workers,
+      dpi=dpi,
+      force=force,
+      vector_pdfs=vector_pdfs,
+      embedded_images=embedded_images,
+    )
+    catalog.record_transforms(summary)
+  total_seconds = 0.0
+  for item in summary:
+    total_seconds += item["seconds"]
+    if "error" in item:
+      print(f"  {item['file']}: error ({item['error']})")
+      continue
+    cached = ", ".join(item["skipped_stages"]) or "none"
+    print(
+      f"  {item['file']}: {item['found']} questions, "
+      f"{len(item['missing'])} missing, {item['seconds']:.2f}s "
+      f"(cached stages: {cached})"
+    )
+  print(f"Total CPU time across files: {total_seconds:.2f}s")
+
+
+def main() -> None:
+  parser = argparse.ArgumentParser()
+  parser.add_argument(
+    "file",
+    nargs="?",
+    default=FILE_EXAMPLE,
+    help="PDF to transform (ignored with --all)",
+  )
+  parser.add_argument(
+    "--all",
+    action="store_true",
+    help="transform every PDF under data/vestibular/provas and data/pos/provas",
+  )
+  parser.add_argument(
+    "--workers",
+    type=int,
+    default=None,
+    help="number of worker processes for --all (default: CPU count)",
+  )
+  parser.add_argument(
+    "--dpi",
+    type=int,
+    default=DPI,
+    help="resolution of the exported figures",
+  )
+  parser.add_argument(
+    "--force",
+    action="store_true",
+    help="ignore the manifests from previous runs of --all and redo every stage",
+  )
+  parser.add_argument(
+    "--vector-pdfs",
+    action="store_true",
+    help="also write each question as a cropped vector PDF (questoes_pdf/)",
+  )
+  parser.add_argument(
+    "--embedded-images",
+    action="store_true",
+    help="also extract the PDF's embedded images as-is (imagens/)",
+  )
+  parser.add_argument(
+    "--trace",
+    type=Path,
+    default=None,
+    metavar="DIR",
+    help="record timing spans as JSON lines and a Chrome trace in DIR",
+  )
+  args = parser.parse_args()
+
+  if args.trace:
+    enable_tracing(args.trace)
+  if args.all:
+    _transform_all_files(
+      args.workers, args.dpi, args.force, args.vector_pdfs, args.embedded_images
+    )
+  else:
+    _transform_single_file(args.file, args.dpi, args.vector_pdfs, args.embedded_images)
+  if args.trace:
+    report_trace(args.trace)
+
+
 if __name__ == "__main__":
   main()
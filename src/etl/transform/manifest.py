@@ -0,0 +1,307 @@
+import hashlib
+import json
+import shutil
+from pathlib import Path
+
+import pymupdf
+
+from src.etl.transform import constants
+from src.etl.transform.constants import (
+  DPI,
+  MANIFEST_VERSION,
+  MAX_QUESTIONS,
+  MIN_NON_QUESTION_REGION_HEIGHT,
+)
+from src.etl.transform.images import REGIONS_STROKE_COLOR, REGIONS_STROKE_WIDTH
+from src.etl.transform.layout import DocumentLayout
+from src.etl.transform.main import run_transform
+from src.etl.transform.paths import get_exam_output_dir
+from src.etl.transform.positions import find_question_positions
+from src.etl.transform.rectangles import build_question_rectangles
+from src.utils.tracing import span
+
+MANIFEST_FILENAME = "manifest.json"
+QUESTIONS_FILENAME = "questions.json"
+TEXTS_FILENAME = "texts.json"
+
+
+def bytes_sha256(data: bytes) -> str:
+  return hashlib.sha256(data).hexdigest()
+
+
+def file_sha256(path: Path, chunk_size: int = 1 << 20) -> str:
+  digest = hashlib.sha256()
+  with open(path, "rb") as f:
+    while chunk := f.read(chunk_size):
+      digest.update(chunk)
+  return digest.hexdigest()
+
+
+def _params_hash(*values) -> str:
+  payload = json.dumps(values, sort_keys=True, default=str)
+  return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+
+
+def detection_key(pdf_sha256: str, max_questions: int = MAX_QUESTIONS) -> str:
+  return _params_hash(
+    MANIFEST_VERSION,
+    pdf_sha256,
+    max_questions,
+    constants.QUESTION_START_REGEX.pattern,
+    constants.QUESTION_START_REGEX.flags,
+    constants.QUESTION_WORD_ALONE_REGEX.pattern,
+    constants.QUESTION_NUMBER_ONLY_LINE_REGEX.pattern,
+    constants.QUESTION_IN_TEXT_REGEX.pattern,
+    constants.OBJECTIVE_OPTION_LETTERS,
+    constants.OBJECTIVE_OPTION_REGEX.pattern,
+    constants.MARGIN_LEFT,
+    constants.MARGIN_TOP,
+    constants.MARGIN_BOTTOM,
+    constants.OBJECTIVE_BLOCK_END_MARGIN,
+    constants.DRAFT_PAGE_MAX_TEXT_LEN,
+  )
+
+
+def figures_key(
+  detect_key: str,
+  dpi: int = DPI,
+  min_height: float = MIN_NON_QUESTION_REGION_HEIGHT,
+) -> str:
+  return _params_hash(detect_key, dpi, min_height)
+
+
+def regions_key(detect_key: str) -> str:
+  return _params_hash(detect_key, REGIONS_STROKE_COLOR, REGIONS_STROKE_WIDTH)
+
+
+def load_manifest(out_dir: Path) -> dict:
+  path = out_dir / MANIFEST_FILENAME
+  if not path.exists():
+    return {}
+  try:
+    return json.loads(path.read_text(encoding="utf-8"))
+  except json.JSONDecodeError:
+    return {}
+
+
+def save_manifest(out_dir: Path, manifest: dict) -> Path:
+  out_dir.mkdir(parents=True, exist_ok=True)
+  path = out_dir / MANIFEST_FILENAME
+  path.write_text(json.dumps(manifest, indent=2), encoding="utf-8")
+  return path
+
+
+def _dump_questions(
+  positions: list[tuple[int, int, pymupdf.Rect]],
+  question_rects: dict[int, list[tuple[int, pymupdf.Rect]]],
+  layout: DocumentLayout,
+) -> dict:
+  return {
+    "positions": [[num, page_no, list(rect)] for num, page_no, rect in positions],
+    "question_rects": {
+      str(num): [[page_no, list(clip)] for page_no, clip in clips]
+      for num, clips in question_rects.items()
+    },
+    # Rascunho/redação por página, para refazer as figuras sem extrair o texto
+    "pages": layout.classification(),
+  }
+
+
+def _load_questions(
+  data: dict,
+) -> tuple[
+  list[tuple[int, int, pymupdf.Rect]], dict[int, list[tuple[int, pymupdf.Rect]]]
+]:
+  positions = [
+    (num, page_no, pymupdf.Rect(rect)) for num, page_no, rect in data["positions"]
+  ]
+  question_rects = {
+    int(num): [(page_no, pymupdf.Rect(clip)) for page_no, clip in clips]
+    for num, clips in data["question_rects"].items()
+  }
+  return positions, question_rects
+
+
+def _stage_is_fresh(manifest: dict, stage: str, key: str, *outputs: Path) -> bool:
+  if manifest.get("stages", {}).get(stage) != key:
+    return False
+  return all(output.exists() for output in outputs)
+
+
+def _load_texts(
+  texts_path: Path,
+) -> tuple[dict[int, str], dict[int, str], dict[int, list[int]]]:
+  data = json.loads(texts_path.read_text(encoding="utf-8"))
+  inside = {int(num): text for num, text in data["inside"].items()}
+  outside_by_page = {
+    int(page_no): text for page_no, text in data["outside_by_page"].items()
+  }
+  pages = {int(num): pages for num, pages in data["question_pages"].items()}
+  return inside, outside_by_page, pages
+
+
+def run_incremental_transform(
+  pdf_path: Path,
+  out_dir: Path | None = None,
+  *,
+  max_questions: int = MAX_QUESTIONS,
+  dpi: int = DPI,
+  force: bool = False,
+  vector_pdfs: bool = False,
+  embedded_images: bool = False,
+  data: bytes | None = None,
+) -> dict:
+  out_dir = out_dir or get_exam_output_dir(pdf_path)
+  questions_figs_dir = out_dir / "questoes"
+  non_questions_figs_dir = out_dir / "fora_questoes"
+  texts_dir = out_dir / "textos_questoes"
+  regions_pdf_path = out_dir / "questoes_regioes.pdf"
+  question_pdfs_dir = out_dir / "questoes_pdf"
+  embedded_images_dir = out_dir / "imagens"
+  questions_path = out_dir / QUESTIONS_FILENAME
+  texts_path = out_dir / TEXTS_FILENAME
+
+  manifest = {} if force else load_manifest(out_dir)
+  pdf_sha256 = bytes_sha256(data) if data is not None else file_sha256(pdf_path)
+  detect_key = detection_key(pdf_sha256, max_questions)
+  keys = {
+    "detect": detect_key,
+    "figures": figures_key(detect_key, dpi),
+    "texts": detect_key,
+    "regions_pdf": regions_key(detect_key),
+  }
+  fresh = {
+    "detect": _stage_is_fresh(manifest, "detect", detect_key, questions_path),
+    "figures": _stage_is_fresh(
+      manifest,
+      "figures",
+      keys["figures"],
+      questions_figs_dir,
+      non_questions_figs_dir,
+    ),
+    "texts": _stage_is_fresh(manifest, "texts", detect_key, texts_path, texts_dir),
+    "regions_pdf": _stage_is_fresh(
+      manifest, "regions_pdf", keys["regions_pdf"], regions_pdf_path
+    ),
+  }
+  if vector_pdfs:
+    keys["question_pdfs"] = detect_key
+    fresh["question_pdfs"] = _stage_is_fresh(
+      manifest, "question_pdfs", detect_key, question_pdfs_dir
+    )
+  if embedded_images:
+    keys["embedded_images"] = detect_key
+    fresh["embedded_images"] = _stage_is_fresh(
+      manifest, "embedded_images", detect_key, embedded_images_dir
+    )
+
+  result: dict = {
+    "pdf_sha256": pdf_sha256,
+    "skipped_stages": [stage for stage, is_fresh in fresh.items() if is_fresh],
+    "positions": None,
+    "question_rects": None,
+  }
+  questions_data = None
+  if fresh["detect"]:
+    questions_data = json.loads(questions_path.read_text(encoding="utf-8"))
+    result["positions"], result["question_rects"] = _load_questions(questions_data)
+  if fresh["figures"]:
+    result["questions_figs_dir"] = questions_figs_dir
+    result["non_questions_figs_dir"] = non_questions_figs_dir
+  if fresh["texts"]:
+    (
+      result["inside_texts"],
+      result["outside_texts_by_page"],
+      result["question_pages"],
+    ) = _load_texts(texts_path)
+    result["texts_dir"] = texts_dir
+  if fresh["regions_pdf"]:
+    result["regions_pdf_path"] = regions_pdf_path
+  if fresh.get("question_pdfs"):
+    result["question_pdfs_dir"] = question_pdfs_dir
+  if fresh.get("embedded_images"):
+    result["embedded_images_dir"] = embedded_images_dir
+  if all(fresh.values()):
+    return result
+
+  stale_dirs = []
+  if not fresh["figures"]:
+    stale_dirs += [questions_figs_dir, non_questions_figs_dir]
+  if not fresh["texts"]:
+    stale_dirs.append(texts_dir)
+  if vector_pdfs and not fresh["question_pdfs"]:
+    stale_dirs.append(question_pdfs_dir)
+  if embedded_images and not fresh["embedded_images"]:
+    stale_dirs.append(embedded_images_dir)
+  for stale_dir in stale_dirs:
+    if stale_dir.exists():
+      shutil.rmtree(stale_dir)
+  # Com os bytes já em memória (pipeline), abre direto do buffer
+  if data is not None:
+    doc = pymupdf.open(stream=data, filetype="pdf")
+  else:
+    doc = pymupdf.open(pdf_path)
+  # O layout completo extrai o texto de todas as páginas; só detecção e
+  # textos precisam dele, as figuras se viram com a classificação salva
+  full_layout = not fresh["detect"] or not fresh["texts"]
+  with doc:
+    if full_layout:
+      with span("transform.layout", pages=len(doc)):
+        layout = DocumentLayout.from_document(doc)
+    else:
+      layout = DocumentLayout.from_classification(doc, questions_data["pages"])
+    if not fresh["detect"]:
+      with span("transform.positions") as positions_span:
+        positions = find_question_positions(
+          doc, max_questions=max_questions, layout=layout
+        )
+        positions_span.set(found=len(positions))
+      with span("transform.rectangles"):
+        question_rects = build_question_rectangles(doc, positions, layout=layout)
+      out_dir.mkdir(parents=True, exist_ok=True)
+      questions_path.write_text(
+        json.dumps(_dump_questions(positions, question_rects, layout)),
+        encoding="utf-8",
+      )
+      result["positions"], result["question_rects"] = positions, question_rects
+    result.update(
+      run_transform(
+        doc,
+        max_questions=max_questions,
+        dpi=dpi,
+        export_question_images=not fresh["figures"],
+        export_non_question_images=not fresh["figures"],
+        export_texts=not fresh["texts"],
+        export_regions_pdf=not fresh["regions_pdf"],
+        export_vector_pdfs=vector_pdfs and not fresh["question_pdfs"],
+        export_images=embedded_images and not fresh["embedded_images"],
+        questions_figs_dir=questions_figs_dir,
+        non_questions_figs_dir=non_questions_figs_dir,
+        texts_dir=texts_dir,
+        regions_pdf_path=regions_pdf_path,
+        question_pdfs_dir=question_pdfs_dir,
+        embedded_images_dir=embedded_images_dir,
+        layout=layout,
+        find_options=full_layout,
+        positions=result["positions"],
+        question_rects=result["question_rects"],
+      )
+    )
+  if not fresh["texts"]:
+    texts_path.write_text(
+      json.dumps(
+        {
+          "inside": result["inside_texts"],
+          "outside_by_page": result["outside_texts_by_page"],
+          "question_pages": result["question_pages"],
+        },
+        ensure_ascii=False,
+      ),
+      encoding="utf-8",
+    )
+
+  save_manifest(
+    out_dir,
+    {"pdf": str(pdf_path), "pdf_sha256": pdf_sha256, "stages": keys},
+  )
+  return result
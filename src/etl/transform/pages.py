@@ -1,30 +1,56 @@
+import re
+
 from src.etl.transform.constants import (
   DRAFT_PAGE_MAX_TEXT_LEN,
+  OBJECTIVE_OPTION_REGEX,
   QUESTION_IN_TEXT_REGEX,
 )
 
 
-def page_has_question(page) -> bool:
-  text = page.get_text()
+def text_has_question(text: str) -> bool:
   return bool(QUESTION_IN_TEXT_REGEX.search(text))
 
 
-def is_draft_page(page) -> bool:
-  text = page.get_text().strip()
+def objective_option_matches(line_text: str) -> list[re.Match]:
+  matches = list(OBJECTIVE_OPTION_REGEX.finditer(line_text))
+  # Um marcador solto no meio da frase ("na figura A) temos") não é alternativa;
+  # no início da linha, ou vários na mesma linha ("A ( ) 1  B ( ) 2"), é
+  if len(matches) == 1 and line_text[: matches[0].start()].strip():
+    return []
+  return matches
+
+
+def objective_option_letters(line_text: str) -> list[str]:
+  return [match[1] for match in objective_option_matches(line_text)]
+
+
+def is_draft_text(text: str) -> bool:
+  text = text.strip()
   if "rascunho" not in text.lower():
     return False
   return len(text) < DRAFT_PAGE_MAX_TEXT_LEN
 
 
-def is_essay_page(page) -> bool:
-  text = page.get_text()
+def is_essay_text(text: str) -> bool:
   text_lower = text.lower()
-  if page_has_question(page):
+  if text_has_question(text):
     return False
-  if is_draft_page(page):
+  if is_draft_text(text):
     return False
   if "redação" in text_lower or "redacao" in text_lower:
     return True
   if "questão" not in text_lower and "questao" not in text_lower:
     return True
   return False
+
+
+def page_has_question(page) -> bool:
+  return text_has_question(page.get_text())
+
+
+def is_draft_page(page) -> bool:
+  return is_draft_text(page.get_text())
+
+
+def is_essay_page(page) -> bool:
+  return is_essay_text(page.get_text())
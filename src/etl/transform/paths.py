@@ -1,3 +1,4 @@
+import os
 from pathlib import Path
 
 
@@ -16,9 +17,43 @@ def get_non_questions_figs_dir(*, from_cwd: Path | None = None) -> Path:
   return get_base_data_dir(from_cwd=from_cwd) / "figs" / "fora_questoes"
 
 
+def get_question_pdfs_dir(*, from_cwd: Path | None = None) -> Path:
+  return get_base_data_dir(from_cwd=from_cwd) / "figs" / "questoes_pdf"
+
+
+def get_embedded_images_dir(*, from_cwd: Path | None = None) -> Path:
+  return get_base_data_dir(from_cwd=from_cwd) / "figs" / "imagens"
+
+
 def get_question_texts_dir(*, from_cwd: Path | None = None) -> Path:
   return get_base_data_dir(from_cwd=from_cwd) / "figs" / "textos_questoes"
 
 
 def get_question_regions_pdf_path(*, from_cwd: Path | None = None) -> Path:
   return get_base_data_dir(from_cwd=from_cwd) / "figs" / "questoes_regioes.pdf"
+
+
+def get_data_dir(*, from_cwd: Path | None = None) -> Path:
+  return get_base_data_dir(from_cwd=from_cwd).parent
+
+
+def get_exam_pdf_dirs(*, from_cwd: Path | None = None) -> list[Path]:
+  data_dir = get_data_dir(from_cwd=from_cwd)
+  return [data_dir / "vestibular" / "provas", data_dir / "pos" / "provas"]
+
+
+def get_exam_output_dir(pdf_path: Path) -> Path:
+  # abspath e não resolve: PDFs do store são symlinks para data/blobs
+  return Path(os.path.abspath(pdf_path)).parent.parent / "figs" / pdf_path.stem
+
+
+def get_pdf_store_dir(*, from_cwd: Path | None = None) -> Path:
+  return get_data_dir(from_cwd=from_cwd) / "blobs"
+
+
+def get_catalog_path(*, from_cwd: Path | None = None) -> Path:
+  return get_data_dir(from_cwd=from_cwd) / "catalog.sqlite3"
+
+
+def get_transform_summary_path(*, from_cwd: Path | None = None) -> Path:
+  return get_data_dir(from_cwd=from_cwd) / "transform_summary.json"
@@ -6,18 +6,15 @@ from src.etl.transform.constants import (
   QUESTION_START_REGEX,
   QUESTION_WORD_ALONE_REGEX,
 )
+from src.etl.transform.layout import DocumentLayout, PageLayout
 
 
-def _find_question_positions_in_page(page, page_no: int) -> list[tuple[int, int, pymupdf.Rect]]:
+def _find_question_positions_in_page(
+  page_layout: PageLayout,
+) -> list[tuple[int, int, pymupdf.Rect]]:
   positions = []
-  d = page.get_text("dict", clip=page.rect)
-  lines_with_bbox: list[tuple[str, tuple[float, float, float, float]]] = []
-  for block in d.get("blocks", []):
-    for line in block.get("lines", []):
-      line_text = "".join(s.get("text", "") for s in line.get("spans", []))
-      bbox = line.get("bbox")
-      if bbox is not None:
-        lines_with_bbox.append((line_text, bbox))
+  page_no = page_layout.page_no
+  lines_with_bbox = page_layout.lines
   for i, (line_text, bbox) in enumerate(lines_with_bbox):
     line_strip = line_text.strip()
     match = QUESTION_START_REGEX.search(line_strip)
@@ -35,14 +32,31 @@ def _find_question_positions_in_page(page, page_no: int) -> list[tuple[int, int,
   return positions
 
 
-def find_question_positions(doc, max_questions: int = MAX_QUESTIONS) -> list[tuple[int, int, pymupdf.Rect]]:
+def find_new_question_positions_in_page(
+  page_layout: PageLayout,
+  found_numbers: set[int],
+  max_questions: int = MAX_QUESTIONS,
+) -> list[tuple[int, int, pymupdf.Rect]]:
   positions = []
-  found_numbers = set()
-  for page_no in range(len(doc)):
-    page = doc[page_no]
-    for n, pno, rect in _find_question_positions_in_page(page, page_no):
-      if n not in found_numbers and 1 <= n <= max_questions:
-        positions.append((n, pno, rect))
-        found_numbers.add(n)
+  for n, pno, rect in _find_question_positions_in_page(page_layout):
+    if n not in found_numbers and 1 <= n <= max_questions:
+      positions.append((n, pno, rect))
+      found_numbers.add(n)
+  return positions
+
+
+def find_question_positions(
+  doc,
+  max_questions: int = MAX_QUESTIONS,
+  *,
+  layout: DocumentLayout | None = None,
+) -> list[tuple[int, int, pymupdf.Rect]]:
+  layout = layout or DocumentLayout.from_document(doc)
+  positions = []
+  found_numbers: set[int] = set()
+  for page_layout in layout.pages:
+    positions.extend(
+      find_new_question_positions_in_page(page_layout, found_numbers, max_questions)
+    )
   positions.sort(key=lambda x: (x[1], x[2].y0))
   return positions
@@ -0,0 +1,45 @@
+from dataclasses import dataclass
+
+import numpy as np
+import pymupdf
+
+from src.etl.transform.constants import DPI
+from src.utils.tracing import span
+
+
+@dataclass
+class PageRaster:
+  pixmap: pymupdf.Pixmap
+  samples: np.ndarray
+  matrix: pymupdf.Matrix
+  dpi: int
+
+  def crop(self, clip: pymupdf.Rect) -> pymupdf.Pixmap | None:
+    irect = (clip * self.matrix).irect & self.pixmap.irect
+    if irect.is_empty:
+      return None
+    x0, y0 = irect.x0 - self.pixmap.x, irect.y0 - self.pixmap.y
+    view = self.samples[y0 : y0 + irect.height, x0 : x0 + irect.width]
+    pix = pymupdf.Pixmap(
+      self.pixmap.colorspace,
+      irect.width,
+      irect.height,
+      view.tobytes(),
+      False,
+    )
+    pix.set_dpi(self.dpi, self.dpi)
+    return pix
+
+
+def render_page(page: pymupdf.Page, dpi: int = DPI) -> PageRaster:
+  with span("transform.render", page=page.number, dpi=dpi):
+    pix = page.get_pixmap(dpi=dpi, alpha=False)
+  samples = np.frombuffer(pix.samples_mv, dtype=np.uint8).reshape(
+    pix.height, pix.width, pix.n
+  )
+  return PageRaster(
+    pixmap=pix,
+    samples=samples,
+    matrix=pymupdf.Matrix(dpi / 72, dpi / 72),
+    dpi=dpi,
+  )
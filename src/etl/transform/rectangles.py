@@ -5,59 +5,151 @@ from src.etl.transform.constants import (
   MARGIN_LEFT,
   MARGIN_TOP,
   OBJECTIVE_BLOCK_END_MARGIN,
-  OBJECTIVE_OPTION_LETTERS,
 )
+from src.etl.transform.layout import DocumentLayout, PageLayout
+from src.etl.transform.pages import objective_option_matches
 
 
-def _objective_block_bottom_y(page, clip: pymupdf.Rect, margin: float = OBJECTIVE_BLOCK_END_MARGIN) -> float | None:
-  rects = []
-  for letter in OBJECTIVE_OPTION_LETTERS:
-    rects.extend(page.search_for(f"{letter} (", clip=clip))
-    rects.extend(page.search_for(f"{letter} ( )", clip=clip))
-  if not rects:
+def _line_words(page_layout: PageLayout, bbox: pymupdf.Rect) -> list[tuple]:
+  words = [
+    w
+    for w in page_layout.words
+    if bbox.contains(pymupdf.Point((w[0] + w[2]) / 2, (w[1] + w[3]) / 2))
+  ]
+  return sorted(words, key=lambda w: w[0])
+
+
+def _option_word_rects(
+  page_layout: PageLayout, bbox: pymupdf.Rect
+) -> dict[str, pymupdf.Rect]:
+  words = _line_words(page_layout, bbox)
+  starts = []
+  offset = 0
+  for w in words:
+    starts.append(offset)
+    offset += len(w[4]) + 1
+  line_text = " ".join(w[4] for w in words)
+  options: dict[str, pymupdf.Rect] = {}
+  for match in objective_option_matches(line_text):
+    # Palavras que o marcador cobre: "A)", "(A)" ou "A", "(", ")"
+    marker = [
+      pymupdf.Rect(w[:4])
+      for w, start in zip(words, starts, strict=True)
+      if start < match.end() and start + len(w[4]) > match.start()
+    ]
+    if not marker:
+      continue
+    rect = marker[0]
+    for r in marker[1:]:
+      rect |= r
+    options[match[1]] = rect
+  return options
+
+
+def find_objective_options(
+  page_layout: PageLayout, clip: pymupdf.Rect
+) -> dict[str, pymupdf.Rect]:
+  options: dict[str, pymupdf.Rect] = {}
+  for line_text, bbox in page_layout.lines:
+    if not clip.intersects(bbox):
+      continue
+    letters = [match[1] for match in objective_option_matches(line_text)]
+    if len(letters) == 1:
+      options[letters[0]] = pymupdf.Rect(bbox)
+      continue
+    if not letters:
+      continue
+    # Várias alternativas na mesma linha: cada uma fica com o retângulo
+    # das palavras do seu marcador, não com o da linha inteira
+    word_rects = _option_word_rects(page_layout, bbox)
+    for letter in letters:
+      options[letter] = word_rects.get(letter, pymupdf.Rect(bbox))
+  return options
+
+
+def _objective_block_bottom_y(
+  page_layout: PageLayout,
+  clip: pymupdf.Rect,
+  margin: float = OBJECTIVE_BLOCK_END_MARGIN,
+) -> float | None:
+  options = find_objective_options(page_layout, clip)
+  if not options:
     return None
-  return max(r.y1 for r in rects) + margin
+  return max(r.y1 for r in options.values()) + margin
 
 
-def _clip_to_objective_block_end(page, clip: pymupdf.Rect) -> pymupdf.Rect:
-  y1_options = _objective_block_bottom_y(page, clip)
+def _clip_to_objective_block_end(
+  page_layout: PageLayout, clip: pymupdf.Rect
+) -> pymupdf.Rect:
+  y1_options = _objective_block_bottom_y(page_layout, clip)
   if y1_options is None or y1_options >= clip.y1:
     return clip
   return pymupdf.Rect(clip.x0, clip.y0, clip.x1, y1_options)
 
 
+def build_question_clips(
+  layout: DocumentLayout | dict[int, PageLayout],
+  start: tuple[int, int, pymupdf.Rect],
+  next_start: tuple[int, int, pymupdf.Rect] | None,
+  x0_page: float,
+  x1_page: float,
+) -> list[tuple[int, pymupdf.Rect]]:
+  _num, start_page, rect = start
+  start_y = rect.y0 - MARGIN_TOP
+  if next_start is not None:
+    _next_num, end_page, next_rect = next_start
+    end_y = next_rect.y0 - MARGIN_BOTTOM
+  else:
+    end_page = start_page
+    end_y = layout[start_page].rect.y1
+  if start_page == end_page:
+    clip = pymupdf.Rect(x0_page, start_y, x1_page, end_y)
+    return [(start_page, _clip_to_objective_block_end(layout[start_page], clip))]
+  clips = []
+  pr = layout[start_page].rect
+  clips.append((start_page, pymupdf.Rect(x0_page, start_y, x1_page, pr.y1)))
+  for p in range(start_page + 1, end_page):
+    pr = layout[p].rect
+    clips.append((p, pymupdf.Rect(x0_page, pr.y0, x1_page, pr.y1)))
+  pr = layout[end_page].rect
+  clip_last = pymupdf.Rect(x0_page, pr.y0, x1_page, end_y)
+  clips.append((end_page, _clip_to_objective_block_end(layout[end_page], clip_last)))
+  return clips
+
+
 def build_question_rectangles(
   doc,
   positions: list[tuple[int, int, pymupdf.Rect]],
+  *,
+  layout: DocumentLayout | None = None,
 ) -> dict[int, list[tuple[int, pymupdf.Rect]]]:
   if not positions:
     return {}
-  x0_page = doc[0].rect.x0 + MARGIN_LEFT
-  x1_page = doc[0].rect.x1
+  layout = layout or DocumentLayout.from_document(doc)
+  x0_page = layout[0].rect.x0 + MARGIN_LEFT
+  x1_page = layout[0].rect.x1
   questions: dict[int, list[tuple[int, pymupdf.Rect]]] = {}
-  for i, (num, page_no, rect) in enumerate(positions):
-    start_page = page_no
-    start_y = rect.y0 - MARGIN_TOP
-    if i + 1 < len(positions):
-      _next_num, next_page, next_rect = positions[i + 1]
-      end_page = next_page
-      end_y = next_rect.y0 - MARGIN_BOTTOM
-    else:
-      end_page = start_page
-      end_y = doc[start_page].rect.y1
-    if start_page == end_page:
-      clip = pymupdf.Rect(x0_page, start_y, x1_page, end_y)
-      clip = _clip_to_objective_block_end(doc[start_page], clip)
-      questions[num] = [(start_page, clip)]
-    else:
-      questions[num] = []
-      pr = doc[start_page].rect
-      questions[num].append((start_page, pymupdf.Rect(x0_page, start_y, x1_page, pr.y1)))
-      for p in range(start_page + 1, end_page):
-        pr = doc[p].rect
-        questions[num].append((p, pymupdf.Rect(x0_page, pr.y0, x1_page, pr.y1)))
-      pr = doc[end_page].rect
-      clip_last = pymupdf.Rect(x0_page, pr.y0, x1_page, end_y)
-      clip_last = _clip_to_objective_block_end(doc[end_page], clip_last)
-      questions[num].append((end_page, clip_last))
+  for i, start in enumerate(positions):
+    next_start = positions[i + 1] if i + 1 < len(positions) else None
+    questions[start[0]] = build_question_clips(
+      layout, start, next_start, x0_page, x1_page
+    )
   return questions
+
+
+def find_question_options(
+  doc,
+  question_rects: dict[int, list[tuple[int, pymupdf.Rect]]],
+  *,
+  layout: DocumentLayout | None = None,
+) -> dict[int, dict[str, tuple[int, pymupdf.Rect]]]:
+  layout = layout or DocumentLayout.from_document(doc)
+  question_options: dict[int, dict[str, tuple[int, pymupdf.Rect]]] = {}
+  for num, clips in question_rects.items():
+    options: dict[str, tuple[int, pymupdf.Rect]] = {}
+    for page_no, clip in clips:
+      for letter, rect in find_objective_options(layout[page_no], clip).items():
+        options[letter] = (page_no, rect)
+    if options:
+      question_options[num] = options
+  return question_options
@@ -0,0 +1,39 @@
+from bisect import bisect_left
+from dataclasses import dataclass, field
+
+import pymupdf
+
+
+@dataclass
+class BlockIndex:
+  blocks: list[tuple] = field(default_factory=list)
+  rects: list[pymupdf.Rect] = field(default_factory=list)
+  order: list[int] = field(default_factory=list)
+  y0s: list[float] = field(default_factory=list)
+  max_height: float = 0.0
+
+  @classmethod
+  def from_blocks(cls, blocks: list[tuple]) -> "BlockIndex":
+    blocks = [b for b in blocks if len(b) >= 5]
+    rects = [pymupdf.Rect(b[:4]) for b in blocks]
+    order = sorted(range(len(rects)), key=lambda i: rects[i].y0)
+    return cls(
+      blocks=blocks,
+      rects=rects,
+      order=order,
+      y0s=[rects[i].y0 for i in order],
+      max_height=max((r.height for r in rects), default=0.0),
+    )
+
+  def intersecting(self, clip: pymupdf.Rect) -> list[int]:
+    lo = bisect_left(self.y0s, clip.y0 - self.max_height)
+    hi = bisect_left(self.y0s, clip.y1)
+    return [
+      self.order[k] for k in range(lo, hi) if clip.intersects(self.rects[self.order[k]])
+    ]
+
+  def not_intersecting(self, clips: list[pymupdf.Rect]) -> list[tuple]:
+    hit: set[int] = set()
+    for clip in clips:
+      hit.update(self.intersecting(clip))
+    return [b for i, b in enumerate(self.blocks) if i not in hit]
@@ -0,0 +1,134 @@
+from collections.abc import Iterator
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import pymupdf
+
+from src.etl.transform.constants import DPI, MARGIN_LEFT, MAX_QUESTIONS
+from src.etl.transform.layout import PageLayout, build_page_layout
+from src.etl.transform.positions import find_new_question_positions_in_page
+from src.etl.transform.raster import PageRaster, render_page
+from src.etl.transform.rectangles import build_question_clips, find_objective_options
+from src.etl.transform.text_extraction import get_text_in_rect
+
+
+@dataclass
+class QuestionRecord:
+  number: int
+  pages: list[int]
+  clips: list[tuple[int, pymupdf.Rect]]
+  inside_text: str
+  options: dict[str, tuple[int, pymupdf.Rect]] = field(default_factory=dict)
+  figures: list[bytes] = field(default_factory=list)
+  figure_paths: list[Path] = field(default_factory=list)
+
+
+def _build_record(
+  start: tuple[int, int, pymupdf.Rect],
+  next_start: tuple[int, int, pymupdf.Rect] | None,
+  page_layouts: dict[int, PageLayout],
+  rasters: dict[int, PageRaster],
+  x0_page: float,
+  x1_page: float,
+  dpi: int,
+  render_figures: bool,
+  figures_dir: Path | None,
+) -> QuestionRecord:
+  num = start[0]
+  clips = build_question_clips(page_layouts, start, next_start, x0_page, x1_page)
+  inside_parts = []
+  options: dict[str, tuple[int, pymupdf.Rect]] = {}
+  for page_no, clip in clips:
+    inside_parts.append(get_text_in_rect(page_layouts[page_no].page, clip))
+    for letter, rect in find_objective_options(page_layouts[page_no], clip).items():
+      options[letter] = (page_no, rect)
+  record = QuestionRecord(
+    number=num,
+    pages=sorted({page_no for page_no, _clip in clips}),
+    clips=clips,
+    inside_text="\n\n".join(t for t in inside_parts if t),
+    options=options,
+  )
+  if not render_figures:
+    return record
+  for part, (page_no, clip) in enumerate(clips):
+    if page_no not in rasters:
+      rasters[page_no] = render_page(page_layouts[page_no].page, dpi)
+    pix = rasters[page_no].crop(clip)
+    if pix is None:
+      continue
+    if figures_dir is None:
+      record.figures.append(pix.tobytes("png"))
+      continue
+    if len(clips) == 1:
+      path = figures_dir / f"questao_{num:02d}.png"
+    else:
+      path = figures_dir / f"questao_{num:02d}_p{part + 1}.png"
+    pix.save(path)
+    record.figure_paths.append(path)
+  return record
+
+
+def _evict_pages_before(
+  page_no: int,
+  page_layouts: dict[int, PageLayout],
+  rasters: dict[int, PageRaster],
+) -> None:
+  for cache in (page_layouts, rasters):
+    for cached_page_no in [p for p in cache if p < page_no]:
+      del cache[cached_page_no]
+
+
+def iter_questions(
+  doc: pymupdf.Document,
+  *,
+  max_questions: int = MAX_QUESTIONS,
+  dpi: int = DPI,
+  render_figures: bool = True,
+  figures_dir: Path | None = None,
+) -> Iterator[QuestionRecord]:
+  if len(doc) == 0:
+    return
+  if figures_dir is not None:
+    figures_dir.mkdir(parents=True, exist_ok=True)
+  x0_page = doc[0].rect.x0 + MARGIN_LEFT
+  x1_page = doc[0].rect.x1
+  page_layouts: dict[int, PageLayout] = {}
+  rasters: dict[int, PageRaster] = {}
+  found_numbers: set[int] = set()
+  pending: tuple[int, int, pymupdf.Rect] | None = None
+  for page_no in range(len(doc)):
+    page_layouts[page_no] = build_page_layout(doc[page_no], page_no)
+    starts = find_new_question_positions_in_page(
+      page_layouts[page_no], found_numbers, max_questions
+    )
+    starts.sort(key=lambda x: x[2].y0)
+    for start in starts:
+      if pending is not None:
+        yield _build_record(
+          pending,
+          start,
+          page_layouts,
+          rasters,
+          x0_page,
+          x1_page,
+          dpi,
+          render_figures,
+          figures_dir,
+        )
+      pending = start
+    _evict_pages_before(
+      pending[1] if pending is not None else page_no + 1, page_layouts, rasters
+    )
+  if pending is not None:
+    yield _build_record(
+      pending,
+      None,
+      page_layouts,
+      rasters,
+      x0_page,
+      x1_page,
+      dpi,
+      render_figures,
+      figures_dir,
+    )
@@ -1,6 +1,7 @@
 import pymupdf
 
 from src.etl.transform.constants import QUESTION_IN_TEXT_REGEX
+from src.etl.transform.layout import DocumentLayout
 
 
 def block_contains_question(text: str) -> bool:
@@ -11,32 +12,56 @@ def get_text_in_rect(page, rect: pymupdf.Rect) -> str:
   return page.get_text(clip=rect, sort=True).strip()
 
 
+def question_pages(
+  question_rects: dict[int, list[tuple[int, pymupdf.Rect]]],
+) -> dict[int, list[int]]:
+  return {
+    num: sorted({page_no for page_no, _clip in clips})
+    for num, clips in question_rects.items()
+  }
+
+
+def outside_text_for_question(
+  pages: list[int],
+  outside_by_page: dict[int, str],
+) -> str:
+  # Junta o texto de fora das páginas da questão. Não reproduz o antigo
+  # questao_NN_fora.txt, que também trazia o texto das outras questões da página
+  parts = [
+    f"[Page {page_no + 1}]\n{outside_by_page[page_no]}"
+    for page_no in pages
+    if outside_by_page.get(page_no)
+  ]
+  return "\n---\n".join(parts)
+
+
 def extract_question_texts(
   doc: pymupdf.Document,
   question_rects: dict[int, list[tuple[int, pymupdf.Rect]]],
+  *,
+  layout: DocumentLayout | None = None,
 ) -> tuple[dict[int, str], dict[int, str]]:
+  layout = layout or DocumentLayout.from_document(doc)
   inside: dict[int, str] = {}
-  outside: dict[int, str] = {}
+  clips_by_page: dict[int, list[pymupdf.Rect]] = {}
   for num, clips in question_rects.items():
     inside_parts = []
     for page_no, clip in clips:
-      page = doc[page_no]
-      inside_parts.append(get_text_in_rect(page, clip))
+      inside_parts.append(get_text_in_rect(layout[page_no].page, clip))
+      clips_by_page.setdefault(page_no, []).append(clip)
     inside[num] = "\n\n".join(t for t in inside_parts if t)
+  # Texto de fora por página: só o que não cai em nenhum recorte de questão
+  # (instruções, constantes, cabeçalhos), em vez de uma cópia por questão
+  outside_by_page: dict[int, str] = {}
+  for page_no in sorted(clips_by_page):
     outside_parts = []
-    for page_no, clip in clips:
-      page = doc[page_no]
-      blocks = page.get_text("blocks", clip=page.rect)
-      for b in blocks:
-        if len(b) < 5:
-          continue
-        x0, y0, x1, y1, text = b[0], b[1], b[2], b[3], b[4]
-        if not text.strip():
-          continue
-        if block_contains_question(text):
-          continue
-        block_rect = pymupdf.Rect(x0, y0, x1, y1)
-        if not clip.intersects(block_rect):
-          outside_parts.append(f"[Page {page_no + 1}]\n" + text.strip())
-    outside[num] = "\n---\n".join(outside_parts) if outside_parts else ""
-  return inside, outside
+    for b in layout[page_no].block_index.not_intersecting(clips_by_page[page_no]):
+      text = b[4]
+      if not text.strip():
+        continue
+      if block_contains_question(text):
+        continue
+      outside_parts.append(text.strip())
+    if outside_parts:
+      outside_by_page[page_no] = "\n---\n".join(outside_parts)
+  return inside, outside_by_page
@@ -2,12 +2,19 @@ from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
 
+from src.api import exams_router, questions_router, search_router
+from src.config import settings
 from src.database import check_db_connection
+from src.search import open_search_index
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
+  # Só um mmap do arquivo: subir a API não lê o índice nem depende do Postgres
+  app.state.search_index = open_search_index(settings.search_index_path)
   yield
+  if app.state.search_index is not None:
+    app.state.search_index.close()
 
 
 app = FastAPI(
@@ -16,6 +23,9 @@ app = FastAPI(
   version="0.1.0",
   lifespan=lifespan,
 )
+app.include_router(exams_router)
+app.include_router(questions_router)
+app.include_router(search_router)
 
 
 @app.get("/")
@@ -1,4 +1,17 @@
 from src.models.base import Base
+from src.models.exam import Exam  # noqa: F401 - Alembic descobre as tabelas
+from src.models.exam_text import ExamText  # noqa: F401
 from src.models.example import Example  # noqa: F401 - Alembic descobre as tabelas
+from src.models.figure import Figure  # noqa: F401
+from src.models.question import Question  # noqa: F401
+from src.models.question_part import QuestionPart  # noqa: F401
 
-__all__ = ["Base", "Example"]
+__all__ = [
+  "Base",
+  "Exam",
+  "ExamText",
+  "Example",
+  "Figure",
+  "Question",
+  "QuestionPart",
+]
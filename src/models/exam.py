@@ -0,0 +1,38 @@
+from typing import TYPE_CHECKING
+
+from sqlalchemy import Index, Integer, String, Text, UniqueConstraint
+from sqlalchemy.orm import Mapped, mapped_column, relationship
+
+from src.models.base import Base
+
+if TYPE_CHECKING:
+  from src.models.question import Question
+
+
+class Exam(Base):
+  __tablename__ = "exams"
+  __table_args__ = (
+    UniqueConstraint(
+      "exam_type", "year", "column_name", name="uq_exams_type_year_column"
+    ),
+    # Filtros da listagem com o id no fim para a paginação por cursor
+    Index("ix_exams_type_year_id", "exam_type", "year", "id"),
+    Index("ix_exams_discipline_language_id", "discipline", "language", "id"),
+  )
+
+  id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+  exam_type: Mapped[str] = mapped_column(String(32), nullable=False)
+  year: Mapped[str] = mapped_column(String(16), nullable=False)
+  column_name: Mapped[str] = mapped_column(String(128), nullable=False)
+  # Valores de Discipline/Language (src.constants), derivados da coluna da listagem
+  discipline: Mapped[str | None] = mapped_column(String(32))
+  language: Mapped[str | None] = mapped_column(String(16))
+  url: Mapped[str | None] = mapped_column(Text)
+  pdf_path: Mapped[str] = mapped_column(Text, nullable=False)
+  pdf_sha256: Mapped[str] = mapped_column(String(64), nullable=False, index=True)
+  page_count: Mapped[int | None] = mapped_column(Integer)
+  question_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+
+  questions: Mapped[list["Question"]] = relationship(
+    back_populates="exam", cascade="all, delete-orphan", passive_deletes=True
+  )
@@ -0,0 +1,64 @@
+from sqlalchemy import (
+  Computed,
+  ForeignKey,
+  Index,
+  Integer,
+  String,
+  Text,
+  UniqueConstraint,
+  text,
+)
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.orm import Mapped, mapped_column
+
+from src.models.base import Base
+
+# Cópia da configuração portuguese com unaccent antes do stemmer (migração
+# 0c3e0d6f5a11): "Questão" e "Questao" viram o mesmo lexema
+SEARCH_CONFIG = "portuguese_unaccent"
+
+
+class ExamText(Base):
+  __tablename__ = "exam_texts"
+  __table_args__ = (
+    # question_id ou page é sempre NULL: nulos precisam colidir no upsert
+    UniqueConstraint(
+      "exam_id",
+      "kind",
+      "question_id",
+      "page",
+      name="uq_exam_texts_exam_kind_question_page",
+      postgresql_nulls_not_distinct=True,
+    ),
+    # /search só consulta textos de questões: índices parciais
+    Index(
+      "ix_exam_texts_search_vector",
+      "search_vector",
+      postgresql_using="gin",
+      postgresql_where=text("kind = 'question'"),
+    ),
+    Index(
+      "ix_exam_texts_content_trgm",
+      "content",
+      postgresql_using="gin",
+      postgresql_ops={"content": "gin_trgm_ops"},
+      postgresql_where=text("kind = 'question'"),
+    ),
+  )
+
+  id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+  exam_id: Mapped[int] = mapped_column(
+    ForeignKey("exams.id", ondelete="CASCADE"), nullable=False, index=True
+  )
+  # kind "question": texto dentro da questão (question_id preenchido);
+  # kind "page": texto fora das questões naquela página (page preenchido)
+  question_id: Mapped[int | None] = mapped_column(
+    ForeignKey("questions.id", ondelete="CASCADE"), index=True
+  )
+  page: Mapped[int | None] = mapped_column(Integer)
+  kind: Mapped[str] = mapped_column(String(16), nullable=False)
+  content: Mapped[str] = mapped_column(Text, nullable=False)
+  search_vector: Mapped[str] = mapped_column(
+    TSVECTOR,
+    Computed(f"to_tsvector('{SEARCH_CONFIG}'::regconfig, content)", persisted=True),
+  )
@@ -0,0 +1,30 @@
+from sqlalchemy import ForeignKey, Integer, String, Text, UniqueConstraint
+from sqlalchemy.orm import Mapped, mapped_column
+
+from src.models.base import Base
+
+
+class Figure(Base):
+  __tablename__ = "figures"
+  __table_args__ = (UniqueConstraint("exam_id", "path", name="uq_figures_exam_path"),)
+
+  id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+  exam_id: Mapped[int] = mapped_column(
+    ForeignKey("exams.id", ondelete="CASCADE"), nullable=False, index=True
+  )
+  question_id: Mapped[int | None] = mapped_column(
+    ForeignKey("questions.id", ondelete="CASCADE"), index=True
+  )
+  page: Mapped[int | None] = mapped_column(Integer)
+  part: Mapped[int | None] = mapped_column(Integer)
+  # question | non_question | embedded | vector_pdf
+  kind: Mapped[str] = mapped_column(String(16), nullable=False)
+  label: Mapped[str | None] = mapped_column(String(64))
+  file_name: Mapped[str] = mapped_column(String(255), nullable=False)
+  # Relativo ao diretório data/
+  path: Mapped[str] = mapped_column(Text, nullable=False)
+  media_type: Mapped[str] = mapped_column(String(64), nullable=False)
+  width: Mapped[int | None] = mapped_column(Integer)
+  height: Mapped[int | None] = mapped_column(Integer)
+  byte_size: Mapped[int] = mapped_column(Integer, nullable=False)
+  sha256: Mapped[str | None] = mapped_column(String(64))
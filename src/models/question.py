@@ -0,0 +1,39 @@
+from typing import TYPE_CHECKING
+
+from sqlalchemy import ForeignKey, Index, Integer, String, UniqueConstraint
+from sqlalchemy.orm import Mapped, mapped_column, relationship
+
+from src.models.base import Base
+
+if TYPE_CHECKING:
+  from src.models.exam import Exam
+  from src.models.question_part import QuestionPart
+
+
+class Question(Base):
+  __tablename__ = "questions"
+  __table_args__ = (
+    # (exam_id, number) também é a chave do cursor da listagem
+    UniqueConstraint("exam_id", "number", name="uq_questions_exam_number"),
+    Index("ix_questions_format_exam_number", "format_type", "exam_id", "number"),
+  )
+
+  id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+  exam_id: Mapped[int] = mapped_column(
+    ForeignKey("exams.id", ondelete="CASCADE"), nullable=False
+  )
+  number: Mapped[int] = mapped_column(Integer, nullable=False)
+  # Página onde o enunciado começa (0-based, como no PDF)
+  page: Mapped[int] = mapped_column(Integer, nullable=False)
+  # sha256 de texto + recortes + figuras: o loader só reescreve se mudar
+  content_hash: Mapped[str | None] = mapped_column(String(64))
+  # Valor de FormatType (src.constants): objetiva se o texto traz as alternativas
+  format_type: Mapped[str | None] = mapped_column(String(16))
+
+  exam: Mapped["Exam"] = relationship(back_populates="questions")
+  parts: Mapped[list["QuestionPart"]] = relationship(
+    back_populates="question",
+    cascade="all, delete-orphan",
+    passive_deletes=True,
+    order_by="QuestionPart.part",
+  )
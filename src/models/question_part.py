@@ -0,0 +1,30 @@
+from typing import TYPE_CHECKING
+
+from sqlalchemy import Float, ForeignKey, Integer, UniqueConstraint
+from sqlalchemy.orm import Mapped, mapped_column, relationship
+
+from src.models.base import Base
+
+if TYPE_CHECKING:
+  from src.models.question import Question
+
+
+class QuestionPart(Base):
+  __tablename__ = "question_parts"
+  __table_args__ = (
+    UniqueConstraint("question_id", "part", name="uq_question_parts_question_part"),
+  )
+
+  id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+  question_id: Mapped[int] = mapped_column(
+    ForeignKey("questions.id", ondelete="CASCADE"), nullable=False
+  )
+  # Questões que atravessam páginas têm uma parte (clip) por página
+  part: Mapped[int] = mapped_column(Integer, nullable=False)
+  page: Mapped[int] = mapped_column(Integer, nullable=False)
+  x0: Mapped[float] = mapped_column(Float, nullable=False)
+  y0: Mapped[float] = mapped_column(Float, nullable=False)
+  x1: Mapped[float] = mapped_column(Float, nullable=False)
+  y1: Mapped[float] = mapped_column(Float, nullable=False)
+
+  question: Mapped["Question"] = relationship(back_populates="parts")
@@ -0,0 +1,17 @@
+from src.search.bm25 import (
+  SearchHit,
+  SearchIndex,
+  build_index,
+  iter_question_texts,
+  open_search_index,
+  tokenize,
+)
+
+__all__ = [
+  "SearchHit",
+  "SearchIndex",
+  "build_index",
+  "iter_question_texts",
+  "open_search_index",
+  "tokenize",
+]
@@ -0,0 +1,322 @@
+import json
+import math
+import mmap
+import os
+import re
+import struct
+import sys
+import unicodedata
+from array import array
+from collections import Counter
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass
+from heapq import nlargest
+from itertools import accumulate, islice
+from pathlib import Path
+
+INDEX_MAGIC = b"ITABM25\x00"
+INDEX_VERSION = 1
+BM25_K1 = 1.2
+BM25_B = 0.75
+PREVIEW_CHARS = 240
+
+_TOKEN_RE = re.compile(r"\w+")
+_QUESTION_TEXT_RE = re.compile(r"^questao_(\d+)_dentro\.txt$")
+_WHITESPACE_RE = re.compile(r"\s+")
+
+# magic, versão, n_docs, n_terms, k1, b, avgdl e os offsets de: textos dos
+# termos, postings, normas e documentos. A tabela de termos vem logo depois
+_HEADER = struct.Struct("<8sIIIfff4Q")
+# Por termo (ordem binária UTF-8): offset/tamanho do texto, df, offset/tamanho
+# das postings (pares varint de delta do doc_id e tf)
+_TERM = struct.Struct("<IHIQI")
+_ALIGN = 8
+
+
+def get_data_dir(*, from_cwd: Path | None = None) -> Path:
+  # Mesmo data/ de src.etl.transform.paths, sem importar o pacote de transform:
+  # pymupdf e numpy são dependências de dev, ausentes na imagem da API
+  cwd = from_cwd or Path.cwd()
+  root = cwd.parent if cwd.name == "notebooks" else cwd
+  return (root / "data").resolve()
+
+
+def get_search_index_path(*, from_cwd: Path | None = None) -> Path:
+  return get_data_dir(from_cwd=from_cwd) / "search" / "bm25.idx"
+
+
+def tokenize(text: str) -> list[str]:
+  # Minúsculas e sem acentos: "Questão" e "questao" são o mesmo termo
+  text = unicodedata.normalize("NFKD", text.lower())
+  text = "".join(ch for ch in text if not unicodedata.combining(ch))
+  return _TOKEN_RE.findall(text)
+
+
+def _put_varint(value: int, out: bytearray) -> None:
+  while value >= 0x80:
+    out.append((value & 0x7F) | 0x80)
+    value >>= 7
+  out.append(value)
+
+
+def _little_endian(values: array) -> bytes:
+  if sys.byteorder == "big":
+    values = array(values.typecode, values)
+    values.byteswap()
+  return values.tobytes()
+
+
+def _pad(out: bytearray) -> int:
+  out.extend(b"\x00" * (-len(out) % _ALIGN))
+  return len(out)
+
+
+def iter_question_texts(data_dir: Path | None = None) -> Iterator[tuple[dict, str]]:
+  data_dir = data_dir or get_data_dir()
+  # data/<tipo>/figs/<prova>/textos_questoes/questao_NN_dentro.txt
+  for texts_dir in sorted(data_dir.glob("*/figs/*/textos_questoes")):
+    exam_dir = texts_dir.parent
+    for path in sorted(texts_dir.glob("questao_*_dentro.txt")):
+      match = _QUESTION_TEXT_RE.match(path.name)
+      if match is None:
+        continue
+      text = path.read_text(encoding="utf-8")
+      meta = {
+        "exam_type": exam_dir.parent.parent.name,
+        "exam": exam_dir.name,
+        "question": int(match[1]),
+        "path": str(path.relative_to(data_dir)),
+        "preview": _WHITESPACE_RE.sub(" ", text).strip()[:PREVIEW_CHARS],
+      }
+      yield meta, text
+
+
+def build_index(
+  docs: Iterable[tuple[dict, str]],
+  output: Path,
+  *,
+  k1: float = BM25_K1,
+  b: float = BM25_B,
+) -> int:
+  postings: dict[str, bytearray] = {}
+  last_doc: dict[str, int] = {}
+  doc_freq: Counter[str] = Counter()
+  lengths: list[int] = []
+  metas: list[bytes] = []
+  for doc_id, (meta, text) in enumerate(docs):
+    counts = Counter(tokenize(text))
+    lengths.append(sum(counts.values()))
+    metas.append(json.dumps(meta, ensure_ascii=False).encode("utf-8"))
+    for term, tf in counts.items():
+      out = postings.setdefault(term, bytearray())
+      _put_varint(doc_id - last_doc.get(term, 0), out)
+      _put_varint(tf, out)
+      last_doc[term] = doc_id
+      doc_freq[term] += 1
+
+  n_docs = len(lengths)
+  avgdl = sum(lengths) / n_docs if n_docs else 0.0
+  # Parte da BM25 que só depende do documento, calculada uma vez aqui
+  norms = array(
+    "f", (k1 * (1 - b + b * length / avgdl) if avgdl else k1 for length in lengths)
+  )
+  terms = sorted(postings, key=lambda term: term.encode("utf-8"))
+
+  body = bytearray(_TERM.size * len(terms))
+  strings = bytearray()
+  postings_blob = bytearray()
+  for i, term in enumerate(terms):
+    encoded = term.encode("utf-8")
+    _TERM.pack_into(
+      body,
+      i * _TERM.size,
+      len(strings),
+      len(encoded),
+      doc_freq[term],
+      len(postings_blob),
+      len(postings[term]),
+    )
+    strings += encoded
+    postings_blob += postings[term]
+
+  data = bytearray(_HEADER.size)
+  data += body
+  strings_at = len(data)
+  data += strings
+  postings_at = _pad(data)
+  data += postings_blob
+  norms_at = _pad(data)
+  data += _little_endian(norms)
+  docs_at = _pad(data)
+  doc_offsets = array("Q", [0])
+  for meta in metas:
+    doc_offsets.append(doc_offsets[-1] + len(meta))
+  data += _little_endian(doc_offsets)
+  for meta in metas:
+    data += meta
+  _HEADER.pack_into(
+    data,
+    0,
+    INDEX_MAGIC,
+    INDEX_VERSION,
+    n_docs,
+    len(terms),
+    k1,
+    b,
+    avgdl,
+    strings_at,
+    postings_at,
+    norms_at,
+    docs_at,
+  )
+
+  output.parent.mkdir(parents=True, exist_ok=True)
+  # Troca atômica: uma API com o índice antigo em mmap segue lendo o arquivo velho
+  tmp = output.with_name(output.name + ".tmp")
+  tmp.write_bytes(data)
+  os.replace(tmp, output)
+  return n_docs
+
+
+@dataclass
+class SearchHit:
+  doc_id: int
+  score: float
+  exam_type: str
+  exam: str
+  question: int
+  path: str
+  preview: str
+
+
+class SearchIndex:
+  def __init__(self, path: Path):
+    self.path = path
+    with open(path, "rb") as f:
+      self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    (
+      magic,
+      version,
+      self.n_docs,
+      self.n_terms,
+      self.k1,
+      self.b,
+      self.avgdl,
+      self._strings_at,
+      self._postings_at,
+      norms_at,
+      docs_at,
+    ) = _HEADER.unpack_from(self._mmap, 0)
+    if magic != INDEX_MAGIC or version != INDEX_VERSION:
+      self._mmap.close()
+      raise ValueError(f"{path} is not a version {INDEX_VERSION} BM25 index")
+    # Só visões sobre o mmap: abrir não lê nem decodifica o índice
+    view = memoryview(self._mmap)
+    self._norms = view[norms_at : norms_at + 4 * self.n_docs].cast("f")
+    offsets_end = docs_at + 8 * (self.n_docs + 1)
+    self._doc_offsets = view[docs_at:offsets_end].cast("Q")
+    self._docs_at = offsets_end
+    view.release()
+
+  def close(self) -> None:
+    self._norms.release()
+    self._doc_offsets.release()
+    self._mmap.close()
+
+  def __enter__(self) -> "SearchIndex":
+    return self
+
+  def __exit__(self, *exc) -> None:
+    self.close()
+
+  def _lookup(self, term: bytes) -> tuple[int, int, int] | None:
+    lo, hi = 0, self.n_terms
+    while lo < hi:
+      mid = (lo + hi) // 2
+      at, size, df, postings_at, postings_size = _TERM.unpack_from(
+        self._mmap, _HEADER.size + mid * _TERM.size
+      )
+      candidate = self._mmap[self._strings_at + at : self._strings_at + at + size]
+      if candidate < term:
+        lo = mid + 1
+      elif candidate > term:
+        hi = mid
+      else:
+        start = self._postings_at + postings_at
+        return df, start, start + postings_size
+    return None
+
+  def _doc_meta(self, doc_id: int) -> dict:
+    start = self._docs_at + self._doc_offsets[doc_id]
+    end = self._docs_at + self._doc_offsets[doc_id + 1]
+    return json.loads(self._mmap[start:end])
+
+  def _postings(self, pos: int, end: int) -> Iterator[tuple[int, int]]:
+    buf = self._mmap
+    chunk = buf[pos:end]
+    if max(chunk) < 0x80:
+      # Caso comum dos termos frequentes: deltas e tf cabem num byte cada
+      return zip(accumulate(chunk[0::2]), chunk[1::2])
+    pairs = []
+    doc = 0
+    while pos < end:
+      delta = shift = 0
+      while True:
+        byte = buf[pos]
+        pos += 1
+        delta |= (byte & 0x7F) << shift
+        if byte < 0x80:
+          break
+        shift += 7
+      tf = shift = 0
+      while True:
+        byte = buf[pos]
+        pos += 1
+        tf |= (byte & 0x7F) << shift
+        if byte < 0x80:
+          break
+        shift += 7
+      doc += delta
+      pairs.append((doc, tf))
+    return iter(pairs)
+
+  def scores(self, query: str) -> dict[int, float]:
+    norms, k1 = self._norms, self.k1
+    scores: dict[int, float] = {}
+    get = scores.get
+    for term in set(tokenize(query)):
+      found = self._lookup(term.encode("utf-8"))
+      if found is None:
+        continue
+      df, pos, end = found
+      idf = math.log(1 + (self.n_docs - df + 0.5) / (df + 0.5))
+      weight = idf * (k1 + 1)
+      for doc, tf in self._postings(pos, end):
+        scores[doc] = get(doc, 0.0) + weight * tf / (tf + norms[doc])
+    return scores
+
+  def search(
+    self, query: str, limit: int = 10, *, exam_type: str | None = None
+  ) -> list[SearchHit]:
+    scores = self.scores(query)
+    hits: list[SearchHit] = []
+    # Heap só com os melhores; com filtro, busca mais candidatos se faltarem hits
+    checked, wanted = 0, limit
+    while checked < len(scores):
+      ranked = nlargest(wanted, scores.items(), key=lambda item: (item[1], -item[0]))
+      for doc_id, score in islice(ranked, checked, None):
+        meta = self._doc_meta(doc_id)
+        if exam_type is not None and meta["exam_type"] != exam_type:
+          continue
+        hits.append(SearchHit(doc_id=doc_id, score=score, **meta))
+        if len(hits) == limit:
+          return hits
+      checked, wanted = len(ranked), wanted * 4
+    return hits
+
+
+def open_search_index(path: Path | None = None) -> SearchIndex | None:
+  path = path or get_search_index_path()
+  if not path.exists():
+    return None
+  return SearchIndex(path)
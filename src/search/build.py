@@ -0,0 +1,42 @@
+import argparse
+import time
+from pathlib import Path
+
+from src.search.bm25 import (
+  SearchIndex,
+  build_index,
+  get_search_index_path,
+  iter_question_texts,
+)
+
+
+def main() -> None:
+  parser = argparse.ArgumentParser(
+    description="Build the BM25 index of the question texts (textos_questoes)"
+  )
+  parser.add_argument("--data-dir", type=Path, default=None)
+  parser.add_argument("--output", type=Path, default=None)
+  parser.add_argument(
+    "--query", default=None, help="search the index after building it"
+  )
+  args = parser.parse_args()
+
+  output = args.output or get_search_index_path()
+  start = time.perf_counter()
+  n_docs = build_index(iter_question_texts(args.data_dir), output)
+  print(
+    f"Indexed {n_docs} questions into {output} "
+    f"({output.stat().st_size / 1024:.1f} KiB) in {time.perf_counter() - start:.2f}s"
+  )
+  if args.query:
+    with SearchIndex(output) as index:
+      start = time.perf_counter()
+      hits = index.search(args.query)
+      elapsed = (time.perf_counter() - start) * 1000
+    print(f"{len(hits)} hits in {elapsed:.2f} ms")
+    for hit in hits:
+      print(f"  {hit.score:6.3f}  {hit.exam} q{hit.question}: {hit.preview[:80]}")
+
+
+if __name__ == "__main__":
+  main()
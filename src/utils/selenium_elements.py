@@ -1,10 +1,61 @@
-from typing import Optional, List, Dict
+from typing import Optional, List
 from dataclasses import dataclass, field
-
+import weakref
+
+from selenium.common.exceptions import (
+  NoSuchElementException,
+  NoSuchFrameException,
+  StaleElementReferenceException,
+  WebDriverException,
+)
 from selenium.webdriver.common.by import By
 from selenium.webdriver.remote.webdriver import WebDriver
 from selenium.webdriver.remote.webelement import WebElement
 
+# Avalia um XPath relativo a um nó e devolve a lista de nós (no documento do nó,
+# que pode estar dentro de um frame)
+XPATH_SNAPSHOT_JS = """
+const snapshot = (xpath, ctx) => {
+  const doc = ctx.ownerDocument || ctx;
+  const result = doc.evaluate(
+    xpath, ctx, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null
+  );
+  const nodes = [];
+  for (let i = 0; i < result.snapshotLength; i++) nodes.push(result.snapshotItem(i));
+  return nodes;
+};
+"""
+
+TABLE_BULK_JS = (
+  XPATH_SNAPSHOT_JS
+  + """
+const [table, rowXPath, itemXPath] = arguments;
+return snapshot(rowXPath, table).map((row) =>
+  snapshot(itemXPath, row).map((item) => {
+    const link = item.getElementsByTagName("a")[0];
+    const href = link && link.hasAttribute("href") ? link.href : "";
+    return href || (item.innerText || "").trim();
+  })
+);
+"""
+)
+
+
+# Caminho de frames ativo em cada driver, para não repetir as trocas de frame.
+# Quem trocar de frame ou de página por fora deve chamar reset_frame_context.
+_FRAME_PATHS: "weakref.WeakKeyDictionary[WebDriver, tuple]" = (
+  weakref.WeakKeyDictionary()
+)
+_STALE_CONTEXT_ERRORS = (
+  NoSuchElementException,
+  NoSuchFrameException,
+  StaleElementReferenceException,
+)
+
+
+def reset_frame_context(driver: WebDriver) -> None:
+  _FRAME_PATHS.pop(driver, None)
+
 
 @dataclass
 class BaseElement:
@@ -31,7 +82,19 @@ class SeleniumElement(BaseElement):
   element: BaseElement = None
   iframes: List[BaseElement] = field(default_factory=list)
 
-  def _resolve_context(self, driver: WebDriver):
+  def _frame_path(self) -> tuple:
+    return tuple(
+      (iframe.identifier_type, iframe.identifier)
+      for iframe in self.iframes
+      if iframe is not None
+    )
+
+  def _resolve_context(self, driver: WebDriver, use_cache: bool = True):
+    path = self._frame_path()
+    if use_cache and _FRAME_PATHS.get(driver) == path:
+      return driver
+
+    reset_frame_context(driver)
     driver.switch_to.default_content()
 
     if self.iframes:
@@ -39,11 +102,20 @@ class SeleniumElement(BaseElement):
         if iframe is not None:
           driver.switch_to.frame(iframe.find(driver))
 
+    _FRAME_PATHS[driver] = path
     return driver
 
   def find(self, driver: WebDriver) -> WebElement:
+    cached = _FRAME_PATHS.get(driver) == self._frame_path()
     context = self._resolve_context(driver)
-    return self.element.find(context)
+    try:
+      return self.element.find(context)
+    except _STALE_CONTEXT_ERRORS:
+      if not cached:
+        raise
+      # O frame em cache pode ter sido recarregado: refaz o caminho completo
+      context = self._resolve_context(driver, use_cache=False)
+      return self.element.find(context)
 
   def click(self, driver: WebDriver) -> None:
     context = self._resolve_context(driver)
@@ -67,8 +139,24 @@ class SeleniumTableRow(SeleniumElement):
 class SeleniumTable(SeleniumElement):
   row: SeleniumTableRow = None
   headers: List[str] = field(default_factory=list)
+  bulk: bool = True
+
+  def _bulk_supported(self) -> bool:
+    return self.bulk and all(
+      e.identifier_type == By.XPATH for e in (self.row.element, self.row.item.element)
+    )
 
-  def get_data(self, driver: WebDriver) -> List[Dict[str, str]]:
+  def _get_rows_bulk(self, driver: WebDriver) -> list[list[str]]:
+    element = self.find(driver)
+    rows = driver.execute_script(
+      TABLE_BULK_JS,
+      element,
+      self.row.element.identifier,
+      self.row.item.element.identifier,
+    )
+    return rows[1:] if self.row.skip_first else rows
+
+  def _get_rows(self, driver: WebDriver) -> list[list[str]]:
     data = []
     element = self.find(driver)
     rows = self.row.element.find_all(element)
@@ -84,7 +172,19 @@ class SeleniumTable(SeleniumElement):
         else:
           row_data.append(item.text)
       data.append(row_data)
-    structured_data = [dict(zip(self.headers, row)) for row in data]
+    return data
+
+  def get_data(self, driver: WebDriver) -> list[dict[str, str]]:
+    rows = None
+    if self._bulk_supported():
+      # Uma única chamada ao driver; se o JS falhar, volta ao modo elemento a elemento
+      try:
+        rows = self._get_rows_bulk(driver)
+      except WebDriverException:
+        rows = None
+    if rows is None:
+      rows = self._get_rows(driver)
+    structured_data = [dict(zip(self.headers, row)) for row in rows]
     return structured_data
 
 
@@ -0,0 +1,155 @@
+from urllib.parse import urljoin
+
+import lxml.html
+import requests
+from lxml import etree
+from selenium.common.exceptions import NoSuchElementException, WebDriverException
+from selenium.webdriver.common.by import By
+
+STATIC_DRIVER_TIMEOUT = 30
+_URL_ATTRIBUTES = ("href", "src", "action")
+
+
+class StaticDriverUnsupported(WebDriverException):
+  pass
+
+
+def _to_xpath(by: str, value: str) -> str:
+  if by == By.XPATH:
+    return value
+  if by == By.TAG_NAME:
+    return f".//{value}"
+  if by == By.NAME:
+    return f".//*[@name='{value}']"
+  if by == By.ID:
+    return f".//*[@id='{value}']"
+  raise StaticDriverUnsupported(f"locator {by!r} is not supported without a browser")
+
+
+class StaticElement:
+  def __init__(self, driver: "StaticDriver", node, base_url: str):
+    self._driver = driver
+    self._node = node
+    self._base_url = base_url
+
+  @property
+  def tag_name(self) -> str:
+    return self._node.tag
+
+  @property
+  def text(self) -> str:
+    # Aproxima o texto renderizado colapsando os espaços
+    return " ".join(self._node.text_content().split())
+
+  def get_attribute(self, name: str) -> str | None:
+    value = self._node.get(name)
+    if value is not None and name in _URL_ATTRIBUTES:
+      return urljoin(self._base_url, value.strip())
+    return value
+
+  def find_element(self, by: str = By.XPATH, value: str = "") -> "StaticElement":
+    elements = self.find_elements(by, value)
+    if not elements:
+      raise NoSuchElementException(f"no element matches {value!r}")
+    return elements[0]
+
+  def find_elements(self, by: str = By.XPATH, value: str = "") -> list:
+    try:
+      nodes = self._node.xpath(_to_xpath(by, value))
+    except etree.XPathError as e:
+      raise StaticDriverUnsupported(f"invalid xpath {value!r}: {e}") from e
+    return [
+      StaticElement(self._driver, node, self._base_url)
+      for node in nodes
+      if isinstance(node, etree.ElementBase)
+    ]
+
+  def click(self) -> None:
+    self._driver._follow(self)
+
+
+class _StaticSwitchTo:
+  def __init__(self, driver: "StaticDriver"):
+    self._driver = driver
+
+  def default_content(self) -> None:
+    self._driver._context = self._driver._top
+
+  def frame(self, frame_reference) -> None:
+    if not isinstance(frame_reference, StaticElement):
+      raise StaticDriverUnsupported("frames can only be selected by element")
+    self._driver._context = self._driver._frame_document(frame_reference)
+
+
+class StaticDriver:
+  def __init__(
+    self,
+    session: requests.Session | None = None,
+    timeout: float = STATIC_DRIVER_TIMEOUT,
+  ):
+    self._session = session or requests.Session()
+    self._timeout = timeout
+    self._documents: dict[str, StaticElement] = {}
+    # Alvos de links já clicados: nome do frame -> URL carregada nele
+    self._frame_urls: dict[str, str] = {}
+    self._top: StaticElement | None = None
+    self._context: StaticElement | None = None
+    self.switch_to = _StaticSwitchTo(self)
+
+  @property
+  def current_url(self) -> str | None:
+    return self._top._base_url if self._top is not None else None
+
+  def _load(self, url: str) -> StaticElement:
+    if url not in self._documents:
+      resp = self._session.get(url, timeout=self._timeout)
+      resp.raise_for_status()
+      root = lxml.html.fromstring(resp.content, base_url=resp.url)
+      self._documents[url] = StaticElement(self, root, resp.url)
+    return self._documents[url]
+
+  def _frame_document(self, frame: StaticElement) -> StaticElement:
+    if frame.tag_name not in ("frame", "iframe"):
+      raise StaticDriverUnsupported(f"<{frame.tag_name}> is not a frame")
+    name = frame.get_attribute("name")
+    url = self._frame_urls.get(name) if name else None
+    url = url or frame.get_attribute("src")
+    if not url:
+      raise StaticDriverUnsupported(f"frame {name!r} has no src")
+    return self._load(url)
+
+  def _follow(self, element: StaticElement) -> None:
+    href = element.get_attribute("href")
+    if element.tag_name != "a" or not href or href.startswith("javascript:"):
+      raise StaticDriverUnsupported(
+        f"clicking <{element.tag_name}> needs a browser (no static href)"
+      )
+    target = element.get_attribute("target")
+    if target and target not in ("_self", "_top", "_parent", "_blank"):
+      self._frame_urls[target] = href
+    else:
+      self.get(href)
+
+  def get(self, url: str) -> None:
+    self._frame_urls.clear()
+    self._top = self._load(url)
+    self._context = self._top
+
+  def find_element(self, by: str = By.XPATH, value: str = "") -> StaticElement:
+    return self._require_context().find_element(by, value)
+
+  def find_elements(self, by: str = By.XPATH, value: str = "") -> list:
+    return self._require_context().find_elements(by, value)
+
+  def execute_script(self, script: str, *args):
+    if script.strip() == "arguments[0].click()" and args:
+      return args[0].click()
+    raise StaticDriverUnsupported("JavaScript needs a browser")
+
+  def _require_context(self) -> StaticElement:
+    if self._context is None:
+      raise StaticDriverUnsupported("call get(url) before locating elements")
+    return self._context
+
+  def quit(self) -> None:
+    self._session.close()
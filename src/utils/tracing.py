@@ -0,0 +1,199 @@
+import argparse
+import json
+import os
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from pathlib import Path
+
+TRACE_DIR_ENV = "ETL_TRACE_DIR"
+CHROME_TRACE_FILENAME = "trace.json"
+_TRACE_FILE_GLOB = "trace-*.jsonl"
+
+
+class Span:
+  __slots__ = ("name", "attrs")
+
+  def __init__(self, name: str, attrs: dict):
+    self.name = name
+    self.attrs = attrs
+
+  def set(self, **attrs) -> None:
+    self.attrs.update(attrs)
+
+
+class _NullSpan:
+  __slots__ = ()
+
+  def set(self, **attrs) -> None:
+    pass
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class Tracer:
+  def __init__(self, trace_dir: Path):
+    self.pid = os.getpid()
+    self.path = trace_dir / f"trace-{self.pid}.jsonl"
+    self._lock = threading.Lock()
+    # Uma linha por span, com flush: workers do ProcessPool saem sem atexit
+    self._file = open(self.path, "a", encoding="utf-8", buffering=1)
+
+  def record(self, span: Span, start_ns: int, end_ns: int, wall: float) -> None:
+    thread = threading.current_thread()
+    line = json.dumps(
+      {
+        "name": span.name,
+        "ts_us": start_ns // 1000,
+        "dur_us": (end_ns - start_ns) // 1000,
+        "wall": round(wall, 6),
+        "pid": self.pid,
+        "tid": thread.ident,
+        "thread": thread.name,
+        "attrs": span.attrs,
+      },
+      default=str,
+    )
+    with self._lock:
+      self._file.write(line + "\n")
+
+  def close(self) -> None:
+    with self._lock:
+      self._file.close()
+
+
+_tracer: Tracer | None = None
+_tracer_lock = threading.Lock()
+
+
+def get_tracer() -> Tracer | None:
+  global _tracer
+  trace_dir = os.environ.get(TRACE_DIR_ENV)
+  if not trace_dir:
+    return None
+  # Processo filho via fork herda o tracer do pai: abre o próprio arquivo
+  if _tracer is None or _tracer.pid != os.getpid():
+    with _tracer_lock:
+      if _tracer is None or _tracer.pid != os.getpid():
+        _tracer = Tracer(Path(trace_dir))
+  return _tracer
+
+
+def enable_tracing(trace_dir: Path) -> Path:
+  global _tracer
+  trace_dir.mkdir(parents=True, exist_ok=True)
+  for old in trace_dir.glob(_TRACE_FILE_GLOB):
+    old.unlink()
+  # Via variável de ambiente para alcançar os processos de transform
+  os.environ[TRACE_DIR_ENV] = str(trace_dir.resolve())
+  with _tracer_lock:
+    if _tracer is not None and _tracer.pid == os.getpid():
+      _tracer.close()
+    _tracer = None
+  return trace_dir
+
+
+@contextmanager
+def span(name: str, **attrs) -> Iterator[Span | _NullSpan]:
+  tracer = get_tracer()
+  if tracer is None:
+    yield _NULL_SPAN
+    return
+  current = Span(name, attrs)
+  wall = time.time()
+  start = time.perf_counter_ns()
+  try:
+    yield current
+  except BaseException as e:
+    current.attrs["error"] = type(e).__name__
+    raise
+  finally:
+    tracer.record(current, start, time.perf_counter_ns(), wall)
+
+
+def read_trace(trace_dir: Path) -> list[dict]:
+  events = []
+  for path in sorted(trace_dir.glob(_TRACE_FILE_GLOB)):
+    with open(path, encoding="utf-8") as f:
+      events.extend(json.loads(line) for line in f if line.strip())
+  events.sort(key=lambda event: event["ts_us"])
+  return events
+
+
+def write_chrome_trace(trace_dir: Path, output: Path | None = None) -> Path:
+  output = output or trace_dir / CHROME_TRACE_FILENAME
+  events = read_trace(trace_dir)
+  trace_events = [
+    {
+      "name": event["name"],
+      "cat": event["name"].split(".", 1)[0],
+      "ph": "X",
+      "ts": event["ts_us"],
+      "dur": event["dur_us"],
+      "pid": event["pid"],
+      "tid": event["tid"],
+      "args": event["attrs"],
+    }
+    for event in events
+  ]
+  threads = {(e["pid"], e["tid"]): e["thread"] for e in events}
+  trace_events += [
+    {"name": "thread_name", "ph": "M", "pid": pid, "tid": tid, "args": {"name": name}}
+    for (pid, tid), name in threads.items()
+  ]
+  output.write_text(
+    json.dumps({"traceEvents": trace_events, "displayTimeUnit": "ms"}),
+    encoding="utf-8",
+  )
+  return output
+
+
+def summarize_trace(trace_dir: Path) -> dict[str, dict]:
+  summary: dict[str, dict] = {}
+  for event in read_trace(trace_dir):
+    item = summary.setdefault(
+      event["name"], {"count": 0, "total_s": 0.0, "max_s": 0.0, "bytes": 0}
+    )
+    seconds = event["dur_us"] / 1e6
+    item["count"] += 1
+    item["total_s"] += seconds
+    item["max_s"] = max(item["max_s"], seconds)
+    item["bytes"] += event["attrs"].get("bytes") or 0
+  for item in summary.values():
+    item["mean_s"] = item["total_s"] / item["count"]
+    if item["bytes"] and item["total_s"]:
+      item["throughput_bps"] = item["bytes"] / item["total_s"]
+  return dict(sorted(summary.items(), key=lambda kv: -kv[1]["total_s"]))
+
+
+def print_trace_summary(trace_dir: Path) -> None:
+  print(f"{'span':<32} {'count':>6} {'total s':>9} {'mean s':>9} {'max s':>9}  MB/s")
+  for name, item in summarize_trace(trace_dir).items():
+    throughput = item.get("throughput_bps")
+    rate = f"{throughput / 1e6:.2f}" if throughput else ""
+    print(
+      f"{name:<32} {item['count']:>6} {item['total_s']:>9.3f} "
+      f"{item['mean_s']:>9.4f} {item['max_s']:>9.4f}  {rate}"
+    )
+
+
+def report_trace(trace_dir: Path) -> Path:
+  output = write_chrome_trace(trace_dir)
+  print_trace_summary(trace_dir)
+  print(f"Chrome trace (chrome://tracing or ui.perfetto.dev): {output}")
+  return output
+
+
+def main() -> None:
+  parser = argparse.ArgumentParser(
+    description="Summarize a trace directory and write its Chrome trace"
+  )
+  parser.add_argument("trace_dir", type=Path)
+  args = parser.parse_args()
+  report_trace(args.trace_dir)
+
+
+if __name__ == "__main__":
+  main()